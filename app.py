@@ -1,19 +1,43 @@
 # ... imports 
 print("APP STARTED")
 
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for
+from flask import Flask, render_template, request, jsonify, session, redirect, url_for, g, send_file, abort
+from contextlib import contextmanager
 from flask_cors import CORS
 from config.database import db_instance
-from models import User, Document, SimplificationLog, GlossaryTerm  # Updated import
+from models import User, Document, DocumentChunk, ChunkIndex, SimplificationLog, GlossaryTerm  # Updated import
+import hashlib
 import os
+import sys
 import time 
+import threading
 from dotenv import load_dotenv
 from werkzeug.utils import secure_filename
 from nlp.preprocessing import preprocess_pipeline
-from nlp.readability import calculate_readability
-from nlp.model import simplify_text, summarize_text
+from nlp.readability import (
+    ReadabilityAccumulator, calculate_readability, readability_from_statistics, text_statistics
+)
+from nlp.model import (
+    simplify_text, simplify_stream, simplify_text_all_modes, summarize_text, inference_scheduler, fair_scheduler,
+    MODEL_BACKEND, registry
+)
+from nlp.registry import parse_routes
+from nlp.lexical import CompactionCounter, choose_engine
+from nlp.runtime import runtime_stats
+from nlp.generation import TIERS, DEFAULT_TIER, EXTRACTIVE_TIER, SUMMARY_TIERS
 from flask import jsonify
 from bson.objectid import ObjectId
+from concurrent.futures import ThreadPoolExecutor
+from nlp.analysis import ANALYZER_VERSION, analyze_document, content_hash, is_analysis_fresh
+from nlp.cancellation import Cancelled
+from nlp.singleflight import SingleFlight
+from nlp.admission import AdmissionRejected, admission_from_env
+from nlp.chunking import chunk_text, estimate_tokens
+from nlp.memory import MemoryBudgetExceeded, MemoryTracker, memory_budget_from_env
+from nlp.compression import compress_response
+from nlp.assets import ASSET_MAX_AGE, AssetManifest
+from nlp.near_duplicate import ChunkReuse, near_duplicate_index_from_env, reuse_variant
+from nlp.profiling import ProfileStore, profiler_from_env, top_functions
 # Load environment variables
 load_dotenv()
 
@@ -30,11 +54,47 @@ UPLOAD_FOLDER = 'static/uploads'
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB max limit (increased for large docs)
 ALLOWED_EXTENSIONS = {'txt'}
-MAX_DOCUMENT_LENGTH = 100000  # Maximum characters per document (approx 10 pages)
+MAX_DOCUMENT_LENGTH = int(os.getenv('MAX_DOCUMENT_LENGTH', '2000000'))  # Maximum characters per document
+# Documents above this size are simplified through the lazy streaming pipeline,
+# with each simplified chunk written to the document_chunks collection as it is produced
+STREAMING_THRESHOLD = int(os.getenv('STREAMING_THRESHOLD', '200000'))
+# Default time budget (seconds) for a simplify/summarize request; 0 disables it.
+# A request's own "timeout" field may ask for less, never more.
+REQUEST_DEADLINE_SECONDS = float(os.getenv('REQUEST_DEADLINE_SECONDS', '0'))
 
 # Ensure upload directory exists
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+# Page scripts and styles, fingerprinted and precompressed into static/dist
+assets = AssetManifest(app.static_folder)
+assets.build()
+
+
+@app.context_processor
+def inject_asset_url():
+    def asset_url(bundle):
+        path, fingerprinted = assets.url_path(bundle)
+        if fingerprinted:
+            return url_for('static_asset', filename=path)
+        return url_for('static', filename=path)
+    return {"asset_url": asset_url}
+
+
+@app.route('/assets/<path:filename>')
+def static_asset(filename):
+    """Serve a fingerprinted bundle, precompressed when the client accepts it"""
+    resolved = assets.resolve(filename, request.accept_encodings)
+    if resolved is None:
+        abort(404)
+    path, mimetype, encoding = resolved
+    response = send_file(path, mimetype=mimetype, etag=False, conditional=False)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    # The URL changes whenever the content does
+    response.headers['Cache-Control'] = f'public, max-age={ASSET_MAX_AGE}, immutable'
+    return response
+
 def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
@@ -48,12 +108,178 @@ db = db_instance.connect()
 # Initialize Models
 user_model = User(db) if db is not None else None
 document_model = Document(db) if db is not None else None
+chunk_model = DocumentChunk(db) if db is not None else None
 log_model = SimplificationLog(db) if db is not None else None
 glossary_model = GlossaryTerm(db) if db is not None else None
+chunk_index_model = ChunkIndex(db) if db is not None else None
+
+# MinHash/LSH index of simplified chunks, for reusing near-duplicate templates
+near_duplicates = near_duplicate_index_from_env(chunk_index_model)
+
+# Coalesces identical in-flight simplify/summarize requests
+generation_flights = SingleFlight()
+
+# Bounds concurrent model-bound work and the queue waiting behind it
+admission = admission_from_env()
+
+# Estimates each request's memory up front; degrades to sequential chunks or rejects near the limit
+memory_budget = memory_budget_from_env()
+
+# Sampling profiles of requests an admin flagged with X-Profile: 1 or ?profile=1
+profile_store = ProfileStore(retention=int(os.getenv('PROFILE_RETENTION', '20')))
+
+# Background workers for upload-time document analysis
+analysis_executor = ThreadPoolExecutor(max_workers=int(os.getenv('ANALYSIS_WORKERS', '2')))
 
 # ─────────────────────────────────────────────
 #  Helper
 # ─────────────────────────────────────────────
+def run_document_analysis(doc_id, content):
+    """Compute and store the document analysis (runs on the background pool)."""
+    try:
+        document_model.set_analysis_status(doc_id, "running")
+        analysis = analyze_document(content)
+        document_model.update_document_analysis(doc_id, analysis)
+        return analysis
+    except Exception as e:
+        print(f"Error analyzing document {doc_id}: {e}")
+        document_model.set_analysis_status(doc_id, "failed")
+        return None
+
+
+_analysis_jobs = {}  # doc_id -> Future of the in-flight background analysis
+
+
+def index_document_chunks(user_id, doc_id, content):
+    """Add a new upload's chunks to its owner's near-duplicate index (runs on the background pool)."""
+    try:
+        near_duplicates.index_chunks(user_id, doc_id, chunk_text(content, max_tokens=400))
+    except Exception as e:
+        print(f"Error indexing chunks of document {doc_id}: {e}")
+
+
+def run_generation(user_id, label, cost, func, *args, **kwargs):
+    """Run a model-bound call under admission control and fair chunk scheduling."""
+    with admission.admit(cost), fair_scheduler.job(user_id, label, cost) as job:
+        return func(*args, job=job, **kwargs)
+
+
+def simplify_streamed(doc_id, content, level, simplification_mode, tier, cancel_token=None, job=None,
+                      readability=None, lexical=None, compaction=None, reuse=None, max_workers=None, memory=None):
+    """Simplify a very large document chunk by chunk, persisting each chunk as it completes."""
+    run_id = uuid.uuid4().hex
+    try:
+        simplify_stream(content, chunk_model.writer(doc_id, run_id), level, simplification_mode, tier,
+                        cancel_token=cancel_token, job=job, readability=readability, lexical=lexical,
+                        compaction=compaction, reuse=reuse, max_workers=max_workers, memory=memory)
+    except Cancelled as e:
+        # Chunks are persisted in order, so what was written is a clean prefix
+        e.partial = ' '.join(chunk_model.iter_chunks(doc_id, run_id)) or None
+        chunk_model.abandon_run(doc_id, run_id)
+        raise
+    except Exception:
+        chunk_model.abandon_run(doc_id, run_id)
+        raise
+    simplified = ' '.join(chunk_model.iter_chunks(doc_id, run_id))
+    # Only a completed run cleans up, and only once its own output is read
+    chunk_model.finish_run(doc_id, run_id)
+    return simplified
+
+
+def request_deadline(data):
+    """
+    Monotonic deadline for a generation request, or None for no deadline.
+
+    The request body may set "timeout" (seconds); REQUEST_DEADLINE_SECONDS
+    caps it when configured.
+    """
+    try:
+        timeout = float(data.get('timeout') or 0)
+    except (TypeError, ValueError):
+        timeout = 0
+    if REQUEST_DEADLINE_SECONDS > 0:
+        timeout = min(timeout, REQUEST_DEADLINE_SECONDS) if timeout > 0 else REQUEST_DEADLINE_SECONDS
+    return time.monotonic() + timeout if timeout > 0 else None
+
+
+_CANCELLED_MESSAGES = {
+    "superseded": "Superseded by a newer {} request",
+    "deadline": "The {} did not finish before its deadline",
+}
+
+
+def cancelled_response(error, operation):
+    """409 (cancelled, superseded) or 504 (deadline) response for work that stopped with nothing to return."""
+    message = _CANCELLED_MESSAGES.get(error.reason, "The {} was cancelled").format(operation)
+    return jsonify({
+        "success": False,
+        "cancelled": True,
+        "reason": error.reason,
+        "message": message[0].upper() + message[1:]
+    }), 504 if error.reason == "deadline" else 409
+
+
+def partial_info(error):
+    """Response fields describing a result cut short by a deadline or cancellation."""
+    return {
+        "partial": True,
+        "partial_reason": error.reason,
+        "completed_chunks": error.completed_chunks,
+        "total_chunks": error.total_chunks,
+    }
+
+
+def original_readability_stats(doc_id, doc, content):
+    """Readability counts of the original content, read from the stored analysis when it is fresh."""
+    analysis = doc.get('analysis')
+    if is_analysis_fresh(analysis, content) and analysis.get('readability_stats'):
+        return analysis['readability_stats']
+    # Stale or missing: count now and let the background job store it for next time
+    enqueue_document_analysis(doc_id, content)
+    return text_statistics(content)
+
+
+def admission_rejected_response(error):
+    """429 response for work turned away by the admission controller."""
+    response = jsonify({"success": False, "busy": True, "message": str(error)})
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response, 429
+
+
+def memory_budget_response(error):
+    """503 (retry later) or 413 (never fits) response for work turned away by the memory budget."""
+    if error.retry_after is None:
+        return jsonify({"success": False, "message": str(error)}), 413
+    response = jsonify({"success": False, "busy": True, "message": str(error)})
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response, 503
+
+
+@contextmanager
+def tracked_memory(chars, workers, prompts_per_chunk=1):
+    """
+    Reserve memory for a request and track what it actually uses.
+
+    Yields a MemoryTracker whose ``workers`` is the number of chunks the
+    request may keep in flight (fewer than asked when degraded).
+    """
+    with memory_budget.reserve(chars, workers, prompts_per_chunk) as allowed, MemoryTracker() as memory:
+        memory.workers, memory.degraded = allowed, allowed < workers
+        yield memory
+
+
+def enqueue_document_analysis(doc_id, content):
+    """Schedule background analysis so the document view becomes a pure read."""
+    if not document_model:
+        return None
+    future = _analysis_jobs.get(doc_id)
+    if future is None or future.done():
+        future = analysis_executor.submit(run_document_analysis, doc_id, content)
+        _analysis_jobs[doc_id] = future
+        future.add_done_callback(lambda f: _analysis_jobs.pop(doc_id, None))
+    return future
+
+
 def is_admin():
     """Check if current user is admin — checks DB directly to handle
     users registered before the is_admin field was added."""
@@ -71,6 +297,37 @@ def is_admin():
     return False
 
 
+@app.before_request
+def start_request_profile():
+    # Only flagged requests pay for the admin check and the sampler thread
+    if request.headers.get('X-Profile') != '1' and request.args.get('profile') != '1':
+        return
+    if not is_admin():
+        return
+    g.profiler = profiler_from_env()
+    g.profiler.start()
+
+
+@app.after_request
+def finish_request_profile(response):
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.stop()
+        profile_id = profile_store.add(profiler, request.method, request.path,
+                                       session.get('user_id'), response.status_code)
+        response.headers['X-Profile-Id'] = str(profile_id)
+    return response
+
+
+@app.teardown_request
+def abandon_request_profile(error=None):
+    # after_request is skipped when the view raised; still stop the sampler
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.stop()
+        profile_store.add(profiler, request.method, request.path, session.get('user_id'), 500)
+
+
 @app.route('/api/setup-admin', methods=['POST'])
 def setup_admin():
     """One-time setup: grant admin to the logged-in user if NO admin exists yet.
@@ -150,7 +407,14 @@ def health_check():
     db_status = "connected" if db is not None else "disconnected"
     return jsonify({
         "status": "running",
-        "database": db_status
+        "database": db_status,
+        "inference": inference_scheduler.stats(),
+        "memory": memory_budget.stats(),
+        "runtime": dict(runtime_stats(), backend=MODEL_BACKEND,
+                        max_batch_size=inference_scheduler.max_batch_size),
+        "models": {"default": registry.default, "loaded": [m["name"] for m in registry.stats()["models"]]},
+        "coalescing": generation_flights.stats(),
+        "admission": admission.stats()
     })
 
 
@@ -255,9 +519,11 @@ def upload_document():
                 filepath = os.path.join(app.config['UPLOAD_FOLDER'], f"{user_id}_{filename}")
                 file.save(filepath)
                 
-                # Read content for simplification (assuming txt for now)
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                # Read content for simplification (assuming txt for now); a file
+                # the memory budget cannot hold is refused before it is decoded
+                with memory_budget.reserve(os.path.getsize(filepath), 0):
+                    with open(filepath, 'r', encoding='utf-8') as f:
+                        content = f.read()
             else:
                  return jsonify({"success": False, "message": "Invalid file type. Only .txt allowed."}), 400
 
@@ -267,9 +533,13 @@ def upload_document():
                  return jsonify({"success": False, "message": "Content cannot be empty"}), 400
 
         # Save to DB
-        result = document_model.create_document(user_id, title, content, doc_type, original_filename)
+        result = document_model.create_document(user_id, title, content, doc_type, original_filename,
+                                                content_hash=content_hash(content))
         
         if result['success']:
+             enqueue_document_analysis(result['document_id'], content)
+             if near_duplicates is not None:
+                 analysis_executor.submit(index_document_chunks, user_id, result['document_id'], content)
              return jsonify({
                 "success": True, 
                 "message": "Document uploaded successfully",
@@ -278,6 +548,8 @@ def upload_document():
         else:
              return jsonify(result), 400
 
+    except MemoryBudgetExceeded as e:
+        return memory_budget_response(e)
     except Exception as e:
         return jsonify({"success": False, "message": f"Server error: {str(e)}"}), 500
 
@@ -320,25 +592,165 @@ def highlight_terms():
         if not text:
             return jsonify({"success": False, "message": "No text provided"}), 400
 
-        from nlp.legal_terms import find_legal_terms, highlight_text_html
-        terms = find_legal_terms(text)
-        highlighted_html = highlight_text_html(text)
+        from nlp.legal_terms import find_legal_terms, find_term_occurrences, highlight_text_html
 
         # Also merge in custom glossary terms from DB
         custom_terms = []
         if glossary_model:
             custom_terms = glossary_model.get_all_terms()
 
+        # "offsets" sends each definition once plus (start, end, term_id)
+        # occurrences for the client to render; "html" is the prerendered markup
+        if data.get('mode') == 'offsets':
+            occurrences = find_term_occurrences(text)
+            return jsonify({
+                "success": True,
+                "terms": occurrences["terms"],
+                "occurrences": occurrences["occurrences"],
+                "custom_glossary": custom_terms
+            })
+
         return jsonify({
             "success": True,
-            "terms": terms,
-            "highlighted_html": highlighted_html,
+            "terms": find_legal_terms(text),
+            "highlighted_html": highlight_text_html(text),
             "custom_glossary": custom_terms
         })
     except Exception as e:
         return jsonify({"success": False, "message": f"Highlight error: {str(e)}"}), 500
 
 
+@app.route('/api/document/<doc_id>/analysis', methods=['GET'])
+def document_analysis(doc_id):
+    """Return the precomputed analysis for a document, recomputing only if stale"""
+    if 'user_id' not in session:
+        return jsonify({"success": False, "message": "Unauthorized"}), 401
+
+    if not document_model:
+        return jsonify({"success": False, "message": "Database error"}), 500
+
+    doc = document_model.get_document_by_id(doc_id)
+    if not doc or str(doc['user_id']) != session['user_id']:
+        return jsonify({"success": False, "message": "Document not found or unauthorized"}), 404
+
+    try:
+        content = doc.get("content", "")
+        analysis = doc.get("analysis")
+        if not is_analysis_fresh(analysis, content):
+            # Join the upload-time job if it is still running instead of duplicating it
+            analysis = enqueue_document_analysis(doc_id, content).result()
+            if analysis is None:
+                return jsonify({"success": False, "message": "Analysis failed"}), 500
+
+        custom_terms = glossary_model.get_all_terms() if glossary_model else []
+
+        result = {
+            "success": True,
+            "stats": analysis["stats"],
+            "readability": analysis["readability"],
+            "complexity_map": analysis["complexity_map"],
+            "terms": analysis["terms"],
+            "custom_glossary": custom_terms,
+            "analyzer_version": analysis["analyzer_version"]
+        }
+        # ?highlight=offsets returns the stored occurrence offsets for
+        # client-side rendering; the default renders HTML from them
+        if request.args.get('highlight') == 'offsets':
+            result["term_occurrences"] = analysis["term_occurrences"]
+        else:
+            from nlp.legal_terms import highlight_text_html
+            result["highlighted_html"] = highlight_text_html(content)
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Analysis error: {str(e)}"}), 500
+
+
+# Bump when the bundle layout changes so browsers drop their cached copies
+BUNDLE_VERSION = 1
+
+
+def bundle_etag(doc_id, doc):
+    """
+    ETag of a document's artifact bundle, derived from its content hash and
+    artifact versions, or None while the stored analysis is missing or stale.
+    """
+    analysis = doc.get('analysis') or {}
+    if (not doc.get('content_hash') or analysis.get('content_hash') != doc['content_hash']
+            or analysis.get('analyzer_version') != ANALYZER_VERSION):
+        return None
+    key = f"{BUNDLE_VERSION}:{doc_id}:{doc['content_hash']}:{ANALYZER_VERSION}:{doc.get('artifacts_version', 0)}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+@app.route('/api/document/<doc_id>/bundle', methods=['GET'])
+def document_bundle(doc_id):
+    """Return every stored artifact of a document in one cacheable, compressed response"""
+    if 'user_id' not in session:
+        return jsonify({"success": False, "message": "Unauthorized"}), 401
+
+    if not document_model:
+        return jsonify({"success": False, "message": "Database error"}), 500
+
+    # Only the version fields are read to answer a revalidation
+    versions = document_model.get_document_versions(doc_id)
+    if not versions or str(versions['user_id']) != session['user_id']:
+        return jsonify({"success": False, "message": "Document not found or unauthorized"}), 404
+
+    try:
+        etag = bundle_etag(doc_id, versions)
+        if etag and request.if_none_match.contains_weak(etag):
+            response = app.response_class(status=304)
+            response.set_etag(etag, weak=True)
+            response.headers['Cache-Control'] = 'private, no-cache'
+            response.vary.add('Accept-Encoding')
+            return response
+
+        doc = document_model.get_document_by_id(doc_id)
+        content = doc.get("content", "")
+        analysis = doc.get("analysis")
+        etag = bundle_etag(doc_id, doc)
+        if not is_analysis_fresh(analysis, content):
+            # Storing the new analysis bumps the version; the next view gets the ETag
+            analysis = enqueue_document_analysis(doc_id, content).result()
+            if analysis is None:
+                return jsonify({"success": False, "message": "Analysis failed"}), 500
+            etag = None
+
+        simplified = doc.get('simplified_content')
+        summary = doc.get('summary')
+        response = jsonify({
+            "success": True,
+            "document": {
+                "id": doc_id,
+                "title": doc.get('title', 'Untitled'),
+                "status": doc.get('status'),
+                "artifacts_version": doc.get('artifacts_version', 0),
+            },
+            "stats": analysis["stats"],
+            "readability": analysis["readability"],
+            "complexity_map": analysis["complexity_map"],
+            "terms": analysis["terms"],
+            "term_occurrences": analysis["term_occurrences"],
+            "analyzer_version": analysis["analyzer_version"],
+            "simplified": {
+                "content": simplified,
+                "partial": doc.get('status') == 'partial',
+                "readability": readability_from_statistics(text_statistics(simplified)),
+            } if simplified else None,
+            "summary": {
+                "content": summary,
+                "partial": bool(doc.get('summary_partial')),
+            } if summary else None,
+        })
+        if etag:
+            response.set_etag(etag, weak=True)
+        # Cached by the browser but revalidated on every view
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return compress_response(response, request.accept_encodings)
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Bundle error: {str(e)}"}), 500
+
+
 @app.route('/document/<doc_id>')
 def view_document(doc_id):
     """View a specific document"""
@@ -356,6 +768,11 @@ def view_document(doc_id):
     # Ensure user owns the document
     if str(doc['user_id']) != session['user_id']:
         return "Unauthorized", 403
+
+    # Warm up the analysis while the page renders if it is missing or stale
+    if not is_analysis_fresh(doc.get('analysis'), doc.get('content', '')):
+        enqueue_document_analysis(doc_id, doc.get('content', ''))
+    doc.pop('analysis', None)
         
     return render_template('view_document.html', doc=doc, is_admin=session.get('is_admin', False))
 
@@ -376,9 +793,15 @@ def simplify_document(doc_id):
         level = int(data.get('level', 70))
         simplification_mode = data.get('simplification_mode', 'intermediate')
 
-        # Validate simplification mode
+        tier = data.get('tier', DEFAULT_TIER)
+
+        # Validate simplification mode and decoding tier
         if simplification_mode not in ['basic', 'intermediate', 'advanced']:
             simplification_mode = 'intermediate'
+        if tier not in TIERS:
+            tier = DEFAULT_TIER
+        # "lexical" rewrites legalese with the rule-based simplifier instead of the model
+        engine = choose_engine(data.get('engine'), simplification_mode, level)
         
         content = doc.get("content", "")
         
@@ -397,8 +820,59 @@ def simplify_document(doc_id):
         # Track processing time
         start_time = time.time()
         
+        doc_hash = doc.get('content_hash') or content_hash(content)
+        deadline = request_deadline(data)
+
+        def generate(token):
+            # Simplified-side readability is counted per chunk as generation completes
+            readability = ReadabilityAccumulator()
+            compaction = CompactionCounter()
+            dedup = {}
+            reuse = ChunkReuse(near_duplicates, session['user_id'], reuse_variant(simplification_mode, level, tier)) if near_duplicates else None
+            # The lexical engine keeps no chunks in generation, only copies of the text
+            workers = inference_scheduler.max_batch_size if engine == "model" else 0
+            with tracked_memory(len(content), workers) as memory:
+                memory.note("document", sys.getsizeof(content))
+                if engine == "lexical":
+                    # Milliseconds and no model: skip admission and fair scheduling entirely
+                    simplified = simplify_text(content, level, simplification_mode, tier,
+                                               readability=readability, lexical=True)
+                elif len(content) > STREAMING_THRESHOLD and chunk_model:
+                    simplified = run_generation(session['user_id'], doc.get('title', 'Untitled'), estimate_tokens(content),
+                                                simplify_streamed, doc_id, content, level, simplification_mode, tier,
+                                                cancel_token=token, readability=readability, lexical=False,
+                                                compaction=compaction, reuse=reuse,
+                                                max_workers=memory.workers, memory=memory)
+                else:
+                    simplified = run_generation(session['user_id'], doc.get('title', 'Untitled'), estimate_tokens(content),
+                                                simplify_text, content, level, simplification_mode, tier,
+                                                cancel_token=token, readability=readability, lexical=False,
+                                                compaction=compaction, dedup_stats=dedup, reuse=reuse,
+                                                max_workers=memory.workers, memory=memory)
+            pipeline_stats = dict(compaction.to_dict(), dedup_ratio=dedup.get('dedup_ratio', 0.0),
+                                  memory=memory.to_dict())
+            if reuse is not None:
+                pipeline_stats.update(reuse.to_dict())
+            return simplified, readability.stats, pipeline_stats
+
+        partial = None
         try:
-            simplified = simplify_text(content, level, simplification_mode)
+            (simplified, simplified_stats, pipeline_stats), coalesced = generation_flights.do(
+                (doc_hash, 'simplify', simplification_mode, level, tier, engine),
+                generate,
+                group=(doc_id, 'simplify'),
+                deadline=deadline
+            )
+        except AdmissionRejected as e:
+            return admission_rejected_response(e)
+        except MemoryBudgetExceeded as e:
+            return memory_budget_response(e)
+        except Cancelled as e:
+            # A deadline or client cancel keeps the leading chunks already simplified
+            if e.reason == "superseded" or not e.partial:
+                return cancelled_response(e, "simplification")
+            partial = e
+            simplified, simplified_stats, pipeline_stats, coalesced = e.partial, text_statistics(e.partial), {}, False
         except Exception as e:
             print(f"Error during simplification: {e}")
             return jsonify({
@@ -408,10 +882,11 @@ def simplify_document(doc_id):
         
         processing_time = round(time.time() - start_time, 2)
         
-        # Calculate readability for both original and simplified
+        # Original counts are cached on the document; simplified counts were
+        # accumulated chunk by chunk, so this is just the final arithmetic
         try:
-            original_readability = calculate_readability(content)
-            simplified_readability = calculate_readability(simplified)
+            original_readability = readability_from_statistics(original_readability_stats(doc_id, doc, content))
+            simplified_readability = readability_from_statistics(simplified_stats)
         except Exception as e:
             print(f"Error calculating readability: {e}")
             original_readability = {'flesch_kincaid_grade': 0}
@@ -426,10 +901,10 @@ def simplify_document(doc_id):
         simplified_words = len(simplified.split())
         
         # Save to DB
-        document_model.update_document_simplified(doc_id, simplified)
+        document_model.update_document_simplified(doc_id, simplified, partial=partial is not None)
 
-        # Log simplification request for admin monitoring
-        if log_model:
+        # Log simplification request for admin monitoring (cut-short runs would skew timings)
+        if log_model and partial is None:
             try:
                 log_model.create_log(
                     user_id=session['user_id'],
@@ -441,7 +916,9 @@ def simplify_document(doc_id):
                     original_grade=original_grade,
                     simplified_grade=simplified_grade,
                     original_words=original_words,
-                    simplified_words=simplified_words
+                    simplified_words=simplified_words,
+                    tier=tier if engine == "model" else engine,
+                    memory=pipeline_stats.get('memory')
                 )
             except Exception as log_err:
                 print(f"Warning: Could not log simplification: {log_err}")
@@ -451,13 +928,18 @@ def simplify_document(doc_id):
             "success": True, 
             "simplified_content": simplified,
             "simplification_mode": simplification_mode,
+            "tier": tier,
+            "engine": engine,
+            "coalesced": coalesced,
+            **(partial_info(partial) if partial is not None else {}),
             "metrics": {
                 "processing_time": processing_time,
                 "original_grade": original_grade,
                 "simplified_grade": simplified_grade,
                 "reduction": grade_reduction,
                 "original_words": original_words,
-                "simplified_words": simplified_words
+                "simplified_words": simplified_words,
+                **pipeline_stats
             }
         })
     except Exception as e:
@@ -466,6 +948,80 @@ def simplify_document(doc_id):
         traceback.print_exc()
         return jsonify({"success": False, "message": f"Server error: {str(e)}"}), 500
 
+@app.route('/simplify_compare/<doc_id>', methods=['POST'])
+def simplify_compare_document(doc_id):
+    """Generate basic, intermediate and advanced versions in one batched pass"""
+    if 'user_id' not in session:
+        return jsonify({"success": False, "message": "Unauthorized"}), 401
+    
+    if not document_model:
+        return jsonify({"success": False, "message": "Database error"}), 500
+
+    doc = document_model.get_document_by_id(doc_id)
+    if not doc or str(doc['user_id']) != session['user_id']:
+        return jsonify({"success": False, "message": "Document not found or unauthorized"}), 404
+
+    try:
+        data = request.get_json(silent=True) or {}
+        level = int(data.get('level', 70))
+        tier = data.get('tier', DEFAULT_TIER)
+        if tier not in TIERS:
+            tier = DEFAULT_TIER
+
+        content = doc.get("content", "")
+
+        if len(content) > MAX_DOCUMENT_LENGTH:
+            return jsonify({
+                "success": False, 
+                "message": f"Document too large. Maximum {MAX_DOCUMENT_LENGTH} characters allowed."
+            }), 400
+
+        if not content.strip():
+            return jsonify({"success": False, "message": "Document content is empty"}), 400
+
+        start_time = time.time()
+        with tracked_memory(len(content), inference_scheduler.max_batch_size, prompts_per_chunk=3) as memory:
+            # Three prompt variants per chunk cost roughly three documents' worth of tokens
+            versions = run_generation(session['user_id'], doc.get('title', 'Untitled'), 3 * estimate_tokens(content),
+                                      simplify_text_all_modes, content, level, tier,
+                                      max_workers=memory.workers, memory=memory)
+        processing_time = round(time.time() - start_time, 2)
+
+        original_readability = readability_from_statistics(original_readability_stats(doc_id, doc, content))
+        original_grade = round(original_readability['flesch_kincaid_grade'], 1)
+
+        results = {}
+        for mode, simplified in versions.items():
+            readability = calculate_readability(simplified)
+            simplified_grade = round(readability['flesch_kincaid_grade'], 1)
+            results[mode] = {
+                "simplified_content": simplified,
+                "readability": readability,
+                "simplified_grade": simplified_grade,
+                "reduction": round(original_grade - simplified_grade, 1),
+                "simplified_words": len(simplified.split())
+            }
+
+        return jsonify({
+            "success": True,
+            "versions": results,
+            "tier": tier,
+            "metrics": {
+                "processing_time": processing_time,
+                "original_grade": original_grade,
+                "original_readability": original_readability,
+                "original_words": len(content.split()),
+                "memory": memory.to_dict()
+            }
+        })
+    except AdmissionRejected as e:
+        return admission_rejected_response(e)
+    except MemoryBudgetExceeded as e:
+        return memory_budget_response(e)
+    except Exception as e:
+        print(f"Unexpected error in simplify_compare_document: {e}")
+        return jsonify({"success": False, "message": f"Server error: {str(e)}"}), 500
+
 @app.route('/summarize/<doc_id>', methods=['POST'])
 def summarize_document(doc_id):
     if 'user_id' not in session:
@@ -479,16 +1035,76 @@ def summarize_document(doc_id):
         return jsonify({"success": False, "message": "Document not found or unauthorized"}), 404
         
     try:
+        data = request.get_json(silent=True) or {}
+        tier = data.get('tier', DEFAULT_TIER)
+        if tier not in SUMMARY_TIERS:
+            tier = DEFAULT_TIER
+
         content = doc.get("content", "")
-        summary = summarize_text(content)
+        doc_hash = doc.get('content_hash') or content_hash(content)
+        partial = None
+
+        def summarize(token):
+            with tracked_memory(len(content), inference_scheduler.max_batch_size) as memory:
+                summary = run_generation(session['user_id'], doc.get('title', 'Untitled'), estimate_tokens(content),
+                                         summarize_text, content, tier, cancel_token=token,
+                                         max_workers=memory.workers, memory=memory)
+            return summary, memory.to_dict()
+
+        if tier == EXTRACTIVE_TIER:
+            # Sub-second sentence extraction: no model, so no admission slot needed
+            summary, memory_stats, coalesced = summarize_text(content, tier), None, False
+        else:
+            try:
+                (summary, memory_stats), coalesced = generation_flights.do(
+                    (doc_hash, 'summarize', tier),
+                    summarize,
+                    group=(doc_id, 'summarize'),
+                    deadline=request_deadline(data)
+                )
+            except Cancelled as e:
+                if e.reason == "superseded" or not e.partial:
+                    raise
+                partial = e
+                summary, memory_stats, coalesced = e.partial, None, False
         
         # Save to DB
-        document_model.update_document_summary(doc_id, summary)
+        document_model.update_document_summary(doc_id, summary, partial=partial is not None)
         
-        return jsonify({"success": True, "summary": summary})
+        return jsonify({
+            "success": True, "summary": summary, "tier": tier, "coalesced": coalesced,
+            "memory": memory_stats,
+            **(partial_info(partial) if partial is not None else {})
+        })
+    except AdmissionRejected as e:
+        return admission_rejected_response(e)
+    except MemoryBudgetExceeded as e:
+        return memory_budget_response(e)
+    except Cancelled as e:
+        return cancelled_response(e, "summarization")
     except Exception as e:
         return jsonify({"success": False, "message": f"Server error: {str(e)}"}), 500
 
+@app.route('/api/document/<doc_id>/cancel', methods=['POST'])
+def cancel_generation(doc_id):
+    """Stop this user's in-flight simplify/summarize work on a document (e.g. when the page is closed)"""
+    if 'user_id' not in session:
+        return jsonify({"success": False, "message": "Unauthorized"}), 401
+
+    if not document_model:
+        return jsonify({"success": False, "message": "Database error"}), 500
+
+    doc = document_model.get_document_by_id(doc_id)
+    if not doc or str(doc['user_id']) != session['user_id']:
+        return jsonify({"success": False, "message": "Document not found or unauthorized"}), 404
+
+    # The server cannot see a dropped connection until it writes the response,
+    # so the client says so explicitly; work other requests share keeps running
+    data = request.get_json(silent=True, force=True) or {}
+    operations = [op for op in ('simplify', 'summarize') if data.get('operation') in (None, op)]
+    cancelled = sum(generation_flights.cancel((doc_id, op), "client_cancelled") for op in operations)
+    return jsonify({"success": True, "cancelled": cancelled})
+
 @app.route('/logout')
 def logout():
     """Handle user logout"""
@@ -528,6 +1144,138 @@ def admin_stats():
         return jsonify({"success": False, "message": str(e)}), 500
 
 
+@app.route('/api/admin/admission', methods=['GET'])
+def admin_admission():
+    """Return admission control queue depth, memory budget and rejection metrics"""
+    if 'user_id' not in session or not is_admin():
+        return jsonify({"success": False, "message": "Unauthorized"}), 403
+
+    return jsonify({"success": True, "admission": admission.stats(), "memory": memory_budget.stats()})
+
+
+@app.route('/api/admin/scheduler', methods=['GET'])
+def admin_scheduler():
+    """Return fair-scheduling decisions, active jobs and queue metrics"""
+    if 'user_id' not in session or not is_admin():
+        return jsonify({"success": False, "message": "Unauthorized"}), 403
+
+    try:
+        scheduler = fair_scheduler.stats()
+        # Resolve user IDs to names for display
+        if user_model:
+            names = {}
+            for entry in scheduler['jobs'] + scheduler['users'] + scheduler['recent_decisions']:
+                uid = entry['user_id']
+                if uid not in names:
+                    user = user_model.get_user_by_id(uid)
+                    names[uid] = user.get('name', uid) if user else uid
+                entry['user_name'] = names[uid]
+        return jsonify({
+            "success": True,
+            "scheduler": scheduler,
+            "admission": admission.stats(),
+            "inference": inference_scheduler.stats()
+        })
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)}), 500
+
+
+@app.route('/api/admin/models', methods=['GET'])
+def admin_models():
+    """Return loaded, loading and draining models plus the routing table"""
+    if 'user_id' not in session or not is_admin():
+        return jsonify({"success": False, "message": "Unauthorized"}), 403
+
+    return jsonify({"success": True, "registry": registry.stats()})
+
+
+@app.route('/api/admin/models', methods=['POST'])
+def admin_load_model():
+    """Load (or hot-swap) a model in the background; requests keep using the old one until it is ready"""
+    if 'user_id' not in session or not is_admin():
+        return jsonify({"success": False, "message": "Unauthorized"}), 403
+
+    data = request.get_json(silent=True) or {}
+    name = (data.get('name') or '').strip()
+    source = (data.get('source') or '').strip()
+    if not name or not source:
+        return jsonify({"success": False, "message": "Model name and source are required"}), 400
+
+    def load():
+        try:
+            registry.load(name, source, make_default=bool(data.get('default')))
+        except Exception:
+            pass  # recorded in the registry's errors for the dashboard
+
+    threading.Thread(target=load, name=f"load-model-{name}", daemon=True).start()
+    return jsonify({"success": True, "message": f"Loading {source} as '{name}'"}), 202
+
+
+@app.route('/api/admin/models/<name>', methods=['DELETE'])
+def admin_unload_model(name):
+    """Unload a model once its in-flight batches have finished"""
+    if 'user_id' not in session or not is_admin():
+        return jsonify({"success": False, "message": "Unauthorized"}), 403
+
+    try:
+        registry.unload(name)
+    except KeyError:
+        return jsonify({"success": False, "message": "Model not found"}), 404
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    return jsonify({"success": True, "message": f"Model '{name}' unloaded"})
+
+
+@app.route('/api/admin/models/routes', methods=['PUT'])
+def admin_update_model_routes():
+    """Replace the routing rules (e.g. "simplify:advanced=base,summarize:*=base") and default model"""
+    if 'user_id' not in session or not is_admin():
+        return jsonify({"success": False, "message": "Unauthorized"}), 403
+
+    data = request.get_json(silent=True) or {}
+    try:
+        routes = parse_routes(data.get('routes', ''))
+        registry.set_routes(routes, default=data.get('default') or None)
+    except KeyError:
+        return jsonify({"success": False, "message": "Default model is not loaded"}), 400
+    except ValueError:
+        return jsonify({"success": False, "message": "Invalid route list"}), 400
+    return jsonify({"success": True, "registry": registry.stats()})
+
+
+@app.route('/api/admin/profiles', methods=['GET'])
+def admin_profiles():
+    """List stored request profiles, newest first"""
+    if 'user_id' not in session or not is_admin():
+        return jsonify({"success": False, "message": "Unauthorized"}), 403
+
+    return jsonify({"success": True, "profiles": profile_store.list()})
+
+
+@app.route('/api/admin/profiles/<int:profile_id>', methods=['GET'])
+def admin_profile_detail(profile_id):
+    """Return one profile's top-N table and collapsed stacks (for the flame graph)"""
+    if 'user_id' not in session or not is_admin():
+        return jsonify({"success": False, "message": "Unauthorized"}), 403
+
+    profile = profile_store.get(profile_id)
+    if not profile:
+        return jsonify({"success": False, "message": "Profile not found"}), 404
+
+    # ?format=collapsed downloads the stacks for flamegraph.pl / speedscope
+    if request.args.get('format') == 'collapsed':
+        lines = [f"{stack} {count}" for stack, count in profile["stacks"].items()]
+        return app.response_class('\n'.join(lines) + '\n', mimetype='text/plain')
+
+    # A missing or non-numeric limit falls back to the default
+    limit = max(1, request.args.get('limit', 30, type=int))
+    return jsonify({
+        "success": True,
+        "profile": profile,
+        "top": top_functions(profile["stacks"], limit=limit, sort=request.args.get('sort', 'self'))
+    })
+
+
 @app.route('/api/admin/requests', methods=['GET'])
 def admin_requests():
     """Return recent simplification requests"""
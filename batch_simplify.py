@@ -0,0 +1,181 @@
+"""
+Offline Batch Simplification
+Simplifies, summarizes and analyzes a whole folder (or JSONL file) of
+contracts across a pool of worker processes, streaming results to JSONL.
+
+Completed document IDs are checkpointed as they finish, so re-running the
+same command after an interruption picks up where it left off.
+
+Usage:
+    python batch_simplify.py contracts/ results.jsonl --workers 4
+    python batch_simplify.py docs.jsonl results.jsonl --mode advanced --level 80
+"""
+
+import argparse
+import importlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+
+# ─────────────────────────────────────────────
+#  Input
+# ─────────────────────────────────────────────
+def iter_documents(source):
+    """
+    Yield (doc_id, text) pairs from a directory of .txt files or a JSONL file.
+
+    JSONL lines need an "id" (or "_id") and a "text" (or "content") field.
+    Directory documents use their path relative to the directory as ID.
+    """
+    if os.path.isdir(source):
+        for root, _, files in os.walk(source):
+            for name in sorted(files):
+                if not name.lower().endswith('.txt'):
+                    continue
+                path = os.path.join(root, name)
+                with open(path, 'r', encoding='utf-8') as f:
+                    yield os.path.relpath(path, source), f.read()
+    else:
+        with open(source, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                doc_id = str(record.get('id') or record.get('_id') or line_no)
+                yield doc_id, record.get('text') or record.get('content') or ''
+
+
+def load_checkpoint(path):
+    """Return the set of document IDs already completed."""
+    if not os.path.exists(path):
+        return set()
+    with open(path, 'r', encoding='utf-8') as f:
+        return {line.rstrip('\n') for line in f if line.strip()}
+
+
+# ─────────────────────────────────────────────
+#  Worker process
+# ─────────────────────────────────────────────
+def _init_worker(workers):
+    # Give each worker its share of the cores; configure_runtime (run when
+    # nlp.model is imported) sizes torch's thread pools from this
+    os.environ.setdefault("INFERENCE_WORKERS", str(workers))
+    # Importing nlp.model loads FLAN-T5 once per worker process
+    importlib.import_module("nlp.model")
+
+
+def process_document(doc_id, text, mode, level, tier, summarize):
+    """Run the full simplification pipeline on one document (in a worker)."""
+    from nlp.model import simplify_text, summarize_text, count_tokens, model_ready
+    from nlp.readability import calculate_readability
+    from nlp.legal_terms import find_legal_terms
+
+    # Fail instead of returning the "not loaded" placeholder as the result,
+    # so the document is not checkpointed and a rerun retries it
+    if not model_ready():
+        raise RuntimeError("Model not loaded in this worker")
+
+    start = time.time()
+    simplified = simplify_text(text, level, mode, tier)
+    summary = summarize_text(text, tier) if summarize else None
+
+    return {
+        "id": doc_id,
+        "simplification_mode": mode,
+        "level": level,
+        "tier": tier,
+        "simplified_content": simplified,
+        "summary": summary,
+        "original_readability": calculate_readability(text),
+        "simplified_readability": calculate_readability(simplified),
+        "legal_terms": [t["term"] for t in find_legal_terms(text)],
+        "original_words": len(text.split()),
+        "simplified_words": len(simplified.split()),
+        "input_tokens": count_tokens(text),
+        "processing_time": round(time.time() - start, 2),
+    }
+
+
+# ─────────────────────────────────────────────
+#  Driver
+# ─────────────────────────────────────────────
+def run(args):
+    checkpoint_path = args.checkpoint or args.output + '.checkpoint'
+    done = load_checkpoint(checkpoint_path)
+    if done:
+        print(f"Resuming: {len(done)} documents already completed")
+
+    processed = failed = tokens = 0
+    start = time.time()
+    ctx = multiprocessing.get_context('spawn')
+
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=ctx,
+                             initializer=_init_worker, initargs=(args.workers,)) as pool, \
+            open(args.output, 'a', encoding='utf-8') as out, \
+            open(checkpoint_path, 'a', encoding='utf-8') as ckpt:
+
+        in_flight = {}
+
+        def drain(return_when):
+            nonlocal processed, failed, tokens
+            finished, _ = wait(in_flight, return_when=return_when)
+            for future in finished:
+                doc_id = in_flight.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    failed += 1
+                    print(f"✗ {doc_id}: {e}")
+                    continue
+                out.write(json.dumps(result, ensure_ascii=False) + '\n')
+                out.flush()
+                os.fsync(out.fileno())
+                # Only checkpoint after the result line is safely on disk
+                ckpt.write(doc_id + '\n')
+                ckpt.flush()
+                os.fsync(ckpt.fileno())
+                processed += 1
+                tokens += result['input_tokens']
+                print(f"✓ {doc_id} ({result['processing_time']}s)")
+
+        for doc_id, text in iter_documents(args.source):
+            if doc_id in done or not text.strip():
+                continue
+            # Bound the number of queued documents so memory stays flat
+            if len(in_flight) >= args.workers * 2:
+                drain(FIRST_COMPLETED)
+            future = pool.submit(process_document, doc_id, text, args.mode, args.level, args.tier, not args.no_summary)
+            in_flight[future] = doc_id
+
+        while in_flight:
+            drain(FIRST_COMPLETED)
+
+    elapsed = time.time() - start
+    print("\n" + "=" * 60)
+    print(f"Processed: {processed} documents ({failed} failed) in {elapsed:.1f}s")
+    if elapsed > 0:
+        print(f"Throughput: {processed / elapsed:.2f} docs/sec, {tokens / elapsed:.1f} tokens/sec")
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch-simplify a folder or JSONL file of contracts.")
+    parser.add_argument('source', help="Directory of .txt files or a JSONL file")
+    parser.add_argument('output', help="JSONL file results are appended to")
+    parser.add_argument('--mode', default='intermediate', choices=['basic', 'intermediate', 'advanced'])
+    parser.add_argument('--level', type=int, default=70, help="Simplification level 1-100")
+    parser.add_argument('--tier', default='quality', choices=['quality', 'fast'])
+    parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="Worker processes (one model each)")
+    parser.add_argument('--no-summary', action='store_true', help="Skip summarization")
+    parser.add_argument('--checkpoint', help="Checkpoint file (default: <output>.checkpoint)")
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
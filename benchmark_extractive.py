@@ -0,0 +1,47 @@
+"""
+Extractive Summarizer Benchmark
+Times the TF-IDF/TextRank extractive summarizer on documents of increasing
+size, and shows how much model input the salience pre-filter removes
+before abstractive summarization (fewer tokens and fewer chunks).
+"""
+
+from nlp.extractive import extractive_summary, salient_text
+from nlp.chunking import chunk_text, estimate_tokens
+from nlp.generation import TIERS
+import time
+
+CLAUSES = [
+    "The Employee shall maintain the confidentiality of all proprietary information disclosed by the Employer.",
+    "Notwithstanding the foregoing, the Company shall not be liable for any indirect or consequential damages.",
+    "Any dispute arising under this Agreement shall be resolved through binding arbitration.",
+    "Either party may terminate this Agreement upon thirty days' written notice of a material breach.",
+    "The Contractor shall indemnify and hold harmless the Client from any liability or claims by third parties.",
+    "Neither party shall be responsible for delays caused by force majeure beyond its reasonable control.",
+    "The Employer agrees to pay the Employee a salary as outlined in Schedule A attached hereto.",
+    "This Agreement shall be governed by the laws of the State of New York.",
+]
+
+SIZES = [10, 100, 1000, 5000]
+RUNS = 3
+
+print("=" * 80)
+print("EXTRACTIVE SUMMARIZER BENCHMARK")
+print("=" * 80)
+print(f"\n{'Sentences':<11} {'Chars':<10} {'Extract (ms)':<14} {'Summary words':<15}")
+print("-" * 80)
+for size in SIZES:
+    text = ' '.join(f"{CLAUSES[i % len(CLAUSES)]} (Clause {i}.)" if i % 3 else CLAUSES[i % len(CLAUSES)]
+                    for i in range(size))
+    start = time.time()
+    for _ in range(RUNS):
+        summary = extractive_summary(text)
+    elapsed = (time.time() - start) / RUNS
+    print(f"{size:<11} {len(text):<10} {elapsed * 1000:<14.1f} {len(summary.split()):<15}")
+
+print("\nPre-filter effect on model input (chunks of 500 tokens)")
+print("-" * 80)
+text = ' '.join(CLAUSES[i % len(CLAUSES)] for i in range(400))
+for tier, policy in TIERS.items():
+    kept = salient_text(text, policy["summary_keep_ratio"])
+    print(f"{tier:<9} keep {policy['summary_keep_ratio']:.0%}: {estimate_tokens(kept):>6} est. tokens, "
+          f"{len(chunk_text(kept, max_tokens=500)):>3} chunks (original {estimate_tokens(text)} tokens)")
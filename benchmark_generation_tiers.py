@@ -0,0 +1,77 @@
+"""
+Generation Tier Benchmark
+Compares latency and output quality of the "quality" and "fast" decoding
+tiers for simplification and summarization.
+"""
+
+from nlp.model import simplify_text, summarize_text
+from nlp.generation import TIERS
+from nlp.readability import calculate_readability
+import time
+
+SHORT_TEXT = """
+The Employee shall maintain the confidentiality of all proprietary information
+disclosed by the Employer during the term of employment and thereafter.
+"""
+
+LONG_TEXT = """
+The Party of the First Part, hereinafter referred to as the "Employer," and the Party of
+the Second Part, hereinafter referred to as the "Employee," hereby enter into this
+Employment Agreement pursuant to the terms and conditions set forth herein. The Employee
+agrees to perform such duties as may be assigned by the Employer from time to time in
+accordance with the Employer's standard operating procedures and policies. The Employer
+agrees to provide compensation in the form of salary, benefits, and other remuneration
+as outlined in Schedule A attached hereto. Any disputes arising under this Agreement shall
+be resolved through binding arbitration in accordance with the rules of the American
+Arbitration Association.
+""" * 4
+
+SAMPLES = {"short": SHORT_TEXT, "long": LONG_TEXT}
+RUNS = 3
+
+
+def timed(func, *args):
+    start = time.time()
+    for _ in range(RUNS):
+        output = func(*args)
+    return output, (time.time() - start) / RUNS
+
+
+print("=" * 80)
+print("GENERATION TIER BENCHMARK")
+print("=" * 80)
+
+rows = []
+for sample_name, text in SAMPLES.items():
+    original_grade = calculate_readability(text)['flesch_kincaid_grade']
+    for tier in TIERS:
+        simplified, simp_time = timed(simplify_text, text, 70, "intermediate", tier)
+        summary, sum_time = timed(summarize_text, text, tier)
+        rows.append({
+            "sample": sample_name,
+            "tier": tier,
+            "simp_time": simp_time,
+            "simp_words": len(simplified.split()),
+            "grade_drop": original_grade - calculate_readability(simplified)['flesch_kincaid_grade'],
+            "sum_time": sum_time,
+            "sum_words": len(summary.split()),
+        })
+        print(f"\n[{sample_name} / {tier}]")
+        print(f"  Simplified: {simplified[:120]}...")
+        print(f"  Summary:    {summary[:120]}...")
+
+print("\n" + "=" * 80)
+print("RESULTS (average of %d runs)" % RUNS)
+print("=" * 80)
+print(f"\n{'Sample':<8} {'Tier':<9} {'Simplify (s)':<14} {'Words':<7} {'Grade drop':<12} {'Summary (s)':<13} {'Words':<7}")
+print("-" * 80)
+for r in rows:
+    print(f"{r['sample']:<8} {r['tier']:<9} {r['simp_time']:<14.2f} {r['simp_words']:<7} "
+          f"{r['grade_drop']:<12.1f} {r['sum_time']:<13.2f} {r['sum_words']:<7}")
+
+for sample_name in SAMPLES:
+    quality = next(r for r in rows if r['sample'] == sample_name and r['tier'] == 'quality')
+    fast = next(r for r in rows if r['sample'] == sample_name and r['tier'] == 'fast')
+    if fast['simp_time'] and fast['sum_time']:
+        print(f"\n{sample_name}: fast tier is {quality['simp_time'] / fast['simp_time']:.1f}x faster to simplify, "
+              f"{quality['sum_time'] / fast['sum_time']:.1f}x faster to summarize")
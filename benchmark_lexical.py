@@ -0,0 +1,78 @@
+"""
+Lexical Simplifier Benchmark
+Compares the rule-based lexical simplifier with FLAN-T5 basic-mode
+simplification: latency, output length and readability (Flesch-Kincaid
+grade and Gunning Fog) against the original text.
+"""
+
+from nlp.lexical import lexical_simplify, plain_english
+from nlp.model import simplify_text
+from nlp.readability import calculate_readability
+import time
+
+SHORT_TEXT = """
+The Employee shall maintain the confidentiality of all proprietary information
+disclosed by the Employer during the term of employment and thereafter.
+"""
+
+LONG_TEXT = """
+The Party of the First Part, hereinafter referred to as the "Employer," and the Party of
+the Second Part, hereinafter referred to as the "Employee," hereby enter into this
+Employment Agreement pursuant to the terms and conditions set forth herein. The Employee
+agrees to perform such duties as may be assigned by the Employer from time to time in
+accordance with the Employer's standard operating procedures and policies. The Employer
+agrees to provide compensation in the form of salary, benefits, and other remuneration
+as outlined in Schedule A attached hereto. Notwithstanding the foregoing, in the event that
+either party is in breach, any disputes arising hereunder shall be resolved through binding
+arbitration in accordance with the rules of the American Arbitration Association.
+""" * 4
+
+SAMPLES = {"short": SHORT_TEXT, "long": LONG_TEXT}
+RUNS = 3
+
+
+def timed(func, *args, **kwargs):
+    start = time.time()
+    for _ in range(RUNS):
+        output = func(*args, **kwargs)
+    return output, (time.time() - start) / RUNS
+
+
+print("=" * 80)
+print("LEXICAL vs MODEL (basic mode) BENCHMARK")
+print("=" * 80)
+
+rows = []
+for sample_name, text in SAMPLES.items():
+    original = calculate_readability(text)
+    rows.append({"sample": sample_name, "engine": "original", "time": 0.0,
+                 "words": len(text.split()), "fk": original['flesch_kincaid_grade'],
+                 "fog": original['gunning_fog']})
+
+    lexical, lexical_time = timed(lexical_simplify, text)
+    model, model_time = timed(simplify_text, text, 70, "basic", lexical=False)
+
+    for engine, output, elapsed in (("lexical", lexical, lexical_time), ("model", model, model_time)):
+        readability = calculate_readability(output)
+        rows.append({"sample": sample_name, "engine": engine, "time": elapsed,
+                     "words": len(output.split()), "fk": readability['flesch_kincaid_grade'],
+                     "fog": readability['gunning_fog']})
+
+    print(f"\n[{sample_name}] {plain_english.substitute(text)[1]} substitutions")
+    print(f"  Lexical: {lexical.strip()[:120]}...")
+    print(f"  Model:   {model.strip()[:120]}...")
+
+print("\n" + "=" * 80)
+print("RESULTS (average of %d runs)" % RUNS)
+print("=" * 80)
+print(f"\n{'Sample':<8} {'Engine':<10} {'Time (ms)':<12} {'Words':<7} {'FK grade':<10} {'Fog':<7}")
+print("-" * 80)
+for r in rows:
+    print(f"{r['sample']:<8} {r['engine']:<10} {r['time'] * 1000:<12.2f} {r['words']:<7} "
+          f"{r['fk']:<10.1f} {r['fog']:<7.2f}")
+
+# Whole-document throughput of the lexical pass alone
+document = LONG_TEXT * 250
+_, elapsed = timed(lexical_simplify, document)
+print(f"\nLexical pass over a {len(document):,}-character document: {elapsed * 1000:.1f} ms "
+      f"({len(document) / elapsed / 1e6:.1f} M chars/s)")
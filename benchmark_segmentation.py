@@ -0,0 +1,92 @@
+"""
+Sentence Segmentation Benchmark
+Compares throughput and boundary agreement of the rule-based legal
+segmenter against spaCy's dependency-parser sentence boundaries.
+"""
+
+from nlp.sentence_segmenter import sentence_spans
+import spacy
+import time
+
+SAMPLE = """
+EMPLOYMENT AGREEMENT
+
+This Employment Agreement is entered into by Acme Inc. (the "Company") and John A. Smith
+(the "Employee"), effective Jan. 1, 2024. The parties agree as follows.
+
+1. Duties. The Employee shall perform such duties as may be assigned by the Company, e.g.
+supervising staff, i.e. the operations team, in accordance with Sec. 4 of the Handbook.
+2. Compensation. The Company shall pay the Employee $85,000.50 per year, subject to
+withholding under 26 U.S.C. 3402 and applicable state law.
+(a) Salary shall be paid bi-weekly.
+(b) Bonuses are discretionary. See Art. IV for details.
+3. Termination. Either party may terminate this Agreement on thirty (30) days' notice. Any
+dispute shall be resolved by arbitration in New York, N.Y. under the rules of the AAA.
+Claims may also arise under Sec. 5 of 42 U.S.C. 1983. Notices shall be given in writing.
+"""
+
+TEXT = SAMPLE * 50
+RUNS = 5
+
+
+def boundaries(spans):
+    """Sentence end offsets, excluding the end of the text."""
+    return {end for _, end in spans[:-1]}
+
+
+def spacy_spans(nlp, text):
+    doc = nlp(text)
+    spans = []
+    for sent in doc.sents:
+        stripped = sent.text.strip()
+        if stripped:
+            start = sent.start_char + (len(sent.text) - len(sent.text.lstrip()))
+            spans.append((start, start + len(stripped)))
+    return spans
+
+
+def timed(func, *args):
+    start = time.time()
+    for _ in range(RUNS):
+        output = func(*args)
+    return output, (time.time() - start) / RUNS
+
+
+print("=" * 80)
+print("SENTENCE SEGMENTATION BENCHMARK")
+print("=" * 80)
+print(f"Input: {len(TEXT):,} characters, {RUNS} runs each\n")
+
+nlp = spacy.load("en_core_web_sm", disable=["ner"])
+nlp.max_length = max(nlp.max_length, len(TEXT) + 1)
+
+rule_spans, rule_time = timed(sentence_spans, TEXT)
+parser_spans, parser_time = timed(spacy_spans, nlp, TEXT)
+
+print(f"{'Segmenter':<20} {'Sentences':>10} {'Time (s)':>10} {'Chars/sec':>14}")
+print("-" * 58)
+for name, spans, elapsed in (("rule-based", rule_spans, rule_time), ("spaCy parser", parser_spans, parser_time)):
+    print(f"{name:<20} {len(spans):>10} {elapsed:>10.4f} {len(TEXT) / elapsed:>14,.0f}")
+print(f"\nSpeedup: {parser_time / rule_time:.1f}x")
+
+# Boundary agreement, treating spaCy as the reference
+predicted = boundaries(rule_spans)
+reference = boundaries(parser_spans)
+agreed = len(predicted & reference)
+precision = agreed / len(predicted) if predicted else 0
+recall = agreed / len(reference) if reference else 0
+f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0
+
+print("\nBoundary agreement (spaCy as reference):")
+print(f"  Precision: {precision:.3f}")
+print(f"  Recall:    {recall:.3f}")
+print(f"  F1:        {f1:.3f}")
+
+print("\nFirst disagreements (rule-based | spaCy):")
+rule_only = sorted(predicted - reference)[:3]
+parser_only = sorted(reference - predicted)[:3]
+for offset in rule_only:
+    print(f"  rule-only  ...{TEXT[max(0, offset - 40):offset]!r}")
+for offset in parser_only:
+    print(f"  spaCy-only ...{TEXT[max(0, offset - 40):offset]!r}")
+print("=" * 80)
@@ -14,6 +14,8 @@ class Database:
     
     def connect(self):
         """Establish connection to MongoDB"""
+        if self.mongodb_uri.startswith('mongomock://'):
+            return self._connect_in_process()
         try:
             self.client = MongoClient(self.mongodb_uri, serverSelectionTimeoutMS=5000)
             self.db = self.client[self.db_name]
@@ -25,6 +27,18 @@ class Database:
             print(f"✗ Error connecting to MongoDB: {e}")
             return None
     
+    def _connect_in_process(self):
+        """Use an in-memory mongomock database (MONGODB_URI=mongomock://) for offline runs"""
+        try:
+            import mongomock
+        except ImportError:
+            print("✗ MONGODB_URI=mongomock:// requires the optional 'mongomock' package")
+            return None
+        self.client = mongomock.MongoClient()
+        self.db = self.client[self.db_name]
+        print(f"✓ Using in-process mongomock database: {self.db_name}")
+        return self.db
+    
     def get_collection(self, collection_name):
         """Get a specific collection"""
         if self.db is not None:
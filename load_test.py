@@ -0,0 +1,285 @@
+"""
+Offline Load Test
+Replays realistic user sessions (register, login, upload, view, analyze,
+highlight, simplify, summarize, dashboard) against the web tier at a target
+request rate, then reports throughput and p50/p95/p99 latency per endpoint.
+
+By default the app is imported in-process with the stub model backend
+(MODEL_BACKEND=stub) and an in-memory mongomock database, so neither the
+FLAN-T5 download nor a MongoDB server is needed.
+
+Usage:
+    python load_test.py --rps 20 --duration 60
+    STUB_LATENCY_MS=200 STUB_TOKENS_PER_SECOND=100 python load_test.py --rps 5
+    python load_test.py --url http://localhost:8000 --rps 10   # a running server
+"""
+
+import argparse
+import http.cookiejar
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+CLAUSES = [
+    "The Employee shall maintain the confidentiality of all proprietary information disclosed "
+    "by the Employer during the term of employment and thereafter.",
+    "Notwithstanding the foregoing, the Company shall not be liable for any indirect, incidental "
+    "or consequential damages arising hereunder.",
+    "Any dispute arising under this Agreement shall be resolved through binding arbitration "
+    "pursuant to the rules of the American Arbitration Association.",
+    "Either party may terminate this Agreement upon thirty (30) days' written notice in the event "
+    "of a material breach of contract by the other party.",
+    "The Contractor shall indemnify and hold harmless the Client from any liability, claims or "
+    "remedies sought by third parties in accordance with applicable law.",
+    "Neither party shall be responsible for delays caused by force majeure, including natural "
+    "disasters, war or governmental action beyond its reasonable control.",
+]
+
+# Short, medium and long contracts, weighted towards short ones like real traffic
+DOCUMENT_SIZES = [(3, 0.5), (15, 0.35), (60, 0.15)]
+
+
+# ─────────────────────────────────────────────
+#  Clients
+# ─────────────────────────────────────────────
+class InProcessClient:
+    """Drives the Flask app directly through its test client (one cookie jar per session)."""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, json_body=None, form=None):
+        response = self.client.open(path, method=method, json=json_body, data=form)
+        return response.status_code, response.get_data()
+
+
+class HttpClient:
+    """Drives a running server over HTTP with its own cookie jar."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar())
+        )
+
+    def request(self, method, path, json_body=None, form=None):
+        headers = {}
+        data = None
+        if json_body is not None:
+            data = json.dumps(json_body).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        elif form is not None:
+            data = urllib.parse.urlencode(form).encode('utf-8')
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        req = urllib.request.Request(self.base_url + path, data=data, headers=headers, method=method)
+        try:
+            with self.opener.open(req, timeout=300) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+
+# ─────────────────────────────────────────────
+#  Sessions
+# ─────────────────────────────────────────────
+class Session:
+    """One simulated user working through a document, one request per step."""
+
+    def __init__(self, client, rng):
+        self.client = client
+        self.rng = rng
+        self.email = f"load-{uuid.uuid4().hex[:12]}@example.com"
+        self.password = "load-test-password"
+        sentences = rng.choices([n for n, _ in DOCUMENT_SIZES], weights=[w for _, w in DOCUMENT_SIZES])[0]
+        self.content = ' '.join(rng.choice(CLAUSES) for _ in range(sentences))
+        self.doc_id = None
+        self.steps = [
+            self.register, self.login, self.upload, self.view, self.analysis,
+            self.highlight, self.analyze, self.simplify, self.summarize, self.dashboard
+        ]
+
+    @property
+    def done(self):
+        return not self.steps
+
+    def next_step(self):
+        """Run the next request and return (endpoint label, status code)."""
+        return self.steps.pop(0)()
+
+    def register(self):
+        status, _ = self.client.request('POST', '/api/register', json_body={
+            "name": "Load Test", "email": self.email, "phone": "5550100", "password": self.password
+        })
+        return 'POST /api/register', status
+
+    def login(self):
+        status, _ = self.client.request('POST', '/api/login', json_body={
+            "email": self.email, "password": self.password
+        })
+        return 'POST /api/login', status
+
+    def upload(self):
+        status, body = self.client.request('POST', '/api/upload', form={
+            "title": "Load test contract", "type": "text", "content": self.content
+        })
+        try:
+            self.doc_id = json.loads(body).get('document_id')
+        except ValueError:
+            pass
+        if not self.doc_id:
+            # Nothing to work on; skip the document steps
+            self.steps = [self.dashboard]
+        return 'POST /api/upload', status
+
+    def view(self):
+        status, _ = self.client.request('GET', f'/document/{self.doc_id}')
+        return 'GET /document/<doc_id>', status
+
+    def analysis(self):
+        status, _ = self.client.request('GET', f'/api/document/{self.doc_id}/analysis?highlight=offsets')
+        return 'GET /api/document/<doc_id>/analysis', status
+
+    def highlight(self):
+        status, _ = self.client.request('POST', '/api/highlight_terms', json_body={
+            "text": self.content, "mode": "offsets"
+        })
+        return 'POST /api/highlight_terms', status
+
+    def analyze(self):
+        status, _ = self.client.request('POST', '/api/analyze', json_body={"text": self.content})
+        return 'POST /api/analyze', status
+
+    def simplify(self):
+        status, _ = self.client.request('POST', f'/simplify/{self.doc_id}', json_body={
+            "level": self.rng.choice([30, 70, 90]),
+            "simplification_mode": self.rng.choice(['basic', 'intermediate', 'advanced']),
+        })
+        return 'POST /simplify/<doc_id>', status
+
+    def summarize(self):
+        status, _ = self.client.request('POST', f'/summarize/{self.doc_id}', json_body={})
+        return 'POST /summarize/<doc_id>', status
+
+    def dashboard(self):
+        status, _ = self.client.request('GET', '/dashboard')
+        return 'GET /dashboard', status
+
+
+# ─────────────────────────────────────────────
+#  Driver
+# ─────────────────────────────────────────────
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def make_client_factory(args):
+    if args.url:
+        return lambda: HttpClient(args.url)
+
+    # Offline defaults; explicit environment settings still win
+    os.environ.setdefault('MODEL_BACKEND', 'stub')
+    os.environ.setdefault('MONGODB_URI', 'mongomock://localhost')
+    from app import app
+    return lambda: InProcessClient(app)
+
+
+def run(args):
+    client_factory = make_client_factory(args)
+    rng = random.Random(args.seed)
+    rng_lock = threading.Lock()
+
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    stats_lock = threading.Lock()
+    ready = queue.Queue()
+    sessions_started = 0
+
+    def run_step(session, scheduled):
+        # Latency counts from the scheduled send time, so a backed-up client
+        # does not hide server slowness (no coordinated omission)
+        try:
+            endpoint, status = session.next_step()
+        except Exception as e:
+            endpoint, status = 'client error', 0
+            print(f"✗ {type(e).__name__}: {e}")
+        elapsed = time.monotonic() - scheduled
+        with stats_lock:
+            latencies[endpoint].append(elapsed)
+            if status == 0 or status >= 400:
+                errors[endpoint] += 1
+        if not session.done:
+            ready.put(session)
+
+    interval = 1.0 / args.rps
+    start = time.monotonic()
+    deadline = start + args.duration
+    scheduled = start
+    sent = 0
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        while scheduled < deadline:
+            now = time.monotonic()
+            if scheduled > now:
+                time.sleep(scheduled - now)
+            try:
+                session = ready.get_nowait()
+            except queue.Empty:
+                with rng_lock:
+                    session_rng = random.Random(rng.random())
+                session = Session(client_factory(), session_rng)
+                sessions_started += 1
+            executor.submit(run_step, session, scheduled)
+            sent += 1
+            scheduled += interval
+
+    elapsed = time.monotonic() - start
+
+    print("\n" + "=" * 100)
+    print(f"LOAD TEST — target {args.rps} req/s for {args.duration}s, "
+          f"{sessions_started} sessions, {'server ' + args.url if args.url else 'in-process (stub backend)'}")
+    print("=" * 100)
+    print(f"{'Endpoint':<40} {'Count':>6} {'Errors':>7} {'Req/s':>7} "
+          f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'Max ms':>9}")
+    print("-" * 100)
+    total = 0
+    for endpoint in sorted(latencies):
+        values = sorted(latencies[endpoint])
+        total += len(values)
+        print(f"{endpoint:<40} {len(values):>6} {errors[endpoint]:>7} {len(values) / elapsed:>7.2f} "
+              f"{percentile(values, 50) * 1000:>9.1f} {percentile(values, 95) * 1000:>9.1f} "
+              f"{percentile(values, 99) * 1000:>9.1f} {values[-1] * 1000:>9.1f}")
+    all_values = sorted(v for values in latencies.values() for v in values)
+    print("-" * 100)
+    print(f"{'All':<40} {total:>6} {sum(errors.values()):>7} {total / elapsed:>7.2f} "
+          f"{percentile(all_values, 50) * 1000:>9.1f} {percentile(all_values, 95) * 1000:>9.1f} "
+          f"{percentile(all_values, 99) * 1000:>9.1f} {(all_values[-1] if all_values else 0) * 1000:>9.1f}")
+    print("=" * 100)
+    return 1 if sum(errors.values()) else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay user sessions against the web tier at a target request rate.")
+    parser.add_argument('--rps', type=float, default=10, help="Target requests per second")
+    parser.add_argument('--duration', type=float, default=30, help="Seconds to send requests for")
+    parser.add_argument('--concurrency', type=int, default=64, help="Maximum requests in flight")
+    parser.add_argument('--url', help="Base URL of a running server (default: run the app in-process)")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed for documents and settings")
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
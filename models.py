@@ -90,13 +90,16 @@ class Document:
         # Create index on user_id for faster queries
         self.collection.create_index("user_id")
     
-    def create_document(self, user_id, title, content, doc_type='text', original_filename=None):
+    def create_document(self, user_id, title, content, doc_type='text', original_filename=None, content_hash=None):
         """Create a new document entry"""
         try:
             doc = {
                 "user_id": ObjectId(user_id),
                 "title": title,
                 "content": content,
+                "content_hash": content_hash,
+                "analysis": None,
+                "analysis_status": "pending",
                 "type": doc_type,  # 'text' or 'file'
                 "original_filename": original_filename,
                 "simplified_content": None,
@@ -168,29 +171,69 @@ class Document:
             print(f"Error fetching all documents: {e}")
             return {"items": [], "total": 0, "page": page, "per_page": per_page}
 
-    def update_document_simplified(self, doc_id, simplified_content):
-        """Update document with simplified content"""
+    def get_document_versions(self, doc_id):
+        """
+        Fetch only what identifies a document's current artifacts: owner,
+        content hash, artifacts_version (bumped whenever the analysis,
+        simplified text or summary is stored) and the analysis versions.
+        """
+        try:
+            return self.collection.find_one(
+                {"_id": ObjectId(doc_id)},
+                {"user_id": 1, "content_hash": 1, "artifacts_version": 1,
+                 "analysis.analyzer_version": 1, "analysis.content_hash": 1}
+            )
+        except Exception as e:
+            print(f"Error fetching document versions: {e}")
+            return None
+
+    def update_document_simplified(self, doc_id, simplified_content, partial=False):
+        """Update document with simplified content (status "partial" if generation was cut short)"""
         try:
             result = self.collection.update_one(
                 {"_id": ObjectId(doc_id)},
                 {"$set": {
                     "simplified_content": simplified_content,
-                    "status": "simplified"
-                }}
+                    "status": "partial" if partial else "simplified"
+                }, "$inc": {"artifacts_version": 1}}
             )
             return result.modified_count > 0
         except Exception as e:
             print(f"Error updating simplified content: {e}")
             return False
 
-    def update_document_summary(self, doc_id, summary_content):
-        """Update document with summary"""
+    def update_document_analysis(self, doc_id, analysis):
+        """Store precomputed analysis (readability, stats, terms) on a document"""
         try:
             result = self.collection.update_one(
                 {"_id": ObjectId(doc_id)},
                 {"$set": {
-                    "summary": summary_content
-                }}
+                    "analysis": analysis,
+                    "content_hash": analysis.get("content_hash"),
+                    "analysis_status": "ready"
+                }, "$inc": {"artifacts_version": 1}}
+            )
+            return result.modified_count > 0
+        except Exception as e:
+            print(f"Error updating analysis: {e}")
+            return False
+
+    def set_analysis_status(self, doc_id, status):
+        """Update the background analysis status (pending, running, ready, failed)"""
+        try:
+            self.collection.update_one({"_id": ObjectId(doc_id)}, {"$set": {"analysis_status": status}})
+        except Exception as e:
+            print(f"Error updating analysis status: {e}")
+
+    def update_document_summary(self, doc_id, summary_content, partial=False):
+        """Update document with summary (flagged partial if generation was cut short)"""
+        try:
+            result = self.collection.update_one(
+                {"_id": ObjectId(doc_id)},
+                {"$set": {
+                    "summary": summary_content,
+                    "summary_partial": partial
+                }, "$inc": {"artifacts_version": 1}}
             )
             return result.modified_count > 0
         except Exception as e:
@@ -198,6 +241,142 @@ class Document:
             return False
 
 
+class DocumentChunk:
+    """
+    Stores processed chunks of very large documents as they are produced.
+
+    Each processing run is registered in ``document_chunk_runs`` while it
+    writes. A run that completes calls finish_run after reading its output,
+    which drops the chunks of runs that are no longer writing. Runs still
+    writing, and runs started later, are never touched.
+    """
+
+    def __init__(self, db):
+        self.collection = db['document_chunks']
+        self.collection.create_index([("doc_id", 1), ("run_id", 1), ("index", 1)])
+        self.runs = db['document_chunk_runs']
+        self.runs.create_index([("doc_id", 1), ("run_id", 1)])
+
+    def writer(self, doc_id, run_id):
+        """Register a processing run and return an incremental writer for its chunks."""
+        try:
+            self.runs.insert_one({
+                "doc_id": str(doc_id),
+                "run_id": run_id,
+                "state": "writing",
+                "started_at": datetime.utcnow()
+            })
+        except Exception as e:
+            print(f"Error registering chunk run: {e}")
+        return _DocumentChunkWriter(self, doc_id, run_id)
+
+    def append_chunk(self, doc_id, run_id, index, text):
+        """Insert one processed chunk."""
+        try:
+            self.collection.insert_one({
+                "doc_id": str(doc_id),
+                "run_id": run_id,
+                "index": index,
+                "text": text,
+                "created_at": datetime.utcnow()
+            })
+            return True
+        except Exception as e:
+            print(f"Error saving chunk: {e}")
+            return False
+
+    def iter_chunks(self, doc_id, run_id):
+        """Yield a run's chunk texts in order without loading them all at once."""
+        cursor = self.collection.find(
+            {"doc_id": str(doc_id), "run_id": run_id}, {"text": 1}
+        ).sort("index", 1)
+        for chunk in cursor:
+            yield chunk["text"]
+
+    def abandon_run(self, doc_id, run_id):
+        """Mark a cancelled or failed run as done writing, without cleaning anything up."""
+        try:
+            self.runs.update_one({"doc_id": str(doc_id), "run_id": run_id}, {"$set": {"state": "abandoned"}})
+        except Exception as e:
+            print(f"Error marking chunk run: {e}")
+
+    def finish_run(self, doc_id, run_id):
+        """
+        Mark a completed run as finished, after its output has been read, and
+        drop the chunks of older runs that are finished or abandoned.
+        """
+        try:
+            run = self.runs.find_one_and_update(
+                {"doc_id": str(doc_id), "run_id": run_id}, {"$set": {"state": "finished"}}
+            )
+            if not run:
+                return
+            # Keep this run, every run still writing, and every run started after it
+            keep = [run_id] + [
+                other["run_id"] for other in self.runs.find({
+                    "doc_id": str(doc_id),
+                    "$or": [{"state": "writing"}, {"started_at": {"$gt": run["started_at"]}}]
+                }, {"run_id": 1})
+            ]
+            self.collection.delete_many({"doc_id": str(doc_id), "run_id": {"$nin": keep}})
+            self.runs.delete_many({"doc_id": str(doc_id), "run_id": {"$nin": keep}})
+        except Exception as e:
+            print(f"Error cleaning up chunks: {e}")
+
+
+class _DocumentChunkWriter:
+    def __init__(self, store, doc_id, run_id):
+        self.store = store
+        self.doc_id = doc_id
+        self.run_id = run_id
+        self.index = 0
+
+    def write(self, text):
+        self.store.append_chunk(self.doc_id, self.run_id, self.index, text)
+        self.index += 1
+
+    def close(self):
+        """Release the writer; cleanup of other runs is left to finish_run."""
+        return self.index
+
+
+class ChunkIndex:
+    """Persists the near-duplicate LSH index: chunk text, band keys and outputs per owner and variant."""
+
+    def __init__(self, db):
+        self.collection = db['chunk_index']
+        # Multikey index: a lookup is one query on the owner and the chunk's band keys
+        self.collection.create_index([("owner", 1), ("bands", 1)])
+
+    def upsert(self, key, owner, text, bands, doc_id=None, variant=None, output=None):
+        """Insert or update one chunk entry; outputs are kept per mode/level/tier variant."""
+        update = {
+            "$setOnInsert": {"owner": str(owner), "text": text, "bands": bands, "created_at": datetime.utcnow()},
+            "$set": {"updated_at": datetime.utcnow()},
+        }
+        if doc_id is not None:
+            update["$addToSet"] = {"doc_ids": str(doc_id)}
+        if variant is not None:
+            update["$set"][f"outputs.{variant}"] = output
+        try:
+            self.collection.update_one({"_id": key}, update, upsert=True)
+            return True
+        except Exception as e:
+            print(f"Error indexing chunk: {e}")
+            return False
+
+    def candidates(self, owner, bands, variant, limit=20):
+        """The owner's entries sharing any band key that already have an output for the variant."""
+        cursor = self.collection.find(
+            {"owner": str(owner), "bands": {"$in": bands}, f"outputs.{variant}": {"$exists": True}},
+            {"text": 1, f"outputs.{variant}": 1}
+        ).limit(limit)
+        return [
+            {"text": entry["text"], "output": entry["outputs"][variant]}
+            for entry in cursor
+        ]
+
+
 class SimplificationLog:
     """Tracks every simplification request for admin monitoring."""
 
@@ -208,7 +387,7 @@ class SimplificationLog:
 
     def create_log(self, user_id, doc_id, doc_title, mode, level,
                    processing_time, original_grade, simplified_grade,
-                   original_words, simplified_words):
+                   original_words, simplified_words, tier="quality", memory=None):
         """Insert a new log entry."""
         try:
             log = {
@@ -223,6 +402,8 @@ class SimplificationLog:
                 "grade_reduction": round(original_grade - simplified_grade, 1),
                 "original_words": original_words,
                 "simplified_words": simplified_words,
+                "tier": tier,
+                "memory": memory,
                 "created_at": datetime.utcnow()
             }
             result = self.collection.insert_one(log)
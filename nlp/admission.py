@@ -0,0 +1,160 @@
+"""
+Admission Control
+Bounds how many model-bound jobs run at once and how much work may wait
+behind them, so a burst of large documents is turned away early (HTTP 429)
+instead of driving every request's latency up together.
+"""
+
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class AdmissionRejected(Exception):
+    """Raised when a job cannot be admitted; carries a Retry-After hint in seconds."""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class _Ticket:
+    __slots__ = ("cost", "enqueued_at")
+
+    def __init__(self, cost):
+        self.cost = cost
+        self.enqueued_at = time.monotonic()
+
+
+class AdmissionController:
+    """
+    Bounded concurrency pool with a bounded, cost-aware FIFO wait queue.
+
+    Cost is the job's estimated token count. A job runs immediately if a
+    slot is free, otherwise it queues unless the queued cost would exceed
+    ``max_queue_tokens``. Queued jobs give up after ``max_wait_seconds``.
+    """
+
+    def __init__(self, max_concurrent=4, max_queue_tokens=20000, max_wait_seconds=30):
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.max_queue_tokens = max(0, int(max_queue_tokens))
+        self.max_wait_seconds = float(max_wait_seconds)
+
+        self._cond = threading.Condition()
+        self._queue = deque()
+        self._running = 0
+        self._running_cost = 0
+        self._queued_cost = 0
+
+        # Observed processing rate, used to estimate Retry-After
+        self._tokens_per_second = 200.0
+
+        self._admitted = 0
+        self._rejected = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait_seen = 0.0
+
+    @contextmanager
+    def admit(self, cost):
+        """
+        Hold a concurrency slot for the duration of the block.
+
+        Args:
+            cost (int): Estimated token count of the job
+
+        Raises:
+            AdmissionRejected: If the queue is over budget or the wait timed out
+        """
+        cost = max(1, int(cost))
+        self._acquire(cost)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(cost, time.monotonic() - start)
+
+    def _retry_after(self):
+        backlog = self._queued_cost + self._running_cost
+        return max(1, math.ceil(backlog / self._tokens_per_second))
+
+    def _acquire(self, cost):
+        with self._cond:
+            if self._running < self.max_concurrent and not self._queue:
+                self._start(cost, 0.0)
+                return
+
+            if self._queued_cost + cost > self.max_queue_tokens:
+                self._rejected += 1
+                raise AdmissionRejected("Server is busy, please retry shortly", self._retry_after())
+
+            ticket = _Ticket(cost)
+            self._queue.append(ticket)
+            self._queued_cost += cost
+            deadline = ticket.enqueued_at + self.max_wait_seconds
+
+            while not (self._queue[0] is ticket and self._running < self.max_concurrent):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._queue.remove(ticket)
+                    self._queued_cost -= cost
+                    self._timeouts += 1
+                    self._cond.notify_all()
+                    raise AdmissionRejected("Timed out waiting for a processing slot", self._retry_after())
+                self._cond.wait(timeout=remaining)
+
+            self._queue.popleft()
+            self._queued_cost -= cost
+            self._start(cost, time.monotonic() - ticket.enqueued_at)
+            # The next ticket may also fit if several slots freed up
+            self._cond.notify_all()
+
+    def _start(self, cost, waited):
+        self._running += 1
+        self._running_cost += cost
+        self._admitted += 1
+        self._total_wait += waited
+        self._max_wait_seen = max(self._max_wait_seen, waited)
+
+    def _release(self, cost, elapsed):
+        with self._cond:
+            self._running -= 1
+            self._running_cost -= cost
+            if elapsed > 0:
+                rate = cost / elapsed
+                self._tokens_per_second = 0.8 * self._tokens_per_second + 0.2 * rate
+            self._cond.notify_all()
+
+    def stats(self):
+        """Return queue depth and admission counters."""
+        with self._cond:
+            return {
+                "max_concurrent": self.max_concurrent,
+                "max_queue_tokens": self.max_queue_tokens,
+                "running": self._running,
+                "queue_depth": len(self._queue),
+                "queued_tokens": self._queued_cost,
+                "admitted": self._admitted,
+                "rejected": self._rejected,
+                "timeouts": self._timeouts,
+                "avg_wait_seconds": round(self._total_wait / self._admitted, 3) if self._admitted else 0,
+                "max_wait_seconds": round(self._max_wait_seen, 3),
+                "tokens_per_second": round(self._tokens_per_second, 1),
+            }
+
+
+def admission_from_env():
+    """
+    Build an AdmissionController configured from environment variables.
+
+    ADMISSION_MAX_CONCURRENT, ADMISSION_MAX_QUEUE_TOKENS and
+    ADMISSION_MAX_WAIT_SECONDS override the defaults.
+    """
+    return AdmissionController(
+        max_concurrent=int(os.getenv("ADMISSION_MAX_CONCURRENT", "4")),
+        max_queue_tokens=int(os.getenv("ADMISSION_MAX_QUEUE_TOKENS", "20000")),
+        max_wait_seconds=float(os.getenv("ADMISSION_MAX_WAIT_SECONDS", "30")),
+    )
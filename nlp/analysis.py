@@ -0,0 +1,79 @@
+"""
+Document Analysis
+Bundles the per-document analysis the document view needs (preprocessing
+stats, readability, word complexity map and legal terms) so it can be
+computed once at upload time and stored on the document.
+"""
+
+import hashlib
+
+from nlp.preprocessing import preprocess_pipeline
+from nlp.readability import analyze_word_complexity, readability_from_statistics, text_statistics
+from nlp.legal_terms import find_legal_terms, find_term_occurrences
+
+# Bump whenever any analyzer's output changes so stored results are recomputed
+ANALYZER_VERSION = 5
+
+# Above this size the per-token outputs (token list, complexity map) would
+# not fit comfortably in a MongoDB document, so only counts are stored
+MAX_DETAILED_ANALYSIS_CHARS = 200000
+
+
+def content_hash(text):
+    """Return a stable SHA-256 hex digest of document content."""
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def analyze_document(text):
+    """
+    Run every view-page analyzer over the document content.
+
+    Args:
+        text (str): Original document content
+
+    Returns:
+        dict: stats, readability, readability_stats (the additive counts
+              behind the scores), complexity_map, terms and term_occurrences
+              (offsets-only highlighting), tagged with the content hash and analyzer version
+    """
+    if len(text) > MAX_DETAILED_ANALYSIS_CHARS:
+        from nlp.chunking import iter_sentences
+
+        stats = {
+            "sentence_count": sum(1 for _ in iter_sentences(text)),
+            "word_count": len(text.split())
+        }
+        complexity_map = None
+    else:
+        stats = preprocess_pipeline(text)
+        complexity_map = analyze_word_complexity(text)
+
+    readability_stats = text_statistics(text)
+
+    return {
+        "content_hash": content_hash(text),
+        "analyzer_version": ANALYZER_VERSION,
+        "stats": stats,
+        "readability": readability_from_statistics(readability_stats),
+        "readability_stats": readability_stats,
+        "complexity_map": complexity_map,
+        "terms": find_legal_terms(text),
+        "term_occurrences": find_term_occurrences(text),
+    }
+
+
+def is_analysis_fresh(analysis, text):
+    """
+    Check whether a stored analysis still matches the content and analyzers.
+
+    Args:
+        analysis (dict | None): Analysis previously stored on the document
+        text (str): Current document content
+
+    Returns:
+        bool: True if the analysis can be served as-is
+    """
+    if not analysis:
+        return False
+    return (analysis.get("analyzer_version") == ANALYZER_VERSION
+            and analysis.get("content_hash") == content_hash(text))
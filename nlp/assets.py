@@ -0,0 +1,128 @@
+"""
+Static Asset Bundles
+Content-hashed, precompressed copies of the heavy page scripts and styles.
+
+The admin and document pages load their JS/CSS from static files instead of
+inline blocks. At startup (or ahead of time with ``python -m nlp.assets``)
+every bundle is copied to ``static/dist`` under a name that includes a hash
+of its content, and gzip and brotli variants are written next to it at
+maximum compression. A changed file gets a new URL, so the files can be
+served as immutable and cached by browsers for a year; repeat page loads
+transfer only the HTML.
+"""
+
+import hashlib
+import logging
+import os
+import sys
+
+from nlp.compression import SUFFIXES, available_encodings, compress, negotiate
+
+# Bundles fingerprinted at startup, relative to the static folder
+BUNDLES = (
+    "css/admin.css",
+    "js/admin.js",
+    "css/view_document.css",
+    "js/view_document.js",
+)
+
+DIST_DIR = "dist"
+
+# Served with Cache-Control: public, max-age=ASSET_MAX_AGE, immutable
+ASSET_MAX_AGE = 365 * 24 * 3600
+
+# Precompression happens once per file, so it can afford the slowest settings
+_MAX_LEVELS = {"br": 11, "gzip": 9}
+
+_MIMETYPES = {
+    ".css": "text/css; charset=utf-8",
+    ".js": "text/javascript; charset=utf-8",
+}
+
+
+def fingerprinted_name(path, content):
+    """``js/admin.js`` -> ``js/admin.<hash>.js`` for the given content."""
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.{digest}{ext}"
+
+
+def _write_once(path, data):
+    # A fingerprinted file never changes, so an existing one is already right
+    if os.path.exists(path):
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    # Atomic, so concurrent workers building at startup never see a half-written file
+    os.replace(tmp, path)
+
+
+class AssetManifest:
+    """
+    Maps bundle paths to their fingerprinted files and serves them.
+
+    Bundles that fail to build are served from their source path instead,
+    without the long-lived cache headers.
+    """
+
+    def __init__(self, static_folder, bundles=BUNDLES, dist_dir=DIST_DIR):
+        self.static_folder = static_folder
+        self.bundles = bundles
+        self.dist_folder = os.path.join(static_folder, dist_dir)
+        self.files = {}  # bundle path -> fingerprinted path inside dist
+
+    def build(self):
+        """
+        Fingerprint and precompress every bundle.
+
+        Returns:
+            dict: bundle path -> fingerprinted path
+        """
+        for bundle in self.bundles:
+            try:
+                with open(os.path.join(self.static_folder, bundle), "rb") as f:
+                    content = f.read()
+                name = fingerprinted_name(bundle, content)
+                target = os.path.join(self.dist_folder, name)
+                _write_once(target, content)
+                for encoding in available_encodings():
+                    _write_once(target + SUFFIXES[encoding], compress(content, encoding, level=_MAX_LEVELS[encoding]))
+                self.files[bundle] = name
+            except OSError:
+                logging.exception(f"Could not build static bundle {bundle}")
+        return dict(self.files)
+
+    def url_path(self, bundle):
+        """
+        Path of a bundle relative to its route.
+
+        Returns:
+            tuple: (path, fingerprinted), where fingerprinted says whether the
+                   path points into dist (True) or at the source file (False)
+        """
+        name = self.files.get(bundle)
+        return (name, True) if name else (bundle, False)
+
+    def resolve(self, name, accept_encodings):
+        """
+        Pick the file to send for a fingerprinted name.
+
+        Returns:
+            tuple: (file path, Content-Type, Content-Encoding or None), or
+                   None if the name is not a built bundle
+        """
+        if name not in self.files.values():
+            return None
+        path = os.path.join(self.dist_folder, name)
+        offered = [e for e in available_encodings() if os.path.exists(path + SUFFIXES[e])]
+        encoding = negotiate(accept_encodings, offered)
+        mimetype = _MIMETYPES.get(os.path.splitext(name)[1], "application/octet-stream")
+        return (path + SUFFIXES[encoding] if encoding else path), mimetype, encoding
+
+
+if __name__ == "__main__":
+    static_folder = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.dirname(__file__)), "static")
+    for bundle, name in AssetManifest(static_folder).build().items():
+        print(f"{bundle} -> {DIST_DIR}/{name}")
@@ -0,0 +1,268 @@
+"""
+Cross-request Micro-batching for Model Inference
+Collects pending generation requests from every in-flight HTTP request,
+groups them by generation config and runs them through the model as
+micro-batches on a single inference thread.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import CancelledError, Future, TimeoutError as FutureTimeout
+
+from nlp.cancellation import Cancelled
+from nlp.memory import BatchMemory
+from nlp.profiling import current_tags, tagged
+
+# Input lengths are bucketed so that prompts padded into the same batch
+# have similar sizes and padding waste stays small.
+LENGTH_BUCKETS = (64, 128, 256, 512, 1024)
+
+
+def length_bucket(num_tokens):
+    """
+    Map an input token count onto its padding bucket.
+
+    Args:
+        num_tokens (int): Estimated input token count
+
+    Returns:
+        int: Upper bound of the bucket the input falls into
+    """
+    for bucket in LENGTH_BUCKETS:
+        if num_tokens <= bucket:
+            return bucket
+    return LENGTH_BUCKETS[-1]
+
+
+class _Pending:
+    __slots__ = ("prompt", "future", "enqueued_at", "cancel_token", "memory", "profile_tags")
+
+    def __init__(self, prompt, cancel_token=None, memory=None):
+        self.prompt = prompt
+        self.future = Future()
+        self.enqueued_at = time.monotonic()
+        self.cancel_token = cancel_token
+        self.memory = memory
+        # Profiled requests whose sampler should follow this prompt into the batcher
+        self.profile_tags = current_tags()
+
+    @property
+    def cancelled(self):
+        return self.cancel_token is not None and self.cancel_token.cancelled
+
+
+class InferenceScheduler:
+    """
+    Batches generation requests that share a generation config.
+
+    Callers submit one prompt at a time and receive a Future. A background
+    thread drains the queues: a group is dispatched as soon as it holds
+    ``max_batch_size`` prompts or its oldest prompt has waited
+    ``max_wait_ms`` milliseconds, whichever comes first.
+
+    Prompts whose cancellation token fires while queued are dropped before
+    they reach the model; during generation the tokens are handed to
+    ``generate_fn`` so cancelled rows stop decoding early. When prompts carry
+    a MemoryTracker, ``generate_fn`` also receives a BatchMemory to report
+    tensor sizes into, and each tracker is charged its rows' share.
+    """
+
+    def __init__(self, generate_fn, max_batch_size=8, max_wait_ms=20):
+        """
+        Args:
+            generate_fn (callable): ``generate_fn(prompts, gen_kwargs,
+                cancel_tokens, memory)`` that returns one decoded string per
+                prompt
+            max_batch_size (int): Maximum prompts per model call
+            max_wait_ms (float): Maximum time a prompt waits for company
+        """
+        self.generate_fn = generate_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+
+        self._groups = {}  # group_key -> (gen_kwargs, deque[_Pending])
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = None
+
+        self._batches = 0
+        self._items = 0
+        self._busy_time = 0.0
+        self._errors = 0
+
+    # ── Public API ──
+    def submit(self, prompt, gen_kwargs, mode="default", input_tokens=0, cancel_token=None, memory=None):
+        """
+        Queue a prompt for batched generation.
+
+        Args:
+            prompt (str): Full model prompt
+            gen_kwargs (dict): Keyword arguments for ``model.generate``
+            mode (str): Simplification mode or task name used for grouping
+            input_tokens (int): Estimated prompt length used for bucketing
+            cancel_token (CancelToken): Stops the prompt while queued or
+                generating; the Future then raises Cancelled
+            memory (MemoryTracker): Charged for the tensors of the batch the
+                prompt runs in
+
+        Returns:
+            Future: Resolves to the decoded model output
+        """
+        key = (mode, tuple(sorted(gen_kwargs.items())), length_bucket(input_tokens))
+        pending = _Pending(prompt, cancel_token, memory)
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Inference scheduler is shut down")
+            self._ensure_worker()
+            if key not in self._groups:
+                self._groups[key] = (dict(gen_kwargs), deque())
+            self._groups[key][1].append(pending)
+            self._cond.notify()
+
+        return pending.future
+
+    def generate(self, prompt, gen_kwargs, mode="default", input_tokens=0, timeout=None, cancel_token=None,
+                 memory=None):
+        """
+        Submit a prompt and block until its output is ready.
+
+        Raises:
+            Cancelled: If cancel_token fired or its deadline passed first
+        """
+        future = self.submit(prompt, gen_kwargs, mode, input_tokens, cancel_token, memory)
+        if cancel_token is None:
+            return future.result(timeout=timeout)
+
+        # Explicit cancellation drops the prompt if it is still queued
+        cancel_token.add_callback(future.cancel)
+        try:
+            remaining = cancel_token.remaining()
+            if timeout is not None:
+                remaining = timeout if remaining is None else min(timeout, remaining)
+            return future.result(timeout=remaining)
+        except FutureTimeout:
+            # Past the deadline the token fires; a running generation stops
+            # at its next decoding step without anyone waiting for it
+            cancel_token.raise_if_cancelled()
+            raise
+        except CancelledError:
+            raise Cancelled(cancel_token.reason)
+        finally:
+            cancel_token.remove_callback(future.cancel)
+
+    def stats(self):
+        """Return batching counters for health and admin endpoints."""
+        with self._cond:
+            queued = sum(len(items) for _, items in self._groups.values())
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": round(self.max_wait * 1000, 1),
+                "queued": queued,
+                "groups": len(self._groups),
+                "batches": self._batches,
+                "items": self._items,
+                "avg_batch_size": round(self._items / self._batches, 2) if self._batches else 0,
+                "busy_seconds": round(self._busy_time, 2),
+                "errors": self._errors,
+            }
+
+    def shutdown(self):
+        """Stop the worker thread after the queues drain."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join()
+
+    # ── Worker ──
+    def _ensure_worker(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="inference-batcher", daemon=True)
+            self._thread.start()
+
+    def _next_batch(self):
+        """Block until a group is ready and pop up to max_batch_size items from it."""
+        with self._cond:
+            while True:
+                if not self._groups:
+                    if self._closed:
+                        return None, None
+                    self._cond.wait()
+                    continue
+
+                now = time.monotonic()
+                # Oldest waiting group goes first so no config starves
+                key = min(self._groups, key=lambda k: self._groups[k][1][0].enqueued_at)
+                gen_kwargs, items = self._groups[key]
+                deadline = items[0].enqueued_at + self.max_wait
+
+                if len(items) >= self.max_batch_size or now >= deadline or self._closed:
+                    batch = [items.popleft() for _ in range(min(self.max_batch_size, len(items)))]
+                    if not items:
+                        del self._groups[key]
+                    return gen_kwargs, batch
+
+                self._cond.wait(timeout=deadline - now)
+
+    def _run(self):
+        while True:
+            gen_kwargs, batch = self._next_batch()
+            if batch is None:
+                return
+
+            # Callers may have given up (cancelled) while waiting in the queue
+            batch = [p for p in batch if p.future.set_running_or_notify_cancel()]
+            for pending in batch:
+                if pending.cancelled:
+                    pending.future.set_exception(Cancelled(pending.cancel_token.reason))
+            batch = [p for p in batch if not p.future.done()]
+            if not batch:
+                continue
+
+            trackers = Counter(p.memory for p in batch if p.memory is not None)
+            batch_memory = BatchMemory() if trackers else None
+
+            profile_tags = {tag for p in batch for tag in p.profile_tags}
+            start = time.monotonic()
+            try:
+                with tagged(profile_tags):
+                    outputs = self.generate_fn([p.prompt for p in batch], gen_kwargs,
+                                               cancel_tokens=[p.cancel_token for p in batch],
+                                               memory=batch_memory)
+                for tracker, rows in trackers.items():
+                    tracker.add_batch(batch_memory, rows, len(batch))
+                for pending, output in zip(batch, outputs):
+                    # A row stopped mid-generation holds a truncated output
+                    if pending.cancelled:
+                        pending.future.set_exception(Cancelled(pending.cancel_token.reason))
+                    else:
+                        pending.future.set_result(output)
+            except Exception as e:
+                logging.exception("Error during batched generation")
+                self._errors += 1
+                # Rows settled before the failure keep their result; setting
+                # an exception on them would raise and kill this thread
+                for pending in batch:
+                    if not pending.future.done():
+                        pending.future.set_exception(e)
+            finally:
+                self._busy_time += time.monotonic() - start
+                self._batches += 1
+                self._items += len(batch)
+
+
+def scheduler_from_env(generate_fn, default_batch_size=8):
+    """
+    Build an InferenceScheduler configured from environment variables.
+
+    INFERENCE_MAX_BATCH_SIZE and INFERENCE_MAX_WAIT_MS override the defaults.
+    """
+    return InferenceScheduler(
+        generate_fn,
+        max_batch_size=int(os.getenv("INFERENCE_MAX_BATCH_SIZE", str(default_batch_size))),
+        max_wait_ms=float(os.getenv("INFERENCE_MAX_WAIT_MS", "20")),
+    )
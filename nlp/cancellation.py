@@ -0,0 +1,94 @@
+"""
+Cancellation Tokens
+Lets a caller ask long-running document processing to stop, either between
+chunks or in the middle of a generation, and gives each request a deadline.
+"""
+
+import threading
+import time
+
+
+class Cancelled(Exception):
+    """
+    Raised inside processing when its cancellation token has fired.
+
+    Document pipelines attach what they finished before stopping: ``partial``
+    is the output of the leading chunks, in order, or None if nothing was done.
+    """
+
+    def __init__(self, reason="cancelled", partial=None, completed_chunks=0, total_chunks=None):
+        super().__init__(reason)
+        self.reason = reason
+        self.partial = partial
+        self.completed_chunks = completed_chunks
+        self.total_chunks = total_chunks
+
+
+class CancelToken:
+    """
+    Thread-safe flag passed down through simplify/summarize processing.
+
+    Processing code calls ``raise_if_cancelled()`` at safe points (between
+    chunks) and the model checks ``cancelled`` between decoding steps;
+    whoever owns the token calls ``cancel()``. A token with a deadline
+    cancels itself, with reason "deadline", once the deadline has passed.
+    """
+
+    def __init__(self, deadline=None):
+        """
+        Args:
+            deadline (float): time.monotonic() value after which work stops
+        """
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = []
+        self.reason = None
+        self.deadline = deadline
+
+    @classmethod
+    def with_timeout(cls, seconds):
+        """Token whose deadline is ``seconds`` from now (None for no deadline)."""
+        return cls(time.monotonic() + seconds if seconds else None)
+
+    def cancel(self, reason="cancelled"):
+        """Request cancellation; the first reason given is kept."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def add_callback(self, callback):
+        """Call ``callback()`` on cancellation (immediately if already cancelled)."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def remove_callback(self, callback):
+        """Forget a callback registered with add_callback (no-op if absent)."""
+        with self._lock:
+            try:
+                self._callbacks.remove(callback)
+            except ValueError:
+                pass
+
+    def remaining(self):
+        """Seconds until the deadline, or None if there is none."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    @property
+    def cancelled(self):
+        if not self._event.is_set() and self.deadline is not None and time.monotonic() >= self.deadline:
+            self.cancel("deadline")
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self.cancelled:
+            raise Cancelled(self.reason)
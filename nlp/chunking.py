@@ -1,30 +1,75 @@
-from nltk.tokenize import sent_tokenize
-import nltk
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from nlp.cancellation import Cancelled
+from nlp.profiling import propagate
+from nlp.sentence_segmenter import split_sentences
 
-# Ensure punkt is downloaded
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+# Characters of input tokenized into sentences at a time by iter_sentences
+SENTENCE_BLOCK_SIZE = 20000
 
-def chunk_text(text, max_tokens=400):
+def _iter_blocks(source, block_size):
+    """Yield text blocks of roughly block_size characters from a string or iterable of strings."""
+    if isinstance(source, str):
+        for start in range(0, len(source), block_size):
+            yield source[start:start + block_size]
+    else:
+        buffer = []
+        size = 0
+        for piece in source:
+            buffer.append(piece)
+            size += len(piece)
+            if size >= block_size:
+                yield ''.join(buffer)
+                buffer, size = [], 0
+        if buffer:
+            yield ''.join(buffer)
+
+def iter_sentences(source, block_size=SENTENCE_BLOCK_SIZE):
     """
-    Split large text into processable chunks based on token limit.
+    Lazily split text into sentences.
+    
+    The input is tokenized one block at a time; the last sentence of each
+    block may be cut off by the block boundary, so it is carried over and
+    re-tokenized together with the next block.
     
     Args:
-        text (str): Input text to chunk
-        max_tokens (int): Maximum tokens per chunk (default: 400)
+        source (str | iterable): Text, or an iterable of text pieces such as
+            an open file
+        block_size (int): Characters tokenized per step
     
-    Returns:
-        list: List of text chunks
+    Yields:
+        str: Sentences in document order
     """
-    if not text or not text.strip():
-        return []
+    carry = ''
+    for block in _iter_blocks(source, block_size):
+        sentences = split_sentences(carry + block)
+        if not sentences:
+            carry = ''
+            continue
+        # Keep the trailing whitespace so a boundary that fell between
+        # sentences is not glued onto the next block's first word
+        trailing = (carry + block)[len((carry + block).rstrip()):]
+        carry = sentences.pop() + trailing
+        yield from sentences
+        # A run-on "sentence" longer than several blocks is emitted as-is
+        # rather than re-tokenized forever
+        if len(carry) > block_size * 4:
+            yield carry.strip()
+            carry = ''
+    if carry.strip():
+        yield from split_sentences(carry)
+
+def iter_chunks(sentences, max_tokens=400):
+    """
+    Lazily group sentences into chunks based on token limit.
     
-    # Split into sentences
-    sentences = sent_tokenize(text)
+    Args:
+        sentences (iterable): Sentences in document order
+        max_tokens (int): Maximum tokens per chunk (default: 400)
     
-    chunks = []
+    Yields:
+        str: Text chunks
+    """
     current_chunk = []
     current_token_count = 0
     
@@ -32,51 +77,272 @@ def chunk_text(text, max_tokens=400):
         # Approximate token count (words)
         sentence_tokens = len(sentence.split())
         
-        # If adding this sentence exceeds limit, save current chunk
+        # If adding this sentence exceeds limit, emit current chunk
         if current_token_count + sentence_tokens > max_tokens and current_chunk:
-            chunks.append(' '.join(current_chunk))
+            yield ' '.join(current_chunk)
             current_chunk = [sentence]
             current_token_count = sentence_tokens
         else:
             current_chunk.append(sentence)
             current_token_count += sentence_tokens
     
-    # Add remaining sentences
+    # Emit remaining sentences
     if current_chunk:
-        chunks.append(' '.join(current_chunk))
+        yield ' '.join(current_chunk)
+
+def chunk_text(text, max_tokens=400):
+    """
+    Split large text into processable chunks based on token limit.
+    
+    Args:
+        text (str): Input text to chunk
+        max_tokens (int): Maximum tokens per chunk (default: 400)
     
-    return chunks
+    Returns:
+        list: List of text chunks
+    """
+    if not text or not text.strip():
+        return []
+    
+    return list(iter_chunks(iter_sentences(text), max_tokens))
 
-def process_large_document(text, process_func, max_tokens=400):
+def iter_processed(chunks, process_func, max_workers=1):
     """
-    Process large documents by chunking and applying function to each chunk.
+    Lazily apply a function to a stream of chunks, in order.
+    
+    At most max_workers chunks are in flight at once, so memory stays
+    bounded no matter how long the chunk stream is.
     
     Args:
-        text (str): Large text to process
+        chunks (iterable): Text chunks
         process_func (callable): Function to apply to each chunk
-        max_tokens (int): Maximum tokens per chunk
+        max_workers (int): Maximum chunks processed at the same time
+    
+    Yields:
+        str: Processed chunks in input order
+    """
+    if max_workers <= 1:
+        for chunk in chunks:
+            yield process_func(chunk)
+        return
+    
+    process_func = propagate(process_func)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append(executor.submit(process_func, chunk))
+            if len(in_flight) >= max_workers:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+class JoinWriter:
+    """Incremental writer that joins processed chunks into one string."""
+    
+    def __init__(self):
+        self.parts = []
+    
+    def write(self, text):
+        self.parts.append(text)
+    
+    def close(self):
+        return ' '.join(self.parts)
+
+class FileWriter:
+    """Incremental writer that appends processed chunks to an open text file."""
+    
+    def __init__(self, file):
+        self.file = file
+        self.first = True
+    
+    def write(self, text):
+        if not self.first:
+            self.file.write(' ')
+        self.file.write(text)
+        self.file.flush()
+        self.first = False
+    
+    def close(self):
+        return None
+
+def map_chunks(chunks, func, max_workers=1):
+    """
+    Apply a function to every chunk, optionally with several chunks in flight.
+    
+    With max_workers > 1 the chunks are submitted concurrently so that the
+    inference scheduler can batch them together; output order always
+    matches input order.
+    
+    Args:
+        chunks (list): Text chunks
+        func (callable): Function to apply to each chunk
+        max_workers (int): Maximum chunks processed at the same time
     
     Returns:
-        str: Combined processed text
+        list: Results in chunk order
     """
-    chunks = chunk_text(text, max_tokens)
+    if max_workers <= 1 or len(chunks) <= 1:
+        return [func(chunk) for chunk in chunks]
     
-    if not chunks:
-        return ""
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+        return list(executor.map(propagate(func), chunks))
+
+def map_chunks_partial(chunks, func, max_workers=1):
+    """
+    Like map_chunks, but stop cleanly when func raises Cancelled.
+    
+    Chunks already in flight finish (or stop at their own cancellation
+    check) and their results are kept.
+    
+    Returns:
+        tuple: (results in chunk order with None for chunks not done,
+                the first Cancelled raised or None)
+    """
+    outputs = [None] * len(chunks)
+    cancelled = None
+    if max_workers <= 1 or len(chunks) <= 1:
+        for i, chunk in enumerate(chunks):
+            try:
+                outputs[i] = func(chunk)
+            except Cancelled as e:
+                return outputs, e
+        return outputs, None
     
-    # Process each chunk
-    processed_chunks = []
-    for chunk in chunks:
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+        func = propagate(func)
+        futures = [executor.submit(func, chunk) for chunk in chunks]
+        for i, future in enumerate(futures):
+            try:
+                outputs[i] = future.result()
+            except Cancelled as e:
+                cancelled = cancelled or e
+    return outputs, cancelled
+
+def leading_outputs(outputs):
+    """Return the results before the first chunk that was not done."""
+    done = []
+    for output in outputs:
+        if output is None:
+            break
+        done.append(output)
+    return done
+
+def _safe_processor(process_func, cancel_token=None, on_output=None, copies=None):
+    """Wrap process_func with cancellation checks, error fallback and the on_output hook."""
+    def safe_process(chunk):
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
         try:
             processed = process_func(chunk)
-            processed_chunks.append(processed)
+        except Cancelled:
+            raise
         except Exception as e:
             print(f"Error processing chunk: {e}")
             # Return original chunk if processing fails
-            processed_chunks.append(chunk)
+            processed = chunk
+        if on_output is not None:
+            on_output(processed, copies[chunk] if copies is not None else 1)
+        return processed
+    return safe_process
+
+def stream_large_document(source, process_func, writer, max_tokens=400, max_workers=1, cancel_token=None,
+                          on_output=None):
+    """
+    Process a document as a lazy pipeline with bounded memory.
+    
+    sentences -> chunks -> processor -> incremental writer; each processed
+    chunk is handed to the writer as soon as it (and every chunk before it)
+    is done.
+    
+    Args:
+        source (str | iterable): Text, or an iterable of text pieces
+        process_func (callable): Function to apply to each chunk
+        writer: Object with write(text) and close() methods
+        max_tokens (int): Maximum tokens per chunk
+        max_workers (int): Maximum chunks processed concurrently
+        cancel_token (CancelToken): Checked before each chunk and during
+            generation; raises Cancelled with completed_chunks set to the
+            number of chunks already handed to the writer
+        on_output (callable): Called as on_output(processed, copies) in the
+            worker as each chunk finishes
+    
+    Returns:
+        dict: chunks, input_chars and output_chars processed
+    """
+    safe_process = _safe_processor(process_func, cancel_token, on_output)
+    
+    stats = {"chunks": 0, "input_chars": 0, "output_chars": 0}
+    
+    def counted(chunks):
+        for chunk in chunks:
+            stats["chunks"] += 1
+            stats["input_chars"] += len(chunk)
+            yield chunk
+    
+    chunks = counted(iter_chunks(iter_sentences(source), max_tokens))
+    written = 0
+    try:
+        for processed in iter_processed(chunks, safe_process, max_workers):
+            stats["output_chars"] += len(processed)
+            writer.write(processed)
+            written += 1
+    except Cancelled as e:
+        e.completed_chunks = written
+        raise
+    
+    return stats
+
+def process_large_document(text, process_func, max_tokens=400, max_workers=1, cancel_token=None,
+                           on_output=None, dedup=False, stats=None):
+    """
+    Process large documents by chunking and applying function to each chunk.
+    
+    With dedup, passages the document repeats are processed once and their
+    output is reused for every copy (see nlp.dedup), in original order.
+    
+    Args:
+        text (str): Large text to process
+        process_func (callable): Function to apply to each chunk
+        max_tokens (int): Maximum tokens per chunk
+        max_workers (int): Maximum chunks processed concurrently
+        cancel_token (CancelToken): Checked before each chunk and during
+            generation; the Cancelled raised carries the processed leading
+            chunks, joined, as ``partial``
+        on_output (callable): Called as on_output(processed, copies) as each
+            chunk finishes; copies is how often the chunk occurs in the text
+        dedup (bool): Process each distinct chunk only once
+        stats (dict): Updated with the dedup statistics when given
+    
+    Returns:
+        str: Combined processed text
+    """
+    if not text or not text.strip():
+        return ""
+    
+    if not dedup:
+        writer = JoinWriter()
+        try:
+            stream_large_document(text, process_func, writer, max_tokens, max_workers, cancel_token, on_output)
+        except Cancelled as e:
+            e.partial = writer.close() or None
+            raise
+        return writer.close()
+    
+    from nlp.dedup import dedup_units
     
-    # Combine processed chunks
-    return ' '.join(processed_chunks)
+    unique, order, dedup_stats = dedup_units(list(iter_sentences(text)), max_tokens)
+    if stats is not None:
+        stats.update(dedup_stats)
+    copies = Counter(unique[i] for i in order)
+    outputs, cancelled = map_chunks_partial(
+        unique, _safe_processor(process_func, cancel_token, on_output, copies), max_workers
+    )
+    if cancelled is not None:
+        done = leading_outputs(outputs[i] for i in order)
+        cancelled.partial = ' '.join(done) or None
+        cancelled.completed_chunks, cancelled.total_chunks = len(done), len(order)
+        raise cancelled
+    return ' '.join(outputs[i] for i in order)
 
 def estimate_tokens(text):
     """
@@ -0,0 +1,83 @@
+"""
+HTTP Response Compression
+Content-Encoding negotiation and gzip/brotli compression for API responses
+and static assets.
+
+gzip comes from the standard library. Brotli is used when the optional
+``brotli`` package is installed, and is preferred whenever the client
+accepts it.
+"""
+
+import gzip
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this are sent as-is; the headers would cost more than they save
+MIN_COMPRESS_BYTES = 1024
+
+# File suffix of each precompressed variant
+SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+def available_encodings():
+    """Encodings this process can produce, best first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate(accept_encodings, offered=None):
+    """
+    Pick the encoding to respond with.
+
+    Args:
+        accept_encodings: The request's Accept-Encoding (a werkzeug
+            MIMEAccept-like object with ``quality(value)``)
+        offered (iterable): Encodings on offer, best first (default: all available)
+
+    Returns:
+        str: "br", "gzip", or None for the identity encoding
+    """
+    for encoding in offered or available_encodings():
+        if accept_encodings.quality(encoding) > 0:
+            return encoding
+    return None
+
+
+def compress(body, encoding, level=None):
+    """
+    Compress bytes with the given encoding.
+
+    Args:
+        body (bytes): Uncompressed body
+        encoding (str): "br" or "gzip"
+        level (int): Compression level (default: fast for responses)
+    """
+    if encoding == "br":
+        return brotli.compress(body, quality=5 if level is None else level)
+    if encoding == "gzip":
+        # mtime=0 keeps the output identical for identical input
+        return gzip.compress(body, compresslevel=6 if level is None else level, mtime=0)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def compress_response(response, accept_encodings):
+    """
+    Compress a Flask response body in place if the client accepts it.
+
+    Streamed, already-encoded and small bodies are left alone.
+
+    Returns:
+        Response: The same response object
+    """
+    response.vary.add("Accept-Encoding")
+    if response.direct_passthrough or response.is_streamed or "Content-Encoding" in response.headers:
+        return response
+    body = response.get_data()
+    encoding = negotiate(accept_encodings)
+    if encoding is None or len(body) < MIN_COMPRESS_BYTES:
+        return response
+    response.set_data(compress(body, encoding))
+    response.headers["Content-Encoding"] = encoding
+    return response
@@ -0,0 +1,86 @@
+"""
+Intra-document Deduplication
+Finds sentences and clauses that a document repeats, so each distinct
+passage is generated once and its output reused for every copy.
+
+Contracts restate boilerplate clauses and whole paragraphs many times.
+Sentences are keyed by their normalized text and grouped into chunks, and
+the grouping is aligned to repeated passages so every copy of a passage
+becomes an identical chunk. A document without repeats is chunked exactly
+as iter_chunks would chunk it.
+"""
+
+from collections import Counter
+
+
+def normalize_unit(text):
+    """Comparison key for a sentence: case-folded, whitespace collapsed."""
+    return ' '.join(text.casefold().split())
+
+
+def dedup_units(sentences, max_tokens=400):
+    """
+    Group sentences into chunks and collapse chunks that repeat.
+
+    Runs of sentences that occur more than once are kept apart from runs of
+    one-off sentences. A repeated run is cut wherever a sentence that
+    started an earlier repeated chunk comes round again, so repeats of a
+    passage line up chunk for chunk.
+
+    Args:
+        sentences (list): Sentences in document order
+        max_tokens (int): Maximum tokens (words) per chunk
+
+    Returns:
+        tuple: (unique chunk texts, order as indexes into them, stats dict
+                with units, unique_units, words, unique_words and dedup_ratio)
+    """
+    keys = [normalize_unit(s) for s in sentences]
+    counts = Counter(keys)
+
+    units = []
+    heads = set()  # keys that started a repeated chunk
+    current, current_keys, current_tokens, current_repeated = [], set(), 0, False
+
+    for sentence, key in zip(sentences, keys):
+        repeated = counts[key] > 1
+        tokens = len(sentence.split())
+        if current and (
+            repeated != current_repeated
+            or current_tokens + tokens > max_tokens
+            or (repeated and (key in heads or key in current_keys))
+        ):
+            units.append(current)
+            current, current_keys, current_tokens = [], set(), 0
+        if not current:
+            current_repeated = repeated
+            if repeated:
+                heads.add(key)
+        current.append((sentence, key))
+        current_keys.add(key)
+        current_tokens += tokens
+    if current:
+        units.append(current)
+
+    unique = []
+    index = {}
+    order = []
+    words = unique_words = 0
+    for unit in units:
+        unit_key = tuple(key for _, key in unit)
+        unit_words = sum(len(sentence.split()) for sentence, _ in unit)
+        words += unit_words
+        if unit_key not in index:
+            index[unit_key] = len(unique)
+            unique.append(' '.join(sentence for sentence, _ in unit))
+            unique_words += unit_words
+        order.append(index[unit_key])
+
+    stats = {
+        "units": len(order),
+        "unique_units": len(unique),
+        "words": words,
+        "unique_words": unique_words,
+        "dedup_ratio": round(1 - unique_words / words, 3) if words else 0.0,
+    }
+    return unique, order, stats
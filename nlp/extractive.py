@@ -0,0 +1,206 @@
+"""
+Extractive Summarizer
+Scores sentences with TF-IDF vectors and TextRank over their cosine
+similarity graph, vectorized with NumPy.
+
+The term matrix is kept sparse (row, column, value arrays), and the
+similarity graph is never materialized: each PageRank step multiplies by
+X·Xᵀ as two sparse products, so a document of thousands of sentences is
+ranked in well under a second. The ranking serves as a summary tier of its
+own and as a pre-filter that keeps only salient sentences for the model.
+Sentences that repeat one already selected are skipped in both roles.
+"""
+
+import math
+import re
+
+import numpy as np
+
+from nlp.sentence_segmenter import split_sentences
+
+_WORD_RE = re.compile(r"[a-z][a-z'\-]+")
+
+# Function words carry no topical signal; legal boilerplate words are kept
+# because IDF already discounts them when they appear everywhere
+_STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has have
+having he her here hers him his how i if in into is it its itself just me more most my no nor not now
+of off on once only or other our ours out over own same she should so some such than that the their
+theirs them then there these they this those through to too under until up very was we were what when
+where which while who whom why will with would you your yours
+""".split())
+
+DAMPING = 0.85
+
+# A candidate this similar (TF-IDF cosine) to a sentence already selected
+# adds nothing to a summary and is skipped
+REDUNDANCY_THRESHOLD = 0.8
+
+
+def _term_matrix(sentences):
+    """
+    Build L2-normalized TF-IDF rows as sparse (rows, cols, values) arrays.
+
+    Term frequency is sublinear (1 + log tf) so a sentence that repeats a
+    word is not scored as being mostly about it.
+    """
+    rows, words = [], []
+    for i, sentence in enumerate(sentences):
+        tokens = [w for w in _WORD_RE.findall(sentence.lower()) if w not in _STOPWORDS]
+        words.extend(tokens)
+        rows.extend([i] * len(tokens))
+
+    n = len(sentences)
+    if not words:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(0), 0
+
+    vocab, cols = np.unique(np.array(words), return_inverse=True)
+    vocab_size = len(vocab)
+
+    # Collapse repeated (sentence, term) pairs into term counts
+    keys, tf = np.unique(np.asarray(rows, dtype=np.int64) * vocab_size + cols, return_counts=True)
+    rows, cols = keys // vocab_size, keys % vocab_size
+
+    df = np.bincount(cols, minlength=vocab_size)
+    idf = np.log((1 + n) / (1 + df)) + 1
+    values = (1 + np.log(tf)) * idf[cols]
+
+    norms = np.sqrt(np.bincount(rows, weights=values ** 2, minlength=n))
+    values = values / norms[rows]
+    return rows, cols, values, vocab_size
+
+
+def sentence_scores(sentences, damping=DAMPING, max_iter=50, tol=1e-6):
+    """
+    TextRank score of each sentence on its TF-IDF cosine similarity graph.
+
+    Args:
+        sentences (list): Sentence strings
+        damping (float): PageRank damping factor
+        max_iter (int): Power-iteration limit
+        tol (float): Stop once scores change less than this (L1)
+
+    Returns:
+        numpy.ndarray: One score per sentence (sums to 1)
+    """
+    return _textrank(_term_matrix(sentences), len(sentences), damping, max_iter, tol)
+
+
+def _textrank(matrix, n, damping=DAMPING, max_iter=50, tol=1e-6):
+    if n == 0:
+        return np.zeros(0)
+
+    rows, cols, values, vocab_size = matrix
+    if vocab_size == 0:
+        return np.full(n, 1.0 / n)
+
+    def similarity_times(x):
+        # (X·Xᵀ - I)·x without forming the n x n matrix; the diagonal is the
+        # self-similarity of each normalized non-empty row
+        xt = np.bincount(cols, weights=values * x[rows], minlength=vocab_size)
+        return np.bincount(rows, weights=values * xt[cols], minlength=n) - has_terms * x
+
+    has_terms = (np.bincount(rows, minlength=n) > 0).astype(float)
+    degree = np.maximum(similarity_times(np.ones(n)), 0)
+    connected = degree > 1e-12
+    inverse_degree = np.where(connected, 1 / np.where(connected, degree, 1), 0)
+
+    scores = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        updated = (1 - damping) / n + damping * similarity_times(scores * inverse_degree)
+        # Mass from sentences with no neighbours is spread evenly
+        updated += damping * scores[~connected].sum() / n
+        converged = np.abs(updated - scores).sum() < tol
+        scores = updated
+        if converged:
+            break
+    return scores / scores.sum()
+
+
+def _normalized(sentence):
+    return ' '.join(re.findall(r"\w+", sentence.lower()))
+
+
+def top_sentence_indices(sentences, k, redundancy=REDUNDANCY_THRESHOLD):
+    """
+    Return the indices of the k highest-scoring sentences, in document order.
+
+    Selection is greedy in score order, MMR-style: a candidate whose
+    normalized text matches a selected sentence, or whose TF-IDF cosine with
+    one reaches ``redundancy``, is skipped. A document that repeats itself
+    may therefore yield fewer than k sentences.
+    """
+    n = len(sentences)
+    matrix = _term_matrix(sentences)
+    rows, cols, values, _ = matrix
+    scores = _textrank(matrix, n)
+    # Rows are sorted, so each sentence's terms are one contiguous slice
+    bounds = np.searchsorted(rows, np.arange(n + 1))
+
+    selected, seen_texts = [], set()
+    postings = {}  # term -> [(selected sentence, weight)]
+    # Stable ranking so ties keep the earlier sentence
+    for i in np.argsort(-scores, kind="stable"):
+        if len(selected) >= k:
+            break
+        text = _normalized(sentences[i])
+        if text in seen_texts:
+            continue
+        terms = cols[bounds[i]:bounds[i + 1]]
+        weights = values[bounds[i]:bounds[i + 1]]
+        overlap = {}
+        for term, weight in zip(terms.tolist(), weights.tolist()):
+            for j, other in postings.get(term, ()):
+                overlap[j] = overlap.get(j, 0.0) + weight * other
+        if overlap and max(overlap.values()) >= redundancy:
+            continue
+        selected.append(int(i))
+        seen_texts.add(text)
+        for term, weight in zip(terms.tolist(), weights.tolist()):
+            postings.setdefault(term, []).append((int(i), weight))
+    return sorted(selected)
+
+
+def summary_length(sentence_count):
+    """Default number of sentences in an extractive summary of a document."""
+    return max(3, min(12, math.ceil(sentence_count * 0.15)))
+
+
+def extractive_summary(text, num_sentences=None):
+    """
+    Summarize by picking the most central sentences, kept in original order.
+
+    Args:
+        text (str): Document text
+        num_sentences (int): Sentences to keep (default: summary_length)
+
+    Returns:
+        str: The selected sentences joined with spaces
+    """
+    sentences = split_sentences(text)
+    k = num_sentences or summary_length(len(sentences))
+    return ' '.join(sentences[i] for i in top_sentence_indices(sentences, k))
+
+
+def salient_text(text, keep_ratio, min_sentences=3):
+    """
+    Keep only the most salient share of a text's sentences for the model.
+
+    Args:
+        text (str): Text about to be summarized
+        keep_ratio (float): Fraction of sentences to keep (1.0 keeps all)
+        min_sentences (int): Never keep fewer than this, unless the text
+            repeats itself
+
+    Returns:
+        str: The kept sentences in original order, without repeats
+    """
+    if keep_ratio >= 1:
+        return text
+    sentences = split_sentences(text)
+    k = max(min_sentences, math.ceil(len(sentences) * keep_ratio))
+    if len(sentences) <= k:
+        return text
+    return ' '.join(sentences[i] for i in top_sentence_indices(sentences, k))
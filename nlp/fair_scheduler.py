@@ -0,0 +1,275 @@
+"""
+Fair Chunk Scheduling
+Interleaves generation work from different users at chunk granularity.
+
+Every chunk must take a turn before it is sent to the model. Turns are
+handed out by priority class first (short interactive requests before bulk
+documents) and then by weighted fair queuing across users, so one user's
+100k-character contract cannot starve everyone else on the worker.
+"""
+
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+from nlp.cancellation import Cancelled
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+PRIORITY_ORDER = (INTERACTIVE, BULK)
+
+
+class Job:
+    """One simplify/summarize request as seen by the scheduler."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, user_id, label, total_cost, priority):
+        self.id = next(self._ids)
+        self.user_id = str(user_id)
+        self.label = label
+        self.total_cost = total_cost
+        self.priority = priority
+        self.submitted_at = time.time()
+        self.chunks_done = 0
+        self.chunks_waiting = 0
+        self.wait_time = 0.0
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "user_id": self.user_id,
+            "label": self.label,
+            "priority": self.priority,
+            "estimated_tokens": self.total_cost,
+            "chunks_done": self.chunks_done,
+            "chunks_waiting": self.chunks_waiting,
+            "wait_seconds": round(self.wait_time, 2),
+            "age_seconds": round(time.time() - self.submitted_at, 1),
+        }
+
+
+class _Waiter:
+    __slots__ = ("job", "cost", "enqueued_at", "granted")
+
+    def __init__(self, job, cost):
+        self.job = job
+        self.cost = cost
+        self.enqueued_at = time.monotonic()
+        self.granted = False
+
+
+class FairScheduler:
+    """
+    Hands out a fixed number of concurrent chunk turns.
+
+    Within a priority class, the user with the lowest virtual time (tokens
+    already served, normalized so idle users don't bank credit) goes next.
+    """
+
+    def __init__(self, slots=8, interactive_tokens=300, history=200):
+        """
+        Args:
+            slots (int): Chunks allowed in generation at the same time
+            interactive_tokens (int): Jobs at or under this estimated size
+                get interactive priority
+            history (int): Number of scheduling decisions kept for the dashboard
+        """
+        self.slots = max(1, int(slots))
+        self.interactive_tokens = int(interactive_tokens)
+
+        self._cond = threading.Condition()
+        self._busy = 0
+        # priority -> user_id -> deque[_Waiter]
+        self._waiting = {p: {} for p in PRIORITY_ORDER}
+        self._vtime = {}  # user_id -> virtual time (tokens served)
+        self._jobs = {}  # job_id -> Job
+        self._decisions = deque(maxlen=history)
+        self._served = {}  # user_id -> {"tokens", "chunks", "wait"}
+
+    # ── Jobs ──
+    @contextmanager
+    def job(self, user_id, label, total_cost):
+        """Register a request for the duration of the block and yield its Job."""
+        priority = INTERACTIVE if total_cost <= self.interactive_tokens else BULK
+        job = Job(user_id, label, total_cost, priority)
+        with self._cond:
+            self._jobs[job.id] = job
+        try:
+            yield job
+        finally:
+            with self._cond:
+                self._jobs.pop(job.id, None)
+                self._evict_idle()
+
+    def turn(self, job, cost, cancel_token=None):
+        """
+        Context manager holding one chunk turn for ``job``.
+
+        Returns a no-op context when job is None (e.g. offline batch runs).
+        Raises Cancelled if ``cancel_token`` fires while the chunk is waiting.
+        """
+        if job is None:
+            return nullcontext()
+        return self._turn(job, max(1, int(cost)), cancel_token)
+
+    @contextmanager
+    def _turn(self, job, cost, cancel_token):
+        self._acquire(job, cost, cancel_token)
+        try:
+            yield
+        finally:
+            self._release()
+
+    # ── Internals ──
+    def _has_waiters(self):
+        return any(users for users in self._waiting.values())
+
+    def _acquire(self, job, cost, cancel_token=None):
+        with self._cond:
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            waiter = _Waiter(job, cost)
+            if self._busy < self.slots and not self._has_waiters():
+                self._grant(waiter)
+                return
+
+            self._waiting[job.priority].setdefault(job.user_id, deque()).append(waiter)
+            job.chunks_waiting += 1
+            if cancel_token is None:
+                while not waiter.granted:
+                    self._cond.wait()
+                return
+
+            cancel_token.add_callback(self._wake)
+            try:
+                while not waiter.granted:
+                    if cancel_token.cancelled:
+                        self._withdraw(waiter)
+                        raise Cancelled(cancel_token.reason)
+                    # Wakes on grants, on cancel() and at the token's deadline
+                    self._cond.wait(timeout=cancel_token.remaining())
+            finally:
+                cancel_token.remove_callback(self._wake)
+
+    def _wake(self):
+        with self._cond:
+            self._cond.notify_all()
+
+    def _withdraw(self, waiter):
+        """Take a waiter that gave up out of its user's queue."""
+        users = self._waiting[waiter.job.priority]
+        queue = users.get(waiter.job.user_id)
+        if queue is not None and waiter in queue:
+            queue.remove(waiter)
+            if not queue:
+                del users[waiter.job.user_id]
+            waiter.job.chunks_waiting -= 1
+
+    def _release(self):
+        with self._cond:
+            self._busy -= 1
+            while self._busy < self.slots:
+                waiter = self._pick_next()
+                if waiter is None:
+                    break
+                waiter.job.chunks_waiting -= 1
+                self._grant(waiter)
+            self._cond.notify_all()
+
+    def _pick_next(self):
+        for priority in PRIORITY_ORDER:
+            users = self._waiting[priority]
+            if not users:
+                continue
+            user_id = min(users, key=lambda u: (self._vtime.get(u, 0), users[u][0].enqueued_at))
+            queue = users[user_id]
+            waiter = queue.popleft()
+            if not queue:
+                del users[user_id]
+            return waiter
+        return None
+
+    def _grant(self, waiter):
+        job = waiter.job
+        waited = time.monotonic() - waiter.enqueued_at
+
+        # A user returning after idling starts at the current floor instead of
+        # spending credit accumulated while they were away
+        active = [self._vtime[u] for u in self._vtime if self._is_active(u)]
+        floor = min(active) if active else 0
+        self._vtime[job.user_id] = max(self._vtime.get(job.user_id, 0), floor) + waiter.cost
+
+        self._busy += 1
+        waiter.granted = True
+        job.chunks_done += 1
+        job.wait_time += waited
+
+        served = self._served.setdefault(job.user_id, {"tokens": 0, "chunks": 0, "wait": 0.0})
+        served["tokens"] += waiter.cost
+        served["chunks"] += 1
+        served["wait"] += waited
+
+        self._decisions.append({
+            "time": time.strftime('%H:%M:%S'),
+            "job_id": job.id,
+            "user_id": job.user_id,
+            "label": job.label,
+            "priority": job.priority,
+            "cost": waiter.cost,
+            "waited_ms": round(waited * 1000, 1),
+        })
+
+    def _is_active(self, user_id):
+        return any(j.user_id == user_id for j in self._jobs.values())
+
+    def _evict_idle(self):
+        """
+        Forget users with no jobs or queued chunks whose virtual time is at or
+        below the active floor: they would restart at the floor anyway, so
+        keeping them only grows the tables.
+        """
+        active = {j.user_id for j in self._jobs.values()}
+        active.update(u for users in self._waiting.values() for u in users)
+        floor = min((self._vtime[u] for u in active if u in self._vtime), default=None)
+        for user_id in [u for u in self._vtime if u not in active]:
+            if floor is None or self._vtime[user_id] <= floor:
+                del self._vtime[user_id]
+                self._served.pop(user_id, None)
+
+    def stats(self):
+        """Return active jobs, per-user service and recent decisions for the admin dashboard."""
+        with self._cond:
+            return {
+                "slots": self.slots,
+                "busy": self._busy,
+                "waiting_chunks": sum(len(q) for users in self._waiting.values() for q in users.values()),
+                "interactive_tokens": self.interactive_tokens,
+                "jobs": [j.to_dict() for j in self._jobs.values()],
+                # Users idle at or below the active floor have been forgotten
+                "users": [
+                    {
+                        "user_id": user_id,
+                        "tokens": s["tokens"],
+                        "chunks": s["chunks"],
+                        "avg_wait_ms": round(s["wait"] / s["chunks"] * 1000, 1) if s["chunks"] else 0,
+                    }
+                    for user_id, s in self._served.items()
+                ],
+                "recent_decisions": list(reversed(self._decisions)),
+            }
+
+
+def fair_scheduler_from_env(default_slots=8):
+    """
+    Build a FairScheduler configured from environment variables.
+
+    FAIR_SCHEDULER_SLOTS and FAIR_SCHEDULER_INTERACTIVE_TOKENS override the defaults.
+    """
+    return FairScheduler(
+        slots=int(os.getenv("FAIR_SCHEDULER_SLOTS", str(default_slots))),
+        interactive_tokens=int(os.getenv("FAIR_SCHEDULER_INTERACTIVE_TOKENS", "300")),
+    )
@@ -0,0 +1,206 @@
+"""
+Generation Policy
+Sizes FLAN-T5 output budgets relative to the input length and mode, and
+defines the decoding tiers the API can choose between.
+"""
+
+# Decoding tiers. "quality" keeps the original decoding strategies
+# (sampling for simplification, 4-beam search for summaries); "fast" is
+# greedy with tighter length caps, and only the most salient half of the
+# document's sentences (by TextRank) is summarized. In every tier, a document
+# longer than summary_input_budget tokens is cut down to its most salient
+# sentences before any chunk reaches the model.
+TIERS = {
+    "quality": {
+        "simplify": {"do_sample": True, "temperature": 0.7, "top_p": 0.9},
+        "summary": {"num_beams": 4, "do_sample": False, "length_penalty": 2.0},
+        "max_simplify_tokens": 512,
+        "max_summary_tokens": 400,
+        "summary_keep_ratio": 1.0,
+        "summary_input_budget": 4000,
+    },
+    "fast": {
+        "simplify": {"do_sample": False, "num_beams": 1},
+        "summary": {"do_sample": False, "num_beams": 1},
+        "max_simplify_tokens": 192,
+        "max_summary_tokens": 128,
+        "summary_keep_ratio": 0.5,
+        "summary_input_budget": 2000,
+    },
+}
+
+DEFAULT_TIER = "quality"
+
+# Summary-only tier: TextRank sentence extraction, no model at all
+EXTRACTIVE_TIER = "extractive"
+SUMMARY_TIERS = tuple(TIERS) + (EXTRACTIVE_TIER,)
+
+# Output length relative to input length, per simplification mode
+MODE_OUTPUT_RATIO = {
+    "basic": 1.2,
+    "intermediate": 1.0,
+    "advanced": 0.8,
+}
+
+SUMMARY_OUTPUT_RATIO = 0.35
+MIN_SIMPLIFY_TOKENS = 40
+MIN_SUMMARY_TOKENS = 32
+
+# Budgets are rounded up to this step so that chunks of similar length
+# share a generation config and can be micro-batched together.
+BUDGET_STEP = 32
+
+# Generation may stop at a sentence end only within this last fraction of
+# the budget, so a sequence about to hit the cap ends on a full sentence
+# instead of mid-word. Earlier, EOS decides where the output ends.
+SENTENCE_END_WINDOW = 0.125
+
+
+def normalize_tier(tier):
+    """Return a known tier name, falling back to the default."""
+    return tier if tier in TIERS else DEFAULT_TIER
+
+
+def _round_budget(tokens, floor, cap):
+    tokens = max(floor, min(cap, int(tokens)))
+    rounded = -(-tokens // BUDGET_STEP) * BUDGET_STEP
+    return min(cap, rounded)
+
+
+def _sentence_end_floor(budget):
+    """Tokens generated before a sentence end may stop generation early."""
+    return budget - max(1, int(budget * SENTENCE_END_WINDOW))
+
+
+def simplify_generation_config(input_tokens, level=70, simplification_mode="intermediate", tier=DEFAULT_TIER):
+    """
+    Build generate() kwargs for simplifying one chunk.
+
+    The budget scales with the chunk's own token count: higher slider levels
+    ask for a shorter rewrite, and the mode ratio keeps basic output close to
+    the original length while advanced output is allowed to shrink.
+
+    Args:
+        input_tokens (int): Token count of the chunk (without the prompt)
+        level (int): Slider level 1-100
+        simplification_mode (str): basic, intermediate or advanced
+        tier (str): Decoding tier name
+
+    Returns:
+        dict: Keyword arguments for model.generate
+    """
+    policy = TIERS[normalize_tier(tier)]
+    level = max(1, min(100, int(level)))
+
+    # level 1 -> 1.3x the input, level 100 -> 0.8x the input
+    level_factor = 1.3 - (level * 0.005)
+    ratio = MODE_OUTPUT_RATIO.get(simplification_mode, 1.0) * level_factor
+    budget = _round_budget(input_tokens * ratio, MIN_SIMPLIFY_TOKENS, policy["max_simplify_tokens"])
+
+    config = dict(policy["simplify"])
+    config["max_new_tokens"] = budget
+    config["stop_at_sentence_end"] = _sentence_end_floor(budget)
+    return config
+
+
+def summary_generation_config(input_tokens, tier=DEFAULT_TIER):
+    """
+    Build generate() kwargs for summarizing one chunk.
+
+    Args:
+        input_tokens (int): Token count of the chunk (without the prompt)
+        tier (str): Decoding tier name
+
+    Returns:
+        dict: Keyword arguments for model.generate
+    """
+    policy = TIERS[normalize_tier(tier)]
+    budget = _round_budget(input_tokens * SUMMARY_OUTPUT_RATIO, MIN_SUMMARY_TOKENS, policy["max_summary_tokens"])
+
+    config = dict(policy["summary"])
+    config["max_new_tokens"] = budget
+    config["min_new_tokens"] = min(20, budget // 4)
+    config["stop_at_sentence_end"] = _sentence_end_floor(budget)
+    return config
+
+
+def summary_keep_ratio(input_tokens, tier=DEFAULT_TIER):
+    """
+    Share of a document's sentences to summarize: the tier's keep ratio,
+    lowered so the kept text fits the tier's summary input budget.
+    """
+    policy = TIERS[normalize_tier(tier)]
+    ratio = policy["summary_keep_ratio"]
+    if input_tokens > policy["summary_input_budget"]:
+        ratio = min(ratio, policy["summary_input_budget"] / input_tokens)
+    return ratio
+
+
+def build_stopping_criteria(tokenizer, min_new_tokens):
+    """
+    Create a StoppingCriteriaList that ends each sequence at the first
+    sentence-final token once it is at least min_new_tokens long.
+
+    Args:
+        tokenizer: HuggingFace tokenizer used to find sentence-ending tokens
+        min_new_tokens (int): Minimum generated length before stopping early
+
+    Returns:
+        StoppingCriteriaList
+    """
+    import torch
+    from transformers import StoppingCriteria, StoppingCriteriaList
+
+    end_ids = _sentence_end_ids(tokenizer)
+
+    class SentenceEndCriteria(StoppingCriteria):
+        def __call__(self, input_ids, scores, **kwargs):
+            done = torch.isin(input_ids[:, -1], end_ids.to(input_ids.device))
+            if input_ids.shape[1] < min_new_tokens:
+                done = torch.zeros_like(done)
+            return done
+
+    return StoppingCriteriaList([SentenceEndCriteria()])
+
+
+def build_cancellation_criteria(cancel_tokens):
+    """
+    Create a StoppingCriteriaList that ends each row of a batch as soon as
+    the CancelToken of the request it belongs to fires (or its deadline
+    passes), so a cancelled request stops decoding mid-generation.
+
+    Args:
+        cancel_tokens (list): One CancelToken (or None) per prompt in the batch
+
+    Returns:
+        StoppingCriteriaList
+    """
+    import torch
+    from transformers import StoppingCriteria, StoppingCriteriaList
+
+    tokens = list(cancel_tokens)
+
+    class CancelledCriteria(StoppingCriteria):
+        def __call__(self, input_ids, scores, **kwargs):
+            done = torch.tensor([t is not None and t.cancelled for t in tokens], dtype=torch.bool)
+            # Beam search expands every prompt into consecutive rows
+            rows_per_prompt = input_ids.shape[0] // len(tokens)
+            return done.repeat_interleave(rows_per_prompt).to(input_ids.device)
+
+    return StoppingCriteriaList([CancelledCriteria()])
+
+
+_END_IDS_CACHE = {}
+
+
+def _sentence_end_ids(tokenizer):
+    import torch
+
+    key = id(tokenizer)
+    if key not in _END_IDS_CACHE:
+        ids = [
+            idx for tok, idx in tokenizer.get_vocab().items()
+            if tok.rstrip().endswith((".", "!", "?"))
+        ]
+        _END_IDS_CACHE[key] = torch.tensor(ids, dtype=torch.long)
+    return _END_IDS_CACHE[key]
@@ -110,6 +110,78 @@ LEGAL_GLOSSARY = {
     "accrued": "Accumulated or built up over time, even if not yet paid.",
 }
 
+# Drop-in plain-English replacements for legalese, used by the lexical
+# simplifier. Most keys are LEGAL_GLOSSARY terms whose definition boils down
+# to a short phrase; the rest are common verbose constructions. Replacements
+# must read correctly wherever the phrase appears and mean the same thing, so
+# terms that need a whole definition (e.g. "force majeure", "escrow") are left
+# out, as are words whose nearest plain word shifts the legal meaning
+# ("shall" is not always a duty, "provided that" is not a plain "if",
+# "indemnify" is more than "compensate").
+PLAIN_ENGLISH_SUBSTITUTIONS = {
+    # Here-/there- words
+    "hereinafter referred to as": "called",
+    "hereinafter": "from now on",
+    "hereinabove": "above",
+    "herein": "in this agreement",
+    "hereof": "of this agreement",
+    "hereunder": "under this agreement",
+    "hereto": "to this agreement",
+    "hereafter": "from now on",
+    "thereof": "of it",
+    "therein": "in it",
+    "thereby": "by doing so",
+    "thereto": "to it",
+    "thereunder": "under it",
+    "forthwith": "immediately",
+    "aforementioned": "above",
+    "aforesaid": "above",
+    # Connectives and framing
+    "pursuant to": "under",
+    "in accordance with": "under",
+    "notwithstanding anything to the contrary herein": "despite anything else in this agreement",
+    "notwithstanding anything to the contrary": "despite anything else",
+    "notwithstanding the foregoing": "despite the above",
+    "notwithstanding": "despite",
+    "in witness whereof": "as proof",
+    "witnesseth": "states",
+    "whereas": "since",
+    "now therefore": "so",
+    "in consideration of": "in exchange for",
+    "in the event that": "if",
+    "in the event of": "if there is",
+    "prior to": "before",
+    "subsequent to": "after",
+    "with respect to": "about",
+    "in order to": "to",
+    "by means of": "by",
+    "in lieu of": "instead of",
+    "set forth": "stated",
+    # Parties and obligations
+    "party of the first part": "first party",
+    "party of the second part": "second party",
+    "liable": "responsible",
+    "mutual covenants": "promises by both sides",
+    "covenants": "promises",
+    "covenant": "promise",
+    "due and payable": "owed",
+    "time is of the essence": "deadlines are strict",
+    "commence": "start",
+    "commencement": "start",
+    "deemed": "considered",
+    "utilize": "use",
+    "remuneration": "pay",
+    # Latin
+    "in perpetuity": "forever",
+    "inter alia": "among other things",
+    "bona fide": "genuine",
+    "pro rata": "proportionally",
+    "ab initio": "from the start",
+    "mutatis mutandis": "with the needed changes",
+    "ipso facto": "by that fact",
+    "pari passu": "equally",
+}
+
 def find_legal_terms(text):
     """
     Scan input text for known legal terms and return a list of found terms
@@ -148,6 +220,72 @@ def find_legal_terms(text):
             for item in sorted_terms]
 
 
+# One alternation over every term, longest first, so each occurrence is
+# found in a single pass and "breach of contract" wins over "breach"
+_TERMS_RE = re.compile(
+    r'\b(?:' + '|'.join(re.escape(t) for t in sorted(LEGAL_GLOSSARY, key=len, reverse=True)) + r')\b',
+    re.IGNORECASE
+)
+
+
+def _iter_term_matches(text):
+    """Yield non-overlapping (start, end, term) matches in document order."""
+    for m in _TERMS_RE.finditer(text):
+        term = m.group(0).lower()
+        if term in LEGAL_GLOSSARY:
+            yield m.start(), m.end(), term
+
+
+def _utf16_offsets(text):
+    """Map character offsets to UTF-16 code unit offsets, or None when they coincide."""
+    if text.isascii() or all(ord(c) <= 0xFFFF for c in text):
+        return None
+    offsets = [0] * (len(text) + 1)
+    for i, c in enumerate(text):
+        offsets[i + 1] = offsets[i] + (2 if ord(c) > 0xFFFF else 1)
+    return offsets
+
+
+def find_term_occurrences(text):
+    """
+    Locate every legal term occurrence without rendering any markup.
+
+    Each definition is sent once in ``terms``; ``occurrences`` only carries
+    offsets, so the payload grows with the number of matches rather than
+    definitions x matches. Offsets are UTF-16 code units so they index a
+    JavaScript string directly.
+
+    Args:
+        text (str): Plain text to scan
+
+    Returns:
+        dict: {terms: [{id, term, display_term, definition}],
+               occurrences: [[start, end, term_id], ...]}
+    """
+    terms = []
+    ids = {}
+    occurrences = []
+    if not text or not text.strip():
+        return {"terms": terms, "occurrences": occurrences}
+
+    offsets = _utf16_offsets(text)
+    for start, end, term in _iter_term_matches(text):
+        term_id = ids.get(term)
+        if term_id is None:
+            term_id = ids[term] = len(terms)
+            terms.append({
+                "id": term_id,
+                "term": term,
+                "display_term": term.title(),
+                "definition": LEGAL_GLOSSARY[term]
+            })
+        if offsets is not None:
+            start, end = offsets[start], offsets[end]
+        occurrences.append([start, end, term_id])
+
+    return {"terms": terms, "occurrences": occurrences}
+
+
 def highlight_text_html(text):
     """
     Return HTML version of the text with legal terms wrapped in
@@ -162,42 +300,17 @@ def highlight_text_html(text):
     if not text or not text.strip():
         return text
 
-    # Build list of (start, end, term, definition) for all matches
-    matches = []
-    text_lower = text.lower()
-
-    for term, definition in LEGAL_GLOSSARY.items():
-        pattern = r'\b' + re.escape(term) + r'\b'
-        for m in re.finditer(pattern, text_lower):
-            # Escape definition for HTML attribute
-            safe_def = definition.replace('"', '&quot;').replace("'", '&#39;')
-            matches.append((m.start(), m.end(), term, safe_def))
-
-    if not matches:
-        import html
-        return html.escape(text).replace('\n', '<br>')
-
-    # Sort matches by start pos; handle overlaps by keeping the first match
-    matches.sort(key=lambda x: x[0])
-    non_overlapping = []
-    last_end = 0
-    for start, end, term, safe_def in matches:
-        if start >= last_end:
-            non_overlapping.append((start, end, term, safe_def))
-            last_end = end
-
-    # Build HTML
     import html as html_module
     result = []
     last_idx = 0
-    for start, end, term, safe_def in non_overlapping:
+    for start, end, term in _iter_term_matches(text):
         # Add text before the match (escaped)
         result.append(html_module.escape(text[last_idx:start]).replace('\n', '<br>'))
         # Add highlighted term
-        original_word = text[start:end]
+        safe_def = html_module.escape(LEGAL_GLOSSARY[term], quote=True)
         result.append(
             f'<span class="legal-term" data-definition="{safe_def}" tabindex="0">'
-            f'{html_module.escape(original_word)}'
+            f'{html_module.escape(text[start:end])}'
             f'</span>'
         )
         last_idx = end
@@ -0,0 +1,151 @@
+"""
+Lexical Simplifier
+Deterministic phrase-level rewriting of legalese into plain English.
+
+Every phrase in PLAIN_ENGLISH_SUBSTITUTIONS (largely LEGAL_GLOSSARY terms)
+is compiled into one longest-first regex, so a whole document is rewritten
+in a single pass in milliseconds. Basic mode only asks the model to lightly
+rephrase while keeping most of the original words, so it (or low slider
+levels) can be served this way without running FLAN-T5 at all.
+
+The shrinking subset of the table can also be applied before model
+simplification, so verbose boilerplate costs fewer input tokens.
+"""
+
+import os
+import re
+import threading
+from collections import Counter
+
+from nlp.legal_terms import PLAIN_ENGLISH_SUBSTITUTIONS
+
+ENGINES = ("model", "lexical")
+
+# Modes and slider levels served by the lexical simplifier when the request
+# does not choose an engine: e.g. LEXICAL_SIMPLIFY_MODES=basic, or
+# LEXICAL_SIMPLIFY_MAX_LEVEL=30 for light rewrites in any mode
+LEXICAL_SIMPLIFY_MODES = {
+    m.strip() for m in os.getenv("LEXICAL_SIMPLIFY_MODES", "").split(',') if m.strip()
+}
+LEXICAL_SIMPLIFY_MAX_LEVEL = int(os.getenv("LEXICAL_SIMPLIFY_MAX_LEVEL", "0"))
+
+# Rewrite verbose phrases before model simplification (see compact_phrases)
+LEGALESE_PRESUBSTITUTION = os.getenv("LEGALESE_PRESUBSTITUTION", "0") == "1"
+
+
+def _match_case(original, replacement):
+    """Carry the matched text's capitalization over to its replacement."""
+    if original.isupper() and len(original) > 1:
+        return replacement.upper()
+    if original[0].isupper():
+        return replacement[0].upper() + replacement[1:]
+    return replacement
+
+
+class PhraseSubstituter:
+    """Replaces whole-word phrases from a table in one regex pass."""
+
+    def __init__(self, table):
+        """
+        Args:
+            table (dict): phrase -> replacement; matching ignores case and
+                allows any run of whitespace (e.g. a line break) between words
+        """
+        self.table = {' '.join(phrase.lower().split()): replacement for phrase, replacement in table.items()}
+        # Longest first so "indemnify and hold harmless" wins over "indemnify"
+        alternatives = [
+            r'\s+'.join(re.escape(word) for word in phrase.split())
+            for phrase in sorted(self.table, key=len, reverse=True)
+        ]
+        self._pattern = re.compile(r'\b(?:' + '|'.join(alternatives) + r')\b', re.IGNORECASE)
+
+    def substitute_phrases(self, text):
+        """
+        Rewrite every known phrase in text.
+
+        Returns:
+            tuple: (rewritten text, Counter of the table phrases replaced)
+        """
+        phrases = Counter()
+        if not text:
+            return text, phrases
+
+        def replace(match):
+            original = match.group(0)
+            phrase = ' '.join(original.lower().split())
+            phrases[phrase] += 1
+            return _match_case(original, self.table[phrase])
+
+        return self._pattern.sub(replace, text), phrases
+
+    def substitute(self, text):
+        """
+        Rewrite every known phrase in text.
+
+        Returns:
+            tuple: (rewritten text, number of substitutions)
+        """
+        text, phrases = self.substitute_phrases(text)
+        return text, sum(phrases.values())
+
+
+plain_english = PhraseSubstituter(PLAIN_ENGLISH_SUBSTITUTIONS)
+
+# Only the rewrites that shorten the text, for trimming model input: the
+# model does its own simplifying, so expansions like "herein" -> "in this
+# agreement" would just cost tokens
+compact_phrases = PhraseSubstituter({
+    phrase: replacement for phrase, replacement in PLAIN_ENGLISH_SUBSTITUTIONS.items()
+    if len(replacement) < len(phrase)
+})
+
+
+class CompactionCounter:
+    """Tally of phrases pre-substituted and model input tokens saved for one request."""
+
+    def __init__(self):
+        self.phrases = 0
+        self.tokens_saved = 0
+        self._lock = threading.Lock()
+
+    def add(self, phrases, tokens_saved):
+        with self._lock:
+            self.phrases += phrases
+            self.tokens_saved += tokens_saved
+
+    def to_dict(self):
+        with self._lock:
+            return {"phrases_substituted": self.phrases, "input_tokens_saved": self.tokens_saved}
+
+
+def lexical_simplify(text):
+    """
+    Simplify text by substituting plain-English equivalents for legalese.
+
+    Args:
+        text (str): Input text of any length
+
+    Returns:
+        str: Text with every known phrase replaced; everything else is untouched
+    """
+    return plain_english.substitute(text)[0]
+
+
+def choose_engine(requested=None, simplification_mode="intermediate", level=70):
+    """
+    Decide whether a simplification request runs on the model or lexically.
+
+    Args:
+        requested (str): "model" or "lexical" from the request; anything else
+            applies the LEXICAL_SIMPLIFY_MODES / LEXICAL_SIMPLIFY_MAX_LEVEL policy
+        simplification_mode (str): basic, intermediate or advanced
+        level (int): Slider level 1-100
+
+    Returns:
+        str: "model" or "lexical"
+    """
+    if requested in ENGINES:
+        return requested
+    if simplification_mode in LEXICAL_SIMPLIFY_MODES or int(level) <= LEXICAL_SIMPLIFY_MAX_LEVEL:
+        return "lexical"
+    return "model"
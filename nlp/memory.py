@@ -0,0 +1,284 @@
+"""
+Memory Accounting
+Per-request memory instrumentation and a budget guard for document processing.
+
+Each simplify/summarize request gets a MemoryTracker. The tracker records
+how far process RSS peaked above where the request started, the bytes of
+model tensors built for the batches the request took part in, and the
+largest single intermediate (a tensor or a document buffer).
+
+MemoryBudget estimates what a request will need before it starts. When the
+worker is short on memory, it runs the request one chunk at a time instead
+of batching, or turns it away, rather than letting the container OOM-kill
+the worker.
+"""
+
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+MB = 1024 * 1024
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 4096
+
+
+def rss_bytes():
+    """
+    Resident set size of this process, or None if it cannot be read.
+
+    Reads /proc/self/statm. Elsewhere falls back to the peak RSS from
+    getrusage, which can only grow.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        return peak if sys.platform == "darwin" else peak * 1024
+    except Exception:
+        return None
+
+
+def tensor_nbytes(tensor):
+    """Bytes held by a torch tensor (or anything with numel/element_size)."""
+    return tensor.numel() * tensor.element_size()
+
+
+def _mb(nbytes):
+    return round(nbytes / MB, 2)
+
+
+class BatchMemory:
+    """Tensor sizes of one model batch, reported by the generate function."""
+
+    def __init__(self):
+        self.total_bytes = 0
+        self.largest_name = None
+        self.largest_bytes = 0
+
+    def add(self, name, nbytes):
+        self.total_bytes += nbytes
+        if nbytes > self.largest_bytes:
+            self.largest_name, self.largest_bytes = name, nbytes
+
+
+class _RssSampler:
+    """One background thread sampling RSS while any tracker is open."""
+
+    def __init__(self, interval=0.02):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._trackers = set()
+        self._thread = None
+
+    def register(self, tracker):
+        with self._lock:
+            self._trackers.add(tracker)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+                self._thread.start()
+
+    def unregister(self, tracker):
+        with self._lock:
+            self._trackers.discard(tracker)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._trackers:
+                    self._thread = None
+                    return
+                trackers = list(self._trackers)
+            rss = rss_bytes()
+            for tracker in trackers:
+                tracker.observe_rss(rss)
+            time.sleep(self.interval)
+
+
+_sampler = _RssSampler()
+
+
+class MemoryTracker:
+    """
+    Memory used by one request, collected while the ``with`` block runs.
+
+    RSS is process-wide, so concurrent requests show up in each other's
+    peak delta. Tensor bytes are this request's share of every batch it was
+    part of, split by rows.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.start_rss = None
+        self.peak_rss = None
+        self.tensor_bytes = 0
+        self.largest_name = None
+        self.largest_bytes = 0
+        self.workers = None
+        self.degraded = False
+
+    def __enter__(self):
+        self.start_rss = self.peak_rss = rss_bytes()
+        _sampler.register(self)
+        return self
+
+    def __exit__(self, *exc):
+        _sampler.unregister(self)
+        self.observe_rss(rss_bytes())
+        return False
+
+    def observe_rss(self, rss):
+        if rss is None:
+            return
+        with self._lock:
+            if self.peak_rss is None or rss > self.peak_rss:
+                self.peak_rss = rss
+
+    def note(self, name, nbytes):
+        """Record an intermediate buffer (e.g. the document text) as a largest-intermediate candidate."""
+        with self._lock:
+            if nbytes > self.largest_bytes:
+                self.largest_name, self.largest_bytes = name, nbytes
+
+    def add_batch(self, batch, rows, batch_rows):
+        """Charge this request ``rows`` of a batch of ``batch_rows`` prompts."""
+        with self._lock:
+            self.tensor_bytes += batch.total_bytes * rows // max(1, batch_rows)
+            if batch.largest_bytes > self.largest_bytes:
+                self.largest_name, self.largest_bytes = batch.largest_name, batch.largest_bytes
+
+    def to_dict(self):
+        with self._lock:
+            delta = None
+            if self.start_rss is not None and self.peak_rss is not None:
+                delta = _mb(self.peak_rss - self.start_rss)
+            return {
+                "peak_rss_delta_mb": delta,
+                "tensor_mb": _mb(self.tensor_bytes),
+                "largest_intermediate": self.largest_name,
+                "largest_intermediate_mb": _mb(self.largest_bytes),
+                "workers": self.workers,
+                "degraded": self.degraded,
+            }
+
+
+class MemoryBudgetExceeded(Exception):
+    """
+    Raised when a request would not fit in the memory budget.
+
+    ``retry_after`` is None when the request can never fit.
+    """
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class MemoryBudget:
+    """
+    Admits requests against a worker-wide memory budget.
+
+    A request is estimated as its document held a few times over (text,
+    sentences, chunks, outputs) plus a fixed working set per chunk in
+    flight. Memory in use is the larger of the current RSS and the
+    baseline plus every admitted request's estimate, so requests admitted
+    together cannot all count the same free memory.
+    """
+
+    def __init__(self, budget_bytes=0, per_chunk_bytes=64 * MB, bytes_per_char=8, retry_after=5):
+        """
+        Args:
+            budget_bytes (int): Memory the worker may use in total; 0 disables the guard
+            per_chunk_bytes (int): Working set of one chunk in generation (tensors, activations)
+            bytes_per_char (int): Memory per document character across the pipeline's copies
+            retry_after (int): Seconds suggested to clients turned away for lack of headroom
+        """
+        self.budget_bytes = int(budget_bytes)
+        self.per_chunk_bytes = int(per_chunk_bytes)
+        self.bytes_per_char = bytes_per_char
+        self.retry_after = retry_after
+        self.baseline = rss_bytes() or 0
+        self._lock = threading.Lock()
+        self._reserved = 0
+        self._degraded = 0
+        self._rejected = 0
+
+    def estimate(self, chars, workers, prompts_per_chunk=1):
+        """Estimated bytes to process a document of ``chars`` with ``workers`` chunks in flight."""
+        return int(chars * self.bytes_per_char) + workers * prompts_per_chunk * self.per_chunk_bytes
+
+    @contextmanager
+    def reserve(self, chars, workers, prompts_per_chunk=1):
+        """
+        Hold memory for one request for the duration of the block.
+
+        Yields the number of chunks the request may keep in flight:
+        ``workers`` if they fit, 1 (sequential) if only that fits.
+
+        Raises:
+            MemoryBudgetExceeded: If not even sequential processing fits
+        """
+        if self.budget_bytes <= 0:
+            yield workers
+            return
+
+        with self._lock:
+            sequential = self.estimate(chars, min(workers, 1), prompts_per_chunk)
+            if sequential > self.budget_bytes - self.baseline:
+                self._rejected += 1
+                raise MemoryBudgetExceeded(
+                    f"Document needs about {_mb(sequential)} MB, more than this server's memory budget allows"
+                )
+            in_use = max(rss_bytes() or 0, self.baseline + self._reserved)
+            headroom = self.budget_bytes - in_use
+            need = self.estimate(chars, workers, prompts_per_chunk)
+            if need > headroom:
+                if sequential > headroom:
+                    self._rejected += 1
+                    raise MemoryBudgetExceeded(
+                        "Not enough free memory to process this document right now", self.retry_after
+                    )
+                workers, need = min(workers, 1), sequential
+                self._degraded += 1
+            self._reserved += need
+
+        try:
+            yield workers
+        finally:
+            with self._lock:
+                self._reserved -= need
+
+    def stats(self):
+        """Return budget usage for health and admin endpoints."""
+        with self._lock:
+            return {
+                "budget_mb": _mb(self.budget_bytes),
+                "rss_mb": _mb(rss_bytes() or 0),
+                "reserved_mb": _mb(self._reserved),
+                "degraded": self._degraded,
+                "rejected": self._rejected,
+            }
+
+
+def memory_budget_from_env():
+    """
+    Build a MemoryBudget configured from environment variables.
+
+    MEMORY_BUDGET_MB         total memory the worker may use (default 0 = no guard)
+    MEMORY_PER_CHUNK_MB      working set per chunk in generation (default 64)
+    MEMORY_BYTES_PER_CHAR    pipeline memory per document character (default 8)
+    """
+    return MemoryBudget(
+        budget_bytes=float(os.getenv("MEMORY_BUDGET_MB", "0")) * MB,
+        per_chunk_bytes=float(os.getenv("MEMORY_PER_CHUNK_MB", "64")) * MB,
+        bytes_per_char=float(os.getenv("MEMORY_BYTES_PER_CHAR", "8")),
+    )
@@ -1,7 +1,17 @@
 import logging
 import os
-import re
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+from functools import lru_cache
+from nlp.batching import scheduler_from_env
+from nlp.cancellation import Cancelled
+from nlp.memory import tensor_nbytes
+from nlp.fair_scheduler import fair_scheduler_from_env
+from nlp.registry import registry_from_env
+from nlp.lexical import LEGALESE_PRESUBSTITUTION, choose_engine, compact_phrases, lexical_simplify
+from nlp.extractive import extractive_summary, salient_text
+from nlp.generation import (
+    DEFAULT_TIER, EXTRACTIVE_TIER, build_cancellation_criteria, build_stopping_criteria,
+    simplify_generation_config, summary_generation_config, summary_keep_ratio
+)
 
 # -------------------------------
 # Hugging Face environment setup
@@ -14,48 +24,269 @@ os.environ["HF_HUB_DISABLE_TELEMETRY"] = "1"
 # -------------------------------
 logging.basicConfig(level=logging.DEBUG)
 
-# -------------------------------
-# Simple sentence tokenizer
-# -------------------------------
-def sent_tokenize(text):
-    return re.split(r'(?<=[.!?]) +', text)
-
 # -------------------------------
 # Model setup
 # -------------------------------
+SIMPLIFICATION_MODES = ("basic", "intermediate", "advanced")
+
 _MODEL_DIR = "google/flan-t5-small"
 
-logging.info(f"Loading FLAN-T5 model from Hugging Face hub ({_MODEL_DIR})...")
+# "hf" loads FLAN-T5; "stub" swaps in a deterministic fake for offline load tests
+MODEL_BACKEND = os.getenv("MODEL_BACKEND", "hf")
+
+# Simplify each passage a document repeats only once (see nlp.dedup)
+SIMPLIFY_DEDUP = os.getenv("SIMPLIFY_DEDUP", "1") == "1"
+
+
+def _load_model(source):
+    """Load one (tokenizer, model) pair for the registry."""
+    if MODEL_BACKEND == "stub" or source == "stub":
+        from nlp.stub_backend import stub_backend_from_env
+        logging.info("Using stub inference backend.")
+        return stub_backend_from_env()
+
+    from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
 
-try:
-    print("Downloading and loading FLAN-T5 model...")
+    logging.info(f"Loading model from Hugging Face hub ({source})...")
+    print(f"Downloading and loading {source}...")
 
     tokenizer = AutoTokenizer.from_pretrained(
-        _MODEL_DIR,
+        source,
         local_files_only=False
     )
 
     model = AutoModelForSeq2SeqLM.from_pretrained(
-        _MODEL_DIR,
+        source,
         local_files_only=False
     )
 
     model.to("cpu")  # force CPU to avoid GPU memory issues
+    model.eval()
 
     print("Model loaded successfully.")
     logging.info("Model loaded successfully.")
+    return tokenizer, model
 
-except Exception as e:
-    logging.exception("Error loading model")
-    tokenizer = None
-    model = None
+
+if MODEL_BACKEND != "stub":
+    try:
+        from nlp.runtime import configure_runtime
+        # Size torch's thread pools (and pin cores) before any model runs anything
+        configure_runtime()
+    except Exception:
+        logging.exception("Error configuring inference runtime")
+
+# Every loaded model, the default, and the task/mode/size routing rules
+registry = registry_from_env(_load_model, _MODEL_DIR)
+
+
+def model_ready() -> bool:
+    """True when at least the default model is loaded."""
+    return registry.ready()
+
+
+# -------------------------------
+# Batched generation
+# -------------------------------
+def _record_generation_memory(memory, model, inputs, gen_kwargs):
+    """
+    Report a batch's tensors to a BatchMemory before generation.
+
+    The encoder output and the decoder's key/value cache are not visible
+    from outside model.generate, so they are estimated from the model config
+    (they are usually the largest intermediates).
+    """
+    input_ids = inputs["input_ids"]
+    for name, tensor in inputs.items():
+        memory.add(name, tensor_nbytes(tensor))
+
+    config = model.config
+    rows = input_ids.shape[0] * gen_kwargs.get("num_beams", 1)
+    input_len, output_len = input_ids.shape[1], gen_kwargs.get("max_new_tokens", 128)
+    dtype_bytes = next(model.parameters()).element_size()
+    d_model = getattr(config, "d_model", 512)
+    layers = getattr(config, "num_decoder_layers", None) or getattr(config, "num_layers", 6)
+    attention_width = getattr(config, "num_heads", 8) * getattr(config, "d_kv", 64)
+
+    memory.add("encoder_hidden_states (estimated)", rows * input_len * d_model * dtype_bytes)
+    # Self-attention keys/values grow with the output; cross-attention ones span the input
+    memory.add("kv_cache (estimated)",
+               layers * 2 * rows * attention_width * (output_len + input_len) * dtype_bytes)
+
+
+def _generate_batch(prompts, gen_kwargs, cancel_tokens=None, memory=None):
+    """
+    Run one padded model.generate call over a micro-batch of prompts.
+
+    Rows whose entry in ``cancel_tokens`` fires stop decoding at the next
+    step. Tensor sizes are reported into ``memory`` (a BatchMemory) when given.
+    """
+    gen_kwargs = dict(gen_kwargs)
+    # The routed model name travels in gen_kwargs so batches never mix models
+    with registry.acquire(gen_kwargs.pop("model", None)) as loaded:
+        if MODEL_BACKEND == "stub" or loaded.source == "stub":
+            return loaded.model.generate_batch(prompts, gen_kwargs, cancel_tokens, memory)
+
+        tokenizer, model = loaded.tokenizer, loaded.model
+        stop_after = gen_kwargs.pop("stop_at_sentence_end", None)
+        criteria = []
+        if stop_after:
+            criteria.extend(build_stopping_criteria(tokenizer, stop_after))
+        if cancel_tokens and any(t is not None for t in cancel_tokens):
+            criteria.extend(build_cancellation_criteria(cancel_tokens))
+        if criteria:
+            from transformers import StoppingCriteriaList
+            gen_kwargs["stopping_criteria"] = StoppingCriteriaList(criteria)
+
+        inputs = tokenizer(prompts, return_tensors="pt", max_length=1024, truncation=True, padding=True)
+        if memory is not None:
+            _record_generation_memory(memory, model, inputs, gen_kwargs)
+        outputs = model.generate(**inputs, **gen_kwargs)
+        if memory is not None:
+            memory.add("output_ids", tensor_nbytes(outputs))
+        return tokenizer.batch_decode(outputs, skip_special_tokens=True)
+
+
+def _routed(gen_kwargs, task, mode, input_tokens):
+    """Tag generation settings with the model the registry routes this chunk to."""
+    gen_kwargs["model"] = registry.route(task, mode, input_tokens)
+    return gen_kwargs
+
+
+def _model_id(name):
+    """Name and source of a routed model; a reload under the same name changes the source."""
+    loaded = registry.get(name)
+    return f"{loaded.name}:{loaded.source}" if loaded is not None else name
+
+
+def count_tokens(text: str) -> int:
+    """Count model tokens in text, falling back to the word-based estimate."""
+    loaded = registry.get()
+    if loaded is not None and loaded.tokenizer is not None:
+        try:
+            return len(loaded.tokenizer.encode(text, add_special_tokens=False))
+        except Exception:
+            pass
+    from nlp.chunking import estimate_tokens
+    return estimate_tokens(text)
+
+
+@lru_cache(maxsize=1024)
+def _phrase_tokens_saved(phrase, model_id):
+    # model_id keys the cache to the default tokenizer count_tokens uses, so
+    # swapping the default model never serves counts from the old one
+    return count_tokens(phrase) - count_tokens(compact_phrases.table[phrase])
+
+
+def _compact_input(text, compaction=None):
+    """
+    Rewrite verbose legal phrases to short plain ones before the text is chunked.
+
+    The tokens saved are the per-phrase token differences times the number of
+    occurrences, so the document is not tokenized twice to measure them.
+    """
+    compacted, phrases = compact_phrases.substitute_phrases(text)
+    if compaction is not None and phrases:
+        model_id = _model_id(None)
+        compaction.add(
+            sum(phrases.values()),
+            sum(count * _phrase_tokens_saved(phrase, model_id) for phrase, count in phrases.items())
+        )
+    return compacted
+
+
+def _compact_source(source, compaction=None):
+    """Apply _compact_input to a whole string or to each piece of a streamed source."""
+    if isinstance(source, str):
+        return _compact_input(source, compaction)
+    return (_compact_input(piece, compaction) for piece in source)
+
+
+# A contract-like paragraph of roughly one chunk's length for the auto-tuner
+_AUTOTUNE_TEXT = (
+    "The Party of the First Part, hereinafter referred to as the Employer, and the Party of the "
+    "Second Part, hereinafter referred to as the Employee, hereby enter into this Employment "
+    "Agreement pursuant to the terms and conditions set forth herein. The Employee agrees to perform "
+    "such duties as may be assigned by the Employer from time to time in accordance with the "
+    "Employer's standard operating procedures and policies. "
+) * 3
+
+
+def _autotune_batch_size():
+    """Benchmark thread/batch settings at startup if INFERENCE_AUTOTUNE=1; return the best batch size."""
+    if MODEL_BACKEND == "stub" or not model_ready() or os.getenv("INFERENCE_AUTOTUNE", "0") != "1":
+        return None
+
+    from nlp.runtime import autotune
+
+    input_tokens = count_tokens(_AUTOTUNE_TEXT)
+    gen_kwargs = simplify_generation_config(input_tokens)
+    # Enough decoding to be representative without holding up startup
+    gen_kwargs["max_new_tokens"] = min(gen_kwargs["max_new_tokens"], 64)
+    gen_kwargs["stop_at_sentence_end"] = None
+
+    explicit = os.getenv("INFERENCE_MAX_BATCH_SIZE")
+    batch_options = (int(explicit),) if explicit else (1, 4, 8, 16)
+    try:
+        result = autotune(
+            _generate_batch,
+            f"Rewrite this text using simple words for general audience: {_AUTOTUNE_TEXT}",
+            gen_kwargs,
+            batch_options=batch_options
+        )
+    except Exception:
+        logging.exception("Inference auto-tuning failed; keeping defaults")
+        return None
+    return result["best"]["batch_size"]
+
+
+# Shared across all requests so concurrent users' chunks batch together
+inference_scheduler = scheduler_from_env(_generate_batch, default_batch_size=_autotune_batch_size() or 8)
+
+# Decides whose chunk goes to the batcher next when users compete for it
+fair_scheduler = fair_scheduler_from_env(default_slots=inference_scheduler.max_batch_size)
 
 
 # -------------------------------
 # Simplification functions
 # -------------------------------
-def simplify_text(text: str, level: int = 70, simplification_mode: str = "intermediate") -> str:
-    if not model or not tokenizer:
+def simplify_text(text: str, level: int = 70, simplification_mode: str = "intermediate",
+                  tier: str = DEFAULT_TIER, cancel_token=None, job=None, readability=None,
+                  lexical=None, compaction=None, dedup_stats=None, reuse=None, max_workers=None,
+                  memory=None) -> str:
+    """
+    Simplify text, chunking it first when it is too long for one prompt.
+
+    If ``readability`` (a ReadabilityAccumulator) is given, each simplified
+    chunk is counted into it in the worker that produced it. With
+    SIMPLIFY_DEDUP, repeated passages of a large document are generated once
+    and the dedup statistics go into ``dedup_stats`` (a dict). ``reuse`` (a
+    ChunkReuse) serves chunks from near-duplicates simplified before and
+    records newly generated ones. When ``cancel_token`` fires or its
+    deadline passes, generation stops and Cancelled is raised carrying the
+    simplified leading chunks as ``partial``. ``lexical``
+    forces (True) or rules out (False) the rule-based simplifier; by default
+    the LEXICAL_SIMPLIFY_* policy decides from the mode and level.
+
+    ``max_workers`` caps the chunks in flight at once (default: the batch
+    size; 1 when the memory budget asks for sequential processing), and
+    ``memory`` (a MemoryTracker) is charged for the model tensors built.
+
+    With LEGALESE_PRESUBSTITUTION=1, verbose phrases are shortened before
+    chunking so every chunk carries more sentences for the same token
+    budget; the savings are tallied into ``compaction`` (a
+    CompactionCounter) when one is given.
+    """
+    if lexical is None:
+        lexical = choose_engine(None, simplification_mode, level) == "lexical"
+    if lexical:
+        # One regex pass over the whole document; no chunking or model needed
+        simplified = lexical_simplify(text)
+        if readability is not None:
+            readability.add(simplified)
+        return simplified
+
+    if not model_ready():
         return "Model not loaded properly."
     if not text.strip():
         return ""
@@ -66,117 +297,281 @@ def simplify_text(text: str, level: int = 70, simplification_mode: str = "interm
         logging.exception("Error importing chunking utilities")
         return text
 
+    if LEGALESE_PRESUBSTITUTION:
+        text = _compact_input(text, compaction)
+
+    def simplify_chunk(chunk):
+        return _reusing_simplify(chunk, level, simplification_mode, tier, job, reuse, cancel_token, memory)
+
     if is_large_document(text, threshold_tokens=500):
-        def simplify_chunk(chunk):
-            return _simplify_single_chunk(chunk, level, simplification_mode)
-        simplified = process_large_document(text, simplify_chunk, max_tokens=400)
+        # A deduplicated chunk's output stands for every copy of it
+        simplified = process_large_document(
+            text, simplify_chunk, max_tokens=400,
+            max_workers=max_workers or inference_scheduler.max_batch_size,
+            cancel_token=cancel_token,
+            on_output=readability.add if readability is not None else None,
+            dedup=SIMPLIFY_DEDUP, stats=dedup_stats
+        )
         return simplified
     else:
-        return _simplify_single_chunk(text, level, simplification_mode)
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        simplified = simplify_chunk(text)
+        if readability is not None:
+            readability.add(simplified)
+        return simplified
 
 
-def _simplify_single_chunk(text: str, level: int = 70, simplification_mode: str = "intermediate") -> str:
-    mapped_max_tokens = int(max(40, 350 - (level * 2)))
+def simplify_stream(source, writer, level: int = 70, simplification_mode: str = "intermediate",
+                    tier: str = DEFAULT_TIER, cancel_token=None, job=None, readability=None,
+                    lexical=None, compaction=None, reuse=None, max_workers=None, memory=None) -> dict:
+    """
+    Simplify a very large document with bounded memory.
+
+    Sentences and chunks are produced lazily from ``source`` (a string or an
+    iterable of text pieces) and each simplified chunk is handed to
+    ``writer.write`` as soon as it is ready. ``writer.close`` is always
+    called, even when processing stops early, so it must only release the
+    writer. Anything that assumes a complete output, such as cleaning up
+    earlier runs, is left to the caller after a successful return. Chunks
+    are also counted into
+    ``readability`` (a ReadabilityAccumulator) when one is given.
+    ``lexical``, ``compaction``, ``reuse``, ``max_workers`` and ``memory``
+    work as in simplify_text.
+
+    Returns:
+        dict: chunks, input_chars and output_chars processed
+    """
+    if lexical is None:
+        lexical = choose_engine(None, simplification_mode, level) == "lexical"
+    if not lexical and not model_ready():
+        raise RuntimeError("Model not loaded properly.")
+
+    from nlp.chunking import stream_large_document
+
+    if LEGALESE_PRESUBSTITUTION and not lexical:
+        source = _compact_source(source, compaction)
+
+    def simplify_chunk(chunk):
+        if lexical:
+            simplified = lexical_simplify(chunk)
+        else:
+            simplified = _reusing_simplify(chunk, level, simplification_mode, tier, job, reuse, cancel_token,
+                                           memory)
+        if readability is not None:
+            readability.add(simplified)
+        return simplified
 
+    try:
+        return stream_large_document(
+            source, simplify_chunk, writer, max_tokens=400,
+            max_workers=max_workers or inference_scheduler.max_batch_size,
+            cancel_token=cancel_token
+        )
+    finally:
+        # Release only: on cancellation or error the output is incomplete,
+        # so the caller decides whether anything may be cleaned up
+        writer.close()
+
+
+def _simplify_prompt(text: str, simplification_mode: str) -> str:
     if simplification_mode == "basic":
-        prompt = f"Slightly rephrase this text for easier reading, keeping most original words: {text}"
-        max_tokens_override = int(mapped_max_tokens * 1.2)
+        return f"Slightly rephrase this text for easier reading, keeping most original words: {text}"
     elif simplification_mode == "advanced":
-        prompt = f"Rewrite this in the simplest possible words, as if explaining to a 10-year-old: {text}"
-        max_tokens_override = int(mapped_max_tokens * 0.8)
-    else:
-        prompt = f"Rewrite this text using simple words for general audience: {text}"
-        max_tokens_override = mapped_max_tokens
+        return f"Rewrite this in the simplest possible words, as if explaining to a 10-year-old: {text}"
+    return f"Rewrite this text using simple words for general audience: {text}"
 
-    try:
-        inputs = tokenizer(prompt, return_tensors="pt", max_length=1024, truncation=True)
-
-        outputs = model.generate(
-            **inputs,
-            max_new_tokens=max_tokens_override,
-            do_sample=True,
-            temperature=0.7,
-            top_p=0.9
-        )
 
-        return tokenizer.decode(outputs[0], skip_special_tokens=True)
+def _simplify_single_chunk(text: str, level: int = 70, simplification_mode: str = "intermediate",
+                           tier: str = DEFAULT_TIER, job=None, cancel_token=None, memory=None) -> str:
+    prompt = _simplify_prompt(text, simplification_mode)
 
+    try:
+        input_tokens = count_tokens(text)
+
+        with fair_scheduler.turn(job, input_tokens, cancel_token):
+            return inference_scheduler.generate(
+                prompt,
+                _routed(simplify_generation_config(input_tokens, level, simplification_mode, tier),
+                        "simplify", simplification_mode, input_tokens),
+                mode=simplification_mode,
+                input_tokens=input_tokens,
+                cancel_token=cancel_token,
+                memory=memory
+            )
+
+    except Cancelled:
+        raise
     except Exception as e:
         logging.exception("Error during simplification generation")
         return text
 
 
+def _reusing_simplify(text: str, level: int, simplification_mode: str, tier: str, job=None, reuse=None,
+                      cancel_token=None, memory=None) -> str:
+    """Simplify one chunk, or take it from a near-duplicate chunk simplified the same way before."""
+    if reuse is None:
+        return _simplify_single_chunk(text, level, simplification_mode, tier, job, cancel_token, memory)
+    model = _model_id(registry.route("simplify", simplification_mode, count_tokens(text)))
+    reused = reuse.lookup(text, model)
+    if reused is not None:
+        return reused
+    simplified = _simplify_single_chunk(text, level, simplification_mode, tier, job, cancel_token, memory)
+    # An unchanged chunk means generation failed; don't serve that to others
+    if simplified != text:
+        reuse.record(text, simplified, model)
+    return simplified
+
+
+def simplify_text_all_modes(text: str, level: int = 70, tier: str = DEFAULT_TIER, job=None,
+                            max_workers=None, memory=None) -> dict:
+    """
+    Simplify text in every mode at once for side-by-side comparison.
+
+    The document is chunked once and each chunk's three prompt variants are
+    submitted under one shared generation config, so the scheduler runs
+    them as a single batch instead of three separate passes. ``max_workers``
+    and ``memory`` work as in simplify_text.
+
+    Returns:
+        dict: {mode: simplified_text} for basic, intermediate and advanced
+    """
+    if not model_ready():
+        return {mode: "Model not loaded properly." for mode in SIMPLIFICATION_MODES}
+    if not text.strip():
+        return {mode: "" for mode in SIMPLIFICATION_MODES}
+
+    from nlp.chunking import is_large_document, chunk_text, map_chunks
+
+    chunks = chunk_text(text, max_tokens=400) if is_large_document(text, threshold_tokens=500) else [text]
+
+    def simplify_chunk_all_modes(chunk):
+        input_tokens = count_tokens(chunk)
+        configs = [simplify_generation_config(input_tokens, level, mode, tier) for mode in SIMPLIFICATION_MODES]
+        # Share the most generous budget so all variants land in one batch
+        shared = _routed(max(configs, key=lambda c: c["max_new_tokens"]), "simplify", "compare", input_tokens)
+        with fair_scheduler.turn(job, input_tokens * len(SIMPLIFICATION_MODES)):
+            futures = [
+                inference_scheduler.submit(_simplify_prompt(chunk, mode), shared, mode="compare",
+                                           input_tokens=input_tokens, memory=memory)
+                for mode in SIMPLIFICATION_MODES
+            ]
+            outputs = []
+            for future in futures:
+                try:
+                    outputs.append(future.result())
+                except Exception:
+                    logging.exception("Error during comparison generation")
+                    outputs.append(chunk)
+        return outputs
+
+    per_chunk = map_chunks(chunks, simplify_chunk_all_modes,
+                           max_workers=max_workers or inference_scheduler.max_batch_size)
+
+    return {
+        mode: ' '.join(outputs[i] for outputs in per_chunk)
+        for i, mode in enumerate(SIMPLIFICATION_MODES)
+    }
+
+
 # -------------------------------
 # Summarization functions
 # -------------------------------
 def _extractive_summary(text: str, num_sentences: int = 3) -> str:
-    sentences = sent_tokenize(text)
+    return extractive_summary(text, num_sentences)
 
-    if len(sentences) <= num_sentences:
-        return text
-
-    idx = [0, len(sentences)//2, len(sentences)-1]
 
-    return " ".join([sentences[i] for i in sorted(list(set(idx)))])
+def summarize_text(text: str, tier: str = DEFAULT_TIER, cancel_token=None, job=None, max_workers=None,
+                   memory=None) -> str:
+    """
+    Summarize text, chunking it first when it is too long for one prompt.
 
+    The "extractive" tier returns the top TextRank sentences without running
+    the model. Other tiers may first drop all but the most salient sentences
+    (their summary_keep_ratio, and always enough to fit their
+    summary_input_budget). That shrinks both the model input and the number
+    of chunk summaries for large documents.
 
-def summarize_text(text: str) -> str:
+    When ``cancel_token`` fires or its deadline passes, Cancelled is raised
+    carrying the summaries of the leading chunks as ``partial``.
+    ``max_workers`` and ``memory`` work as in simplify_text.
+    """
     if not text.strip():
         return ""
 
-    if not model or not tokenizer:
-        return _extractive_summary(text)
+    if tier == EXTRACTIVE_TIER:
+        return extractive_summary(text)
+
+    if not model_ready():
+        return extractive_summary(text)
 
     try:
-        from nlp.chunking import is_large_document, chunk_text
+        from nlp.chunking import estimate_tokens, is_large_document, chunk_text, leading_outputs, map_chunks_partial
     except Exception as e:
         logging.exception("Error importing chunking utilities")
         return _extractive_summary(text)
 
-    if is_large_document(text, threshold_tokens=600):
+    text = salient_text(text, summary_keep_ratio(estimate_tokens(text), tier))
 
-        chunks = chunk_text(text, max_tokens=500)
-        chunk_summaries = []
+    if is_large_document(text, threshold_tokens=600):
 
-        for chunk in chunks:
-            summary = _summarize_single_chunk(chunk)
+        def summarize_chunk(chunk):
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            return _summarize_single_chunk(chunk, tier, job, cancel_token, memory)
 
-            if summary:
-                chunk_summaries.append(summary)
+        chunks = chunk_text(text, max_tokens=500)
+        outputs, cancelled = map_chunks_partial(
+            chunks, summarize_chunk,
+            max_workers=max_workers or inference_scheduler.max_batch_size
+        )
+        if cancelled is not None:
+            done = leading_outputs(outputs)
+            cancelled.partial = ' '.join(summary for summary in done if summary) or None
+            cancelled.completed_chunks, cancelled.total_chunks = len(done), len(chunks)
+            raise cancelled
 
-        combined = ' '.join(chunk_summaries)
+        combined = ' '.join(summary for summary in outputs if summary)
 
         if len(combined.split()) > 200:
-            return _summarize_single_chunk(combined)
+            try:
+                return summarize_chunk(combined)
+            except Cancelled as e:
+                # Every chunk is summarized; only the final condensing pass was cut
+                e.partial, e.completed_chunks, e.total_chunks = combined, len(chunks), len(chunks)
+                raise
 
         return combined
 
     else:
-        return _summarize_single_chunk(text)
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        return _summarize_single_chunk(text, tier, job, cancel_token, memory)
 
 
-def _summarize_single_chunk(text: str) -> str:
+def _summarize_single_chunk(text: str, tier: str = DEFAULT_TIER, job=None, cancel_token=None, memory=None) -> str:
     prompt = f"Write a detailed summary of the following text: {text}"
 
     try:
-        inputs = tokenizer(prompt, return_tensors="pt", max_length=1024, truncation=True)
-
-        outputs = model.generate(
-            **inputs,
-            max_new_tokens=400,
-            min_new_tokens=20,
-            length_penalty=2.0,
-            num_beams=4,
-            do_sample=False
-        )
-
-        summary = tokenizer.decode(outputs[0], skip_special_tokens=True)
+        input_tokens = count_tokens(text)
+
+        with fair_scheduler.turn(job, input_tokens, cancel_token):
+            summary = inference_scheduler.generate(
+                prompt,
+                _routed(summary_generation_config(input_tokens, tier), "summarize", None, input_tokens),
+                mode="summary",
+                input_tokens=input_tokens,
+                cancel_token=cancel_token,
+                memory=memory
+            )
 
         if len(summary.split()) < 10 and len(text.split()) > 30:
             return _extractive_summary(text)
 
         return summary
 
+    except Cancelled:
+        raise
     except Exception as e:
         logging.exception("Error during summarization generation")
         return _extractive_summary(text)
\ No newline at end of file
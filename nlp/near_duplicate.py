@@ -0,0 +1,288 @@
+"""
+Near-duplicate Chunk Reuse
+MinHash/LSH lookup of previously simplified chunks that match a new chunk
+up to names, dates and amounts.
+
+Many uploads are one template filled in differently, so exact content
+hashes miss them. Chunks are compared on word shingles with those entities
+masked out. LSH band keys find candidates with a single indexed query. A
+candidate is reused only if its masked text is identical to the new
+chunk's, so nothing but the entities differ. A single changed word such as
+an added "not" still sends the chunk to the model. The stored output is
+then reused with the entities that differ swapped for the new chunk's.
+When an entity cannot be located in the stored output, the chunk is
+generated normally.
+
+Entries are scoped to an owner (the uploading user), so one user's
+outputs are never served to another.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import threading
+import zlib
+
+import numpy as np
+
+from nlp.lexical import LEGALESE_PRESUBSTITUTION
+
+# Amounts, dates, numbers and capitalised names: the parts a filled-in
+# template changes. Order matters: longer forms first.
+_ENTITY_RE = re.compile(
+    r'[$€£]\s?\d[\d,]*(?:\.\d+)?'
+    r'|\b(?:January|February|March|April|May|June|July|August|September|October|November|December)'
+    r'\s+\d{1,2}(?:st|nd|rd|th)?,?\s+\d{4}\b'
+    r'|\b\d{1,4}[/-]\d{1,2}[/-]\d{1,4}\b'
+    r'|\b\d[\d,]*(?:\.\d+)?%?'
+    r'|\b[A-Z][a-zA-Z&\'-]+(?:[ \t]+[A-Z][a-zA-Z&\'-]+)+'
+)
+_ENTITY_MASK = "␀"
+
+_WORD_RE = re.compile(r'\w+|' + _ENTITY_MASK)
+
+# Mersenne prime for the universal hash family; 32-bit shingle hashes times
+# 31-bit coefficients stay inside uint64
+_PRIME = (1 << 31) - 1
+
+
+def mask_entities(text):
+    """
+    Replace template-variable entities with a placeholder.
+
+    Returns:
+        tuple: (masked text, entities in order of appearance)
+    """
+    entities = []
+
+    def mask(match):
+        entities.append(match.group(0))
+        return _ENTITY_MASK
+
+    return _ENTITY_RE.sub(mask, text), entities
+
+
+def shingles(masked_text, size=5):
+    """Set of word n-gram hashes of an entity-masked text."""
+    words = _WORD_RE.findall(masked_text.lower())
+    if len(words) < size:
+        return {zlib.crc32(' '.join(words).encode('utf-8'))} if words else set()
+    return {
+        zlib.crc32(' '.join(words[i:i + size]).encode('utf-8'))
+        for i in range(len(words) - size + 1)
+    }
+
+
+def jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """MinHash signatures and LSH band keys over shingle sets."""
+
+    def __init__(self, num_perm=64, bands=16, seed=1):
+        """
+        Args:
+            num_perm (int): Hash functions per signature
+            bands (int): LSH bands; num_perm must divide evenly. Pairs with
+                Jaccard s collide in some band with probability
+                1 - (1 - s^(num_perm/bands))^bands
+            seed (int): Seed for the hash coefficients
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _PRIME, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, _PRIME, size=num_perm).astype(np.uint64)
+
+    def signature(self, shingle_set):
+        """Minimum of each hash function over the shingles (vectorized)."""
+        if not shingle_set:
+            return np.full(self.num_perm, _PRIME, dtype=np.uint64)
+        values = np.fromiter(shingle_set, dtype=np.uint64, count=len(shingle_set)) % _PRIME
+        hashed = (values[:, None] * self._a[None, :] + self._b[None, :]) % _PRIME
+        return hashed.min(axis=0)
+
+    def band_keys(self, signature):
+        """One string key per band; two chunks sharing any key are candidates."""
+        return [
+            f"{band}:{hashlib.blake2b(signature[band * self.rows:(band + 1) * self.rows].tobytes(), digest_size=8).hexdigest()}"
+            for band in range(self.bands)
+        ]
+
+
+def _normalized(masked_text):
+    return ' '.join(masked_text.split())
+
+
+def patch_entities(old_source, new_source, old_output):
+    """
+    Carry a stored output over to a new chunk that differs only in entities.
+
+    The nth entity of the old chunk is paired with the nth of the new one.
+    The output is scanned for entities the same way. Each changed old entity
+    must appear there as a whole entity, and only whole entity spans are
+    replaced, so changing "5" never touches "$5,000".
+
+    Returns:
+        str: Patched output, or None when the entities cannot be mapped
+    """
+    _, old_entities = mask_entities(old_source)
+    _, new_entities = mask_entities(new_source)
+    if len(old_entities) != len(new_entities):
+        return None
+
+    replacements = {}
+    for old, new in zip(old_entities, new_entities):
+        if old == new:
+            continue
+        if replacements.get(old, new) != new:
+            return None
+        replacements[old] = new
+    if not replacements:
+        return old_output
+
+    found = set()
+
+    def replace(match):
+        entity = match.group(0)
+        if entity in replacements:
+            found.add(entity)
+            return replacements[entity]
+        return entity
+
+    patched = _ENTITY_RE.sub(replace, old_output)
+    if found != set(replacements):
+        return None
+    return patched
+
+
+class NearDuplicateIndex:
+    """
+    Persistent LSH index of simplified chunks and their outputs.
+
+    ``store`` persists entries (see models.ChunkIndex); this class only
+    computes signatures and decides what may be reused.
+    """
+
+    def __init__(self, store, hasher=None, shingle_size=5):
+        self.store = store
+        self.hasher = hasher or MinHasher()
+        self.shingle_size = shingle_size
+
+    def _fingerprint(self, text):
+        masked, _ = mask_entities(text)
+        shingle_set = shingles(masked, self.shingle_size)
+        return masked, shingle_set, self.hasher.band_keys(self.hasher.signature(shingle_set))
+
+    @staticmethod
+    def chunk_key(owner, text):
+        return hashlib.sha1(f"{owner}\0{text}".encode('utf-8')).hexdigest()
+
+    def index_chunks(self, owner, doc_id, chunks):
+        """Add a document's chunks to its owner's index (incremental; existing entries are kept)."""
+        for chunk in chunks:
+            _, _, bands = self._fingerprint(chunk)
+            self.store.upsert(self.chunk_key(owner, chunk), owner, chunk, bands, doc_id=doc_id)
+
+    def record(self, owner, text, variant, output):
+        """Store the output generated for a chunk under a variant (mode/level/tier)."""
+        _, _, bands = self._fingerprint(text)
+        self.store.upsert(self.chunk_key(owner, text), owner, text, bands, variant=variant, output=output)
+
+    def lookup(self, owner, text, variant):
+        """
+        Find a reusable output for text among the owner's chunks under variant.
+
+        Returns:
+            tuple: (output, similarity), or (None, best similarity seen)
+        """
+        masked, shingle_set, bands = self._fingerprint(text)
+        masked = _normalized(masked)
+        best_score = 0.0
+        for candidate in self.store.candidates(owner, bands, variant):
+            candidate_masked = mask_entities(candidate["text"])[0]
+            if _normalized(candidate_masked) != masked:
+                best_score = max(best_score, jaccard(shingle_set, shingles(candidate_masked, self.shingle_size)))
+                continue
+            if candidate["text"] == text:
+                return candidate["output"], 1.0
+            output = patch_entities(candidate["text"], text, candidate["output"])
+            if output is not None:
+                return output, 1.0
+        return None, best_score
+
+
+def reuse_variant(mode, level, tier):
+    """
+    Variant key for chunks simplified with these settings.
+
+    Presubstitution rewrites the chunk text the model sees, so outputs made
+    with and without it are kept apart. ChunkReuse adds the routed model per
+    chunk.
+    """
+    return f"{mode}-{level}-{tier}-{'presub' if LEGALESE_PRESUBSTITUTION else 'raw'}"
+
+
+class ChunkReuse:
+    """
+    One request's view of the index: its owner and variant plus hit/miss
+    counts. Lookups and records name the model the chunk is routed to, which
+    becomes part of the variant.
+    """
+
+    def __init__(self, index, owner, variant):
+        self.index = index
+        self.owner = owner
+        self.variant = variant
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _variant(self, model):
+        # The same chunk simplified by different models must not share outputs
+        return self.variant if model is None else f"{self.variant}-{model}"
+
+    def lookup(self, text, model=None):
+        try:
+            output, _ = self.index.lookup(self.owner, text, self._variant(model))
+        except Exception:
+            logging.exception("Near-duplicate lookup failed")
+            output = None
+        with self._lock:
+            if output is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return output
+
+    def record(self, text, output, model=None):
+        try:
+            self.index.record(self.owner, text, self._variant(model), output)
+        except Exception:
+            logging.exception("Could not record chunk output")
+
+    def to_dict(self):
+        with self._lock:
+            return {"reused_chunks": self.hits, "generated_chunks": self.misses}
+
+
+def near_duplicate_index_from_env(store):
+    """
+    Build a NearDuplicateIndex configured from environment variables, or
+    None when NEAR_DUPLICATE_REUSE=0.
+
+    NEAR_DUPLICATE_BANDS       LSH bands out of 64 hash functions (default 16)
+    """
+    if store is None or os.getenv("NEAR_DUPLICATE_REUSE", "1") != "1":
+        return None
+    return NearDuplicateIndex(
+        store,
+        hasher=MinHasher(num_perm=64, bands=int(os.getenv("NEAR_DUPLICATE_BANDS", "16"))),
+    )
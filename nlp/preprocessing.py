@@ -1,6 +1,8 @@
 import spacy
 import re
 
+from nlp import sentence_segmenter
+
 # Load SpaCy model (must be installed in requirements.txt)
 try:
     nlp = spacy.load("en_core_web_sm", disable=["ner"])
@@ -24,23 +26,19 @@ def clean_text(text):
 
 def segment_sentences(text):
     """
-    Segment text into sentences using SpaCy.
+    Segment text into sentences with the shared legal-aware segmenter.
     """
-    if not text:
-        return []
-
-    doc = nlp(text)
-    return [sent.text.strip() for sent in doc.sents]
+    return sentence_segmenter.segment_sentences(text)
 
 
 def tokenize_text(text):
     """
-    Tokenize text using SpaCy.
+    Tokenize text using SpaCy's tokenizer (no tagger or parser).
     """
     if not text:
         return []
 
-    doc = nlp(text)
+    doc = nlp.tokenizer(text)
     return [token.text for token in doc]
 
 
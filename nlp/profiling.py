@@ -0,0 +1,230 @@
+"""
+Request Profiling
+A stdlib sampling profiler that an admin can switch on for a single request.
+
+While a profile is running, a background thread periodically snapshots the
+stack of the request thread and of every worker thread tagged as working for
+that request (chunk workers, the inference batcher while it runs a batch
+holding the request's prompts), so time spent in generation, preprocessing
+or MongoDB calls shows up wherever it happens. Threads serving other requests
+stay out of the profile. Nothing runs unless a profile has been started.
+"""
+
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+
+# A sampled thread whose innermost frame is one of these is waiting, not working
+_IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("socket.py", "accept"),
+    ("socketserver.py", "serve_forever"),
+}
+
+
+# Thread ident -> tags of the profiled requests the thread is working for
+_thread_tags = {}
+
+
+def current_tags():
+    """Tags of the requests the calling thread is working for."""
+    return _thread_tags.get(threading.get_ident(), ())
+
+
+@contextmanager
+def tagged(tags):
+    """Mark the calling thread as working for the requests with these tags."""
+    ident = threading.get_ident()
+    previous = _thread_tags.get(ident)
+    if tags:
+        _thread_tags[ident] = tuple(tags)
+    try:
+        yield
+    finally:
+        if previous is None:
+            _thread_tags.pop(ident, None)
+        else:
+            _thread_tags[ident] = previous
+
+
+def propagate(func):
+    """Wrap func so that whichever thread runs it carries the caller's tags."""
+    tags = current_tags()
+    if not tags:
+        return func
+
+    def run(*args, **kwargs):
+        with tagged(tags):
+            return func(*args, **kwargs)
+    return run
+
+
+def _frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _is_idle(frame):
+    return (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in _IDLE_FRAMES
+
+
+class SamplingProfiler:
+    """
+    Samples thread stacks at a fixed interval into collapsed-stack counts.
+
+    Only the thread that started the profile and threads tagged with the
+    profile's tag (see ``tagged`` and ``propagate``) are sampled.
+    """
+
+    _tags = itertools.count(1)
+
+    def __init__(self, interval=0.005, max_seconds=120):
+        """
+        Args:
+            interval (float): Seconds between samples
+            max_seconds (float): Sampling stops after this long even if the
+                request has not finished
+        """
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.stacks = Counter()  # "thread;outer;...;inner" -> samples
+        self.samples = 0
+        self.started_at = None
+        self.duration = 0.0
+
+        self.tag = f"profile-{next(self._tags)}"
+        self._target = None
+        self._tagging = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start sampling; the calling thread is always sampled, even when waiting."""
+        self._target = threading.get_ident()
+        # Work the calling thread hands out carries the tag to its workers
+        self._tagging = tagged(current_tags() + (self.tag,))
+        self._tagging.__enter__()
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling and return the collapsed stack counts."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self._tagging is not None:
+            self._tagging.__exit__(None, None, None)
+            self._tagging = None
+        self.duration = time.time() - self.started_at
+        return self.stacks
+
+    def _run(self):
+        own = threading.get_ident()
+        deadline = time.monotonic() + self.max_seconds
+        while not self._stop.wait(self.interval) and time.monotonic() < deadline:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                if ident != self._target and (self.tag not in _thread_tags.get(ident, ()) or _is_idle(frame)):
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+
+def top_functions(stacks, limit=30, sort="self"):
+    """
+    Summarize collapsed stacks into a top-N table.
+
+    Args:
+        stacks (dict): "thread;outer;...;inner" -> sample count
+        limit (int): Number of rows to return
+        sort (str): "self" (time in the function itself) or "total"
+            (time including callees)
+
+    Returns:
+        list: Dicts with function, self samples and total samples
+    """
+    self_counts = Counter()
+    total_counts = Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(';')[1:]  # drop the thread name
+        if not frames:
+            continue
+        self_counts[frames[-1]] += count
+        for frame in set(frames):
+            total_counts[frame] += count
+
+    primary, secondary = (total_counts, self_counts) if sort == "total" else (self_counts, total_counts)
+    ranked = sorted(total_counts, key=lambda f: (-primary[f], -secondary[f]))[:limit]
+    return [
+        {"function": function, "self": self_counts[function], "total": total_counts[function]}
+        for function in ranked
+    ]
+
+
+class ProfileStore:
+    """Keeps the most recent profiles in memory, oldest dropped first."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, retention=20):
+        self._profiles = deque(maxlen=max(1, int(retention)))
+        self._lock = threading.Lock()
+
+    def add(self, profiler, method, path, user_id, status):
+        """Store a finished profile and return its ID."""
+        profile = {
+            "id": next(self._ids),
+            "time": time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(profiler.started_at)),
+            "method": method,
+            "path": path,
+            "user_id": user_id,
+            "status": status,
+            "duration": round(profiler.duration, 3),
+            "samples": profiler.samples,
+            "interval_ms": round(profiler.interval * 1000, 1),
+            "stacks": dict(profiler.stacks),
+        }
+        with self._lock:
+            self._profiles.append(profile)
+        return profile["id"]
+
+    def list(self):
+        """Return profile summaries, newest first."""
+        with self._lock:
+            return [
+                {k: v for k, v in p.items() if k != "stacks"}
+                for p in reversed(self._profiles)
+            ]
+
+    def get(self, profile_id):
+        with self._lock:
+            for profile in self._profiles:
+                if profile["id"] == profile_id:
+                    return profile
+        return None
+
+
+def profiler_from_env():
+    """
+    Build a SamplingProfiler configured from environment variables.
+
+    PROFILE_SAMPLE_INTERVAL_MS and PROFILE_MAX_SECONDS override the defaults.
+    """
+    return SamplingProfiler(
+        interval=float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5")) / 1000,
+        max_seconds=float(os.getenv("PROFILE_MAX_SECONDS", "120")),
+    )
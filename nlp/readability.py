@@ -1,20 +1,123 @@
+import math
+import re
+import threading
+from functools import lru_cache
+
 import textstat
 
-def calculate_readability(text):
+# The counting rules below are textstat's own (sentence regex, punctuation
+# removal, Dale-Chall easy words), applied so that the counts are additive.
+# Scores therefore match textstat.flesch_kincaid_grade and
+# textstat.gunning_fog on the same text.
+
+# textstat.sentence_count: runs up to sentence-final punctuation; runs of
+# two words or fewer ("U.", "Sec. 5") are not counted as sentences
+_SENTENCE_RE = re.compile(r'\b[^.!?]+[.!?]*', re.UNICODE)
+_SENTENCE_MIN_WORDS = 3
+
+# textstat.difficult_words_list tokenization
+_DIFFICULT_TOKEN_RE = re.compile(r"[\w\='‘’]+")
+
+# Gunning Fog counts words of this many syllables or more as complex,
+# unless they are on the easy-word list
+COMPLEX_WORD_SYLLABLES = 3
+
+
+@lru_cache(maxsize=50000)
+def _syllables(word):
+    return textstat.syllable_count(word)
+
+
+@lru_cache(maxsize=50000)
+def _is_difficult(word):
+    return textstat.is_difficult_word(word, COMPLEX_WORD_SYLLABLES)
+
+
+def _lexicon_count(text):
+    return len(textstat.remove_punctuation(text).split())
+
+
+def _round(number, points):
+    # textstat rounds half away from zero, not to even
+    p = 10 ** points
+    return math.floor(number * p + math.copysign(0.5, number)) / p
+
+
+def empty_statistics():
+    """Return zeroed readability statistics."""
+    return {"sentences": 0, "words": 0, "syllables": 0, "difficult_words": []}
+
+
+def text_statistics(text):
     """
-    Calculate readability scores using textstat.
-    Returns Flesch-Kincaid Grade and Gunning Fog Index.
+    Count the quantities the readability formulas are built from.
+
+    The counts are additive, so statistics of consecutive chunks can be
+    combined with merge_statistics to get exactly the whole document's.
+    Gunning Fog counts each distinct difficult word once, so those are kept
+    as a word list and merged by union.
+
+    Args:
+        text (str): Input text
+
+    Returns:
+        dict: sentences, words, syllables and difficult_words
     """
+    stats = empty_statistics()
     if not text or not text.strip():
+        return stats
+
+    stats["sentences"] = sum(
+        1 for sentence in _SENTENCE_RE.findall(text) if _lexicon_count(sentence) >= _SENTENCE_MIN_WORDS
+    )
+    for token in text.split():
+        word = textstat.remove_punctuation(token.lower())
+        if not word:
+            continue
+        stats["words"] += 1
+        stats["syllables"] += _syllables(word)
+    stats["difficult_words"] = sorted({
+        word for word in _DIFFICULT_TOKEN_RE.findall(text.lower()) if _is_difficult(word)
+    })
+    return stats
+
+
+def merge_statistics(*parts):
+    """Combine several readability statistics dicts."""
+    total = empty_statistics()
+    difficult = set()
+    for part in parts:
+        for key in ("sentences", "words", "syllables"):
+            total[key] += part.get(key, 0)
+        difficult.update(part.get("difficult_words", ()))
+    total["difficult_words"] = sorted(difficult)
+    return total
+
+
+def readability_from_statistics(stats):
+    """
+    Turn aggregated counts into Flesch-Kincaid Grade and Gunning Fog scores.
+
+    Args:
+        stats (dict): Output of text_statistics or merge_statistics
+
+    Returns:
+        dict: flesch_kincaid_grade, gunning_fog and complexity_level
+    """
+    if not stats or not stats.get("words"):
         return {
             "flesch_kincaid_grade": 0,
             "gunning_fog": 0,
             "complexity_level": "N/A"
         }
-        
-    fk_grade = textstat.flesch_kincaid_grade(text)
-    gunning_fog = textstat.gunning_fog(text)
-    
+
+    # Intermediate averages are rounded to one decimal, as textstat does
+    words_per_sentence = _round(stats["words"] / max(1, stats["sentences"]), 1)
+    syllables_per_word = _round(stats["syllables"] / stats["words"], 1)
+    fk_grade = _round(0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59, 1)
+    difficult_share = 100 * len(stats.get("difficult_words", ())) / stats["words"]
+    gunning_fog = _round(0.4 * (words_per_sentence + difficult_share), 2)
+
     # Simple complexity mapping based on FK Grade
     if fk_grade < 8:
         complexity = "Easy"
@@ -24,20 +127,57 @@ def calculate_readability(text):
         complexity = "Difficult"
     else:
         complexity = "Very Difficult (Legal/Academic)"
-        
+
     return {
         "flesch_kincaid_grade": fk_grade,
         "gunning_fog": gunning_fog,
         "complexity_level": complexity
     }
 
+
+def calculate_readability(text):
+    """
+    Calculate readability scores.
+    Returns Flesch-Kincaid Grade and Gunning Fog Index.
+    """
+    return readability_from_statistics(text_statistics(text))
+
+
+class ReadabilityAccumulator:
+    """
+    Thread-safe running total of readability statistics.
+
+    Chunk workers call add() on their output as each chunk completes, so the
+    final scores are ready as soon as generation finishes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {"sentences": 0, "words": 0, "syllables": 0}
+        self._difficult = set()
+
+    def add(self, text, copies=1):
+        """Count one chunk of text (occurring ``copies`` times) into the running total."""
+        part = text_statistics(text)
+        with self._lock:
+            for key in self._counts:
+                self._counts[key] += part[key] * copies
+            # Repeats add to the counts but not to the distinct difficult words
+            self._difficult.update(part["difficult_words"])
+
+    @property
+    def stats(self):
+        with self._lock:
+            return dict(self._counts, difficult_words=sorted(self._difficult))
+
+    def readability(self):
+        return readability_from_statistics(self.stats)
+
 def analyze_word_complexity(text):
     """
     Analyze word complexity based on syllable count and length.
     Returns a list of dictionaries with word and complexity level.
     """
-    import re
-    
     if not text:
         return []
         
@@ -58,7 +198,7 @@ def analyze_word_complexity(text):
         if re.search(r'[a-zA-Z]', token):
             # Clean for analysis (remove punctuation)
             clean_token = re.sub(r'[^\w\s]', '', token)
-            syllables = textstat.syllable_count(clean_token)
+            syllables = _syllables(clean_token.lower())
             length = len(clean_token)
             
             if syllables >= 3:
@@ -0,0 +1,242 @@
+"""
+Model Registry
+Holds several seq2seq models at once and decides which one serves a chunk.
+
+Routes are matched in order on task (simplify/summarize), simplification
+mode and input size, so e.g. short basic-mode chunks can go to a small model
+while advanced rewrites and summaries use a larger one. Models can be loaded,
+replaced and unloaded at runtime. A replacement is swapped in atomically, and
+the old instance is dropped only after its in-flight batches finish.
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+class LoadedModel:
+    """One loaded tokenizer/model pair plus usage counters."""
+
+    def __init__(self, name, source, tokenizer, model):
+        self.name = name
+        self.source = source
+        self.tokenizer = tokenizer
+        self.model = model
+        self.loaded_at = time.time()
+        self.in_flight = 0
+        self.batches = 0
+        self.draining = False
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "source": self.source,
+            "loaded_at": time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.loaded_at)),
+            "in_flight": self.in_flight,
+            "batches": self.batches,
+            "draining": self.draining,
+        }
+
+
+def parse_routes(spec):
+    """
+    Parse a route list like "simplify:basic=small,simplify:*:128=small,summarize:*=base".
+
+    Each entry is ``task:mode[:max_input_tokens]=model``; "*" matches anything.
+
+    Returns:
+        list: Route dicts with task, mode, max_input_tokens and model
+    """
+    routes = []
+    for entry in (spec or '').split(','):
+        entry = entry.strip()
+        if not entry:
+            continue
+        match, model = entry.rsplit('=', 1)
+        parts = match.split(':')
+        routes.append({
+            "task": parts[0].strip() or '*',
+            "mode": parts[1].strip() if len(parts) > 1 and parts[1].strip() else '*',
+            "max_input_tokens": int(parts[2]) if len(parts) > 2 and parts[2].strip() else None,
+            "model": model.strip(),
+        })
+    return routes
+
+
+class ModelRegistry:
+    """
+    Named models, a default, and ordered routing rules.
+
+    The name -> model mapping is replaced wholesale under a lock, so readers
+    always see a consistent snapshot and a swap is a single assignment.
+    """
+
+    def __init__(self, loader):
+        """
+        Args:
+            loader (callable): ``loader(source) -> (tokenizer, model)``
+        """
+        self.loader = loader
+        self.default = None
+        self.routes = []
+
+        self._lock = threading.Lock()
+        self._models = {}
+        self._draining = []
+        self._loading = {}  # name -> source
+        self._errors = {}  # name -> last load error
+
+    # ── Loading ──
+    def load(self, name, source, make_default=False):
+        """
+        Load ``source`` under ``name``, replacing any model already there.
+
+        Loading happens outside the lock; only the final swap is serialized,
+        so requests keep using the old model until the new one is ready.
+        """
+        with self._lock:
+            self._loading[name] = source
+            self._errors.pop(name, None)
+        try:
+            tokenizer, model = self.loader(source)
+        except Exception as e:
+            logging.exception(f"Error loading model {name} ({source})")
+            with self._lock:
+                self._loading.pop(name, None)
+                self._errors[name] = str(e)
+            raise
+
+        loaded = LoadedModel(name, source, tokenizer, model)
+        with self._lock:
+            self._loading.pop(name, None)
+            models = dict(self._models)
+            previous = models.get(name)
+            models[name] = loaded
+            self._models = models
+            if make_default or self.default is None:
+                self.default = name
+            if previous is not None:
+                self._retire(previous)
+        logging.info(f"Model {name} ready ({source})")
+        return loaded
+
+    def unload(self, name):
+        """Remove a model; its in-flight batches finish before it is released."""
+        with self._lock:
+            if name == self.default:
+                raise ValueError("Cannot unload the default model; make another model the default first")
+            if name not in self._models:
+                raise KeyError(name)
+            models = dict(self._models)
+            previous = models.pop(name)
+            self._models = models
+            self._retire(previous)
+
+    def _retire(self, loaded):
+        loaded.draining = True
+        if loaded.in_flight:
+            self._draining.append(loaded)
+        else:
+            self._release(loaded)
+
+    @staticmethod
+    def _release(loaded):
+        # Drop our references so the weights can be garbage collected
+        loaded.model = None
+        loaded.tokenizer = None
+        logging.info(f"Model {loaded.name} ({loaded.source}) released")
+
+    def set_routes(self, routes, default=None):
+        """Atomically replace the routing rules (and optionally the default model)."""
+        with self._lock:
+            if default is not None:
+                if default not in self._models:
+                    raise KeyError(default)
+                self.default = default
+            self.routes = list(routes)
+
+    # ── Serving ──
+    def route(self, task, mode=None, input_tokens=0):
+        """Return the name of the model that should serve this chunk."""
+        models = self._models
+        for rule in self.routes:
+            if rule["task"] not in ('*', task):
+                continue
+            if rule["mode"] not in ('*', mode):
+                continue
+            if rule["max_input_tokens"] is not None and input_tokens > rule["max_input_tokens"]:
+                continue
+            if rule["model"] in models:
+                return rule["model"]
+        return self.default
+
+    def get(self, name=None):
+        """Return the current LoadedModel for name (or the default), or None."""
+        models = self._models
+        return models.get(name) or models.get(self.default)
+
+    @contextmanager
+    def acquire(self, name=None):
+        """
+        Pin a model for the duration of one batch.
+
+        Falls back to the default model when ``name`` has been unloaded since
+        the chunk was routed.
+        """
+        with self._lock:
+            loaded = self.get(name)
+            if loaded is None:
+                raise RuntimeError("No model loaded")
+            loaded.in_flight += 1
+            loaded.batches += 1
+        try:
+            yield loaded
+        finally:
+            with self._lock:
+                loaded.in_flight -= 1
+                if loaded.draining and loaded.in_flight == 0 and loaded in self._draining:
+                    self._draining.remove(loaded)
+                    self._release(loaded)
+
+    def ready(self):
+        return self.get() is not None
+
+    def stats(self):
+        """Return loaded, draining and loading models plus the routing table."""
+        with self._lock:
+            return {
+                "default": self.default,
+                "models": [m.to_dict() for m in self._models.values()],
+                "draining": [m.to_dict() for m in self._draining],
+                "loading": [{"name": n, "source": s} for n, s in self._loading.items()],
+                "errors": dict(self._errors),
+                "routes": list(self.routes),
+            }
+
+
+def registry_from_env(loader, default_source):
+    """
+    Build a ModelRegistry and load the models named in environment variables.
+
+    MODELS            comma-separated name=source pairs (default: "small=<default_source>")
+    DEFAULT_MODEL     model used when no route matches (default: first in MODELS)
+    MODEL_ROUTES      ordered routing rules, see parse_routes
+    """
+    registry = ModelRegistry(loader)
+    specs = [
+        entry.split('=', 1) for entry in os.getenv("MODELS", f"small={default_source}").split(',')
+        if '=' in entry
+    ]
+    default = os.getenv("DEFAULT_MODEL", specs[0][0].strip() if specs else None)
+
+    for name, source in specs:
+        try:
+            registry.load(name.strip(), source.strip(), make_default=name.strip() == default)
+        except Exception:
+            # Logged by load(); the rest of the models can still serve
+            pass
+
+    registry.set_routes(parse_routes(os.getenv("MODEL_ROUTES", "")))
+    return registry
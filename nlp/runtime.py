@@ -0,0 +1,195 @@
+"""
+Inference Runtime Configuration
+Torch thread counts, CPU pinning and startup auto-tuning for the model.
+
+Left alone, every app process on a host sizes torch's thread pools to all of
+the machine's cores, so several workers oversubscribe each other. Here each
+process gets its share of the cores: either pinned to its own slice or just
+given fewer threads. An optional startup benchmark can also pick the thread
+count and batch size with the best throughput on this host.
+"""
+
+import logging
+import os
+import tempfile
+import time
+
+# Held open for the life of the process so the claimed worker slot stays ours
+_slot_lock = None
+
+_state = {
+    "intra_op_threads": None,
+    "inter_op_threads": None,
+    "cpu_affinity": None,
+    "worker_slot": None,
+    "autotune": None,
+}
+
+
+def _available_cores():
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _parse_cores(spec):
+    """Parse a core list like "0-3,8,10-11"."""
+    cores = set()
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            lo, hi = part.split('-', 1)
+            cores.update(range(int(lo), int(hi) + 1))
+        else:
+            cores.add(int(part))
+    return sorted(cores)
+
+
+def _claim_worker_slot(workers):
+    """
+    Claim the lowest free worker slot on this host.
+
+    Each slot is an exclusive file lock, so processes forked by gunicorn (or
+    started separately) each get a distinct slot without coordination.
+    """
+    global _slot_lock
+    try:
+        import fcntl
+    except ImportError:
+        return None
+    for slot in range(workers):
+        path = os.path.join(tempfile.gettempdir(), f"cls-inference-slot-{slot}.lock")
+        handle = open(path, "w")
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            continue
+        _slot_lock = handle
+        return slot
+    return None
+
+
+def _worker_slot(workers):
+    explicit = os.getenv("INFERENCE_WORKER_INDEX")
+    if explicit is not None:
+        return int(explicit) % workers
+    return _claim_worker_slot(workers)
+
+
+def configure_runtime():
+    """
+    Apply CPU affinity and torch thread counts from environment variables.
+
+    INFERENCE_WORKERS       processes sharing this host (default 1)
+    INFERENCE_WORKER_INDEX  this process's slot (default: claimed automatically)
+    CPU_AFFINITY            "" (no pinning), "auto" (own slice of the cores
+                            per worker) or an explicit list such as "0-3,8"
+    TORCH_NUM_THREADS       intra-op threads (default: cores available to this
+                            worker)
+    TORCH_INTEROP_THREADS   inter-op threads (default 1; generate() runs one
+                            op graph at a time)
+
+    Must run before the model executes anything so the inter-op pool can
+    still be sized.
+
+    Returns:
+        dict: The applied settings
+    """
+    import torch
+
+    workers = max(1, int(os.getenv("INFERENCE_WORKERS", "1")))
+    affinity = os.getenv("CPU_AFFINITY", "").strip().lower()
+    cores = _available_cores()
+
+    if affinity:
+        if affinity == "auto":
+            slot = _worker_slot(workers)
+            _state["worker_slot"] = slot
+            if slot is not None and len(cores) >= workers:
+                per_worker = len(cores) // workers
+                cores = cores[slot * per_worker:(slot + 1) * per_worker]
+        else:
+            cores = _parse_cores(affinity)
+        if hasattr(os, "sched_setaffinity"):
+            try:
+                os.sched_setaffinity(0, cores)
+                _state["cpu_affinity"] = cores
+            except OSError as e:
+                logging.warning(f"Could not set CPU affinity to {cores}: {e}")
+        share = len(cores)
+    else:
+        # Not pinned: still split the cores between the host's workers
+        share = max(1, len(cores) // workers)
+
+    intra = int(os.getenv("TORCH_NUM_THREADS", str(share)))
+    inter = int(os.getenv("TORCH_INTEROP_THREADS", "1"))
+
+    torch.set_num_threads(max(1, intra))
+    try:
+        torch.set_num_interop_threads(max(1, inter))
+    except RuntimeError:
+        # Already fixed once parallel work has started (e.g. after a reload)
+        logging.warning("Inter-op thread count already set; keeping the existing value")
+
+    _state["intra_op_threads"] = torch.get_num_threads()
+    _state["inter_op_threads"] = torch.get_num_interop_threads()
+    logging.info(f"Inference runtime: {_state}")
+    return dict(_state)
+
+
+def autotune(generate_fn, prompt, gen_kwargs, thread_options=None, batch_options=(1, 4, 8), rounds=2):
+    """
+    Benchmark a few generations per thread/batch setting and keep the fastest.
+
+    Throughput is prompts per second. The winning thread count is left
+    applied to torch.
+
+    Args:
+        generate_fn (callable): Batched generate(prompts, gen_kwargs) -> outputs
+        prompt (str): Representative chunk prompt
+        gen_kwargs (dict): Generation settings for the benchmark
+        thread_options (list): Intra-op thread counts to try (default: powers
+            of two up to the current thread count)
+        batch_options (tuple): Batch sizes to try
+        rounds (int): Timed runs per setting, after one warm-up
+
+    Returns:
+        dict: best {threads, batch_size, prompts_per_second} plus all trials
+    """
+    import torch
+
+    max_threads = torch.get_num_threads()
+    if thread_options is None:
+        thread_options = sorted({t for t in (1, 2, 4, 8, 16, 32) if t < max_threads} | {max_threads})
+
+    trials = []
+    for threads in thread_options:
+        torch.set_num_threads(threads)
+        for batch_size in batch_options:
+            prompts = [prompt] * batch_size
+            generate_fn(prompts, gen_kwargs)  # warm-up
+            start = time.perf_counter()
+            for _ in range(rounds):
+                generate_fn(prompts, gen_kwargs)
+            elapsed = time.perf_counter() - start
+            trials.append({
+                "threads": threads,
+                "batch_size": batch_size,
+                "prompts_per_second": round(batch_size * rounds / elapsed, 2),
+            })
+
+    best = max(trials, key=lambda t: t["prompts_per_second"])
+    torch.set_num_threads(best["threads"])
+
+    _state["intra_op_threads"] = best["threads"]
+    _state["autotune"] = {"best": best, "trials": trials}
+    logging.info(f"Auto-tuned inference runtime: {best}")
+    return _state["autotune"]
+
+
+def runtime_stats():
+    """Return the thread, affinity and auto-tune settings in effect."""
+    return dict(_state)
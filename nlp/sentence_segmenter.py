@@ -1,8 +1,206 @@
-import spacy
+"""
+Sentence Segmentation
+One rule-based, legal-aware sentence splitter shared by every nlp module.
+
+It understands abbreviations common in contracts ("Inc.", "Sec. 5",
+"U.S.C.", "e.g."), numbered clause markers at the start of a line
+("1.", "2.1", "(a)", "Article IV") and paragraph breaks, without running
+spaCy's dependency parser. Results are memoized per content hash.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+# Never end a sentence: titles, Latin abbreviations, multi-part abbreviations
+ABBREVIATIONS = {
+    "mr", "mrs", "ms", "dr", "prof", "hon", "rev", "st", "messrs",
+    "e.g", "i.e", "viz", "cf", "et al", "al", "approx", "esp",
+    "u.s", "u.s.a", "u.s.c", "u.k", "c.f.r", "n.a", "d.c", "n.y",
+    "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept", "oct", "nov", "dec",
+    "dept", "govt", "assn", "bros", "mfg", "vs", "v",
+}
+
+# Only an abbreviation when a reference number follows ("Sec. 5", "No. 12")
+NUMBERED_ABBREVIATIONS = {
+    "no", "nos", "sec", "secs", "art", "arts", "para", "paras", "cl", "ch",
+    "p", "pp", "vol", "fig", "ex", "exh", "sched", "subsec", "reg", "regs", "par",
+}
+
+# Company suffixes end a sentence only when a capitalised word follows
+# ("Acme Inc. The Company ...") but not before "(", quotes or numbers
+CORPORATE_SUFFIXES = {"inc", "ltd", "corp", "co", "llc", "llp", "plc", "lp", "l.l.c", "l.p"}
+
+# Words that label a part of the document with a single letter: the "A."
+# in "See Exhibit A. The parties ..." ends a sentence instead of being an initial
+LETTER_DESIGNATORS = {
+    "exhibit", "schedule", "annex", "appendix", "section", "article", "part",
+    "clause", "attachment", "addendum", "rider", "paragraph",
+}
+
+# Sentence-final punctuation plus any closing quotes/brackets, then whitespace
+_END_RE = re.compile(r'[.!?]+["\'”’)\]]*(?=\s)')
+
+# Blank line between paragraphs
+_PARAGRAPH_RE = re.compile(r'\n[ \t]*\n\s*')
+
+# Numbered clause marker at the start of a line: "1.", "2.1", "(a)", "iv)", "Article IV", "Section 3"
+_CLAUSE_RE = re.compile(
+    r'\n[ \t]*(?=(?:\(?\d+(?:\.\d+)*[.)]?|\([a-zA-Z]{1,4}\)|[a-zA-Z]{1,4}\)|[A-Z]\.'
+    r'|(?:ARTICLE|Article|SECTION|Section)\s+[0-9IVXLC]+)\s)'
+)
+
+# What follows "Sec." / "No." when it is a reference: "5", "(a)", "IV", "B"
+_REFERENCE_RE = re.compile(r'\(?(?:\d|[IVXLC]+\b|[A-Z]\b)')
+
+_ENUMERATOR_RE = re.compile(r'^\(?(?:\d+(?:\.\d+)*|[a-zA-Z]|[ivxlcIVXLC]{1,5})\)?$')
+_INITIALS_RE = re.compile(r'^(?:[A-Za-z]\.)*[A-Za-z]$')
+
+_WHITESPACE_RE = re.compile(r'\s*')
+
+# How far back to look for the word before a full stop; only the last two
+# words matter, and a fixed window keeps segmentation linear on long lines
+_LOOKBEHIND_CHARS = 120
+
+_CACHE_SIZE = 256
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _is_boundary(text, start, end, enumerators=True):
+    """
+    Decide whether the punctuation run text[start:end] ends a sentence.
+
+    With ``enumerators`` off, the clause-number rule is skipped; that is how
+    the word before a possible clause number is checked without recursing.
+    """
+    # Index into text rather than slicing off the rest, which would copy the
+    # remainder of the document for every full stop
+    rest = _WHITESPACE_RE.match(text, end).end()
+    if rest == len(text):
+        return True
+    next_char = text[rest]
+    # "etc. and ..." - a lowercase continuation is never a new sentence
+    if next_char.islower():
+        return False
+
+    if text[start] != '.':
+        return True
+
+    line_start = text.rfind('\n', max(0, start - _LOOKBEHIND_CHARS), start) + 1
+    truncated = line_start == 0 and start > _LOOKBEHIND_CHARS
+    if truncated:
+        line_start = start - _LOOKBEHIND_CHARS
+    words = text[line_start:start].split()
+    if truncated:
+        # The window may have cut the first word in half
+        words = words[1:]
+    if not words:
+        return True
+    word = words[-1].lstrip('("\'“‘[')
+    lower = word.lower()
+
+    # "1." / "(a)." / "2.1." opening a line, or right after a confirmed
+    # sentence end once newlines have been collapsed, is a clause number.
+    # "U.S.C. 1983." is not: the full stop before the number is no boundary
+    if enumerators and _ENUMERATOR_RE.match(word):
+        if len(words) == 1:
+            if not truncated:
+                return False
+        elif words[-2][-1] in ':;':
+            return False
+        elif words[-2][-1] == '.':
+            head = text[line_start:start]
+            previous_end = line_start + len(head[:len(head.rstrip()) - len(words[-1])].rstrip())
+            previous_start = previous_end - (len(words[-2]) - len(words[-2].rstrip('.')))
+            if _is_boundary(text, previous_start, previous_end, enumerators=False):
+                return False
+    if lower in ABBREVIATIONS or (len(words) >= 2 and f"{words[-2].lower()} {lower}" in ABBREVIATIONS):
+        return False
+    if lower in NUMBERED_ABBREVIATIONS:
+        return not _REFERENCE_RE.match(text, rest)
+    if lower in CORPORATE_SUFFIXES:
+        return next_char.isalpha() and next_char.isupper()
+    if len(word) == 1 and len(words) >= 2 and words[-2].lower() in LETTER_DESIGNATORS:
+        return True
+    # Initials and dotted abbreviations: "J. Smith", "U.S.C. 1983"
+    if _INITIALS_RE.match(word):
+        return False
+    return True
+
+
+def sentence_spans(text):
+    """
+    Find sentence boundaries without memoization.
+
+    Args:
+        text (str): Input text
+
+    Returns:
+        list: (start, end) character offsets of each sentence, whitespace trimmed
+    """
+    if not text:
+        return []
+
+    cuts = set()
+    for m in _END_RE.finditer(text):
+        if _is_boundary(text, m.start(), m.end()):
+            cuts.add(m.end())
+    for m in _PARAGRAPH_RE.finditer(text):
+        cuts.add(m.start())
+    for m in _CLAUSE_RE.finditer(text):
+        cuts.add(m.start())
+
+    spans = []
+    prev = 0
+    for cut in sorted(cuts) + [len(text)]:
+        segment = text[prev:cut]
+        stripped = segment.strip()
+        if stripped:
+            s = prev + (len(segment) - len(segment.lstrip()))
+            spans.append((s, s + len(stripped)))
+        prev = cut
+    return spans
+
+
+def split_sentences(text):
+    """
+    Split text into sentences without memoization (for one-off blocks).
+
+    Args:
+        text (str): Input text
+
+    Returns:
+        list: Sentences in document order
+    """
+    return [text[s:e] for s, e in sentence_spans(text)]
 
-nlp = spacy.load("en_core_web_sm")
 
 def segment_sentences(text):
-    doc = nlp(text)
-    return [sent.text.strip() for sent in doc.sents]
+    """
+    Split text into sentences, memoized by content hash.
+
+    Args:
+        text (str): Input text
+
+    Returns:
+        list: Sentences in document order
+    """
+    if not text:
+        return []
+
+    key = hashlib.sha1(text.encode('utf-8')).digest()
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            return list(cached)
+
+    sentences = tuple(split_sentences(text))
 
+    with _cache_lock:
+        _cache[key] = sentences
+        if len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return list(sentences)
@@ -0,0 +1,136 @@
+"""
+Single-flight Request Coalescing
+Concurrent identical simplify/summarize requests attach to one in-flight
+computation and share its result. A newer request for the same document
+and operation with different parameters supersedes (cancels) the older one.
+Every caller waits only until its own deadline. A caller that needs more
+time than the in-flight computation's deadline allows runs its own
+computation instead of attaching.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, TimeoutError
+
+from nlp.cancellation import Cancelled, CancelToken
+
+
+class _Call:
+    __slots__ = ("key", "future", "token", "groups", "waiters")
+
+    def __init__(self, key, group, deadline):
+        self.key = key
+        self.future = Future()
+        self.token = CancelToken(deadline)
+        self.groups = {group}
+        self.waiters = 1
+
+    def covers(self, deadline):
+        """Whether this computation may run at least until ``deadline``."""
+        if self.token.deadline is None:
+            return True
+        return deadline is not None and deadline <= self.token.deadline
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls by key.
+
+    ``key`` identifies the work (e.g. content hash, operation, mode, level);
+    ``group`` identifies what a newer request supersedes (e.g. document ID
+    and operation). A call is only cancelled when every caller attached to
+    it belongs to the superseding group, so a user changing their slider
+    never cancels work another document is waiting on.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> _Call that new callers may attach to
+        self._running = set()  # every in-flight _Call, attachable or not
+
+    def do(self, key, fn, group=None, deadline=None):
+        """
+        Run ``fn(cancel_token)`` once per key among concurrent callers.
+
+        Args:
+            key (tuple): Hashable identity of the computation
+            fn (callable): Work to run; receives a CancelToken
+            group (tuple): Supersede group of this caller
+            deadline (float): time.monotonic() value after which this caller
+                no longer needs the result (None: no deadline)
+
+        Returns:
+            tuple: (result, shared) where shared is True if this caller
+                   attached to another caller's computation
+
+        Raises:
+            Cancelled: If the computation was superseded or cancelled, or
+                this caller's deadline passed first
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None and call.covers(deadline):
+                call.groups.add(group)
+                call.waiters += 1
+                leader = False
+            else:
+                self._supersede(group, key)
+                call = _Call(key, group, deadline)
+                # A longer-running call replaces the shorter one for later callers
+                self._calls[key] = call
+                self._running.add(call)
+                leader = True
+
+        if not leader:
+            return self._wait(call, deadline), True
+
+        try:
+            call.future.set_result(fn(call.token))
+        except BaseException as e:
+            call.future.set_exception(e)
+        finally:
+            with self._lock:
+                self._running.discard(call)
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+
+        return call.future.result(), False
+
+    def _wait(self, call, deadline):
+        """Wait for an attached computation until this caller's own deadline."""
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        try:
+            return call.future.result(timeout=timeout)
+        except TimeoutError:
+            raise Cancelled("deadline") from None
+        finally:
+            with self._lock:
+                call.waiters -= 1
+
+    def cancel(self, group, reason="cancelled"):
+        """
+        Cancel in-flight computations that only callers of ``group`` wait on.
+
+        Returns:
+            int: Number of computations cancelled
+        """
+        with self._lock:
+            calls = [call for call in self._running if call.groups == {group}]
+        for call in calls:
+            call.token.cancel(reason)
+        return len(calls)
+
+    def _supersede(self, group, new_key):
+        if group is None:
+            return
+        for call in self._running:
+            if call.key != new_key and call.groups == {group}:
+                call.token.cancel("superseded")
+
+    def stats(self):
+        """Return the number of in-flight computations and attached callers."""
+        with self._lock:
+            return {
+                "in_flight": len(self._running),
+                "waiters": sum(c.waiters for c in self._running),
+            }
@@ -0,0 +1,85 @@
+"""
+Stub Inference Backend
+A deterministic stand-in for FLAN-T5, selected with MODEL_BACKEND=stub.
+
+It needs no model download, torch or transformers, and takes a configurable
+amount of time per batch. The web tier can then be load-tested offline with
+realistic latency and repeatable output.
+"""
+
+import os
+import re
+import time
+import zlib
+
+_WORD_RE = re.compile(r'\S+')
+
+
+class StubTokenizer:
+    """Whitespace tokenizer exposing the small slice of the HF API the app uses."""
+
+    def encode(self, text, add_special_tokens=False):
+        return [zlib.crc32(word.encode('utf-8')) & 0xFFFF for word in _WORD_RE.findall(text)]
+
+
+class StubModel:
+    """
+    Echoes the prompt's input text back, truncated to the generation budget.
+
+    Each batch takes ``latency_ms`` plus the time to decode its longest output
+    at ``tokens_per_second``, like a padded batch on a real model.
+    """
+
+    def __init__(self, latency_ms=50, tokens_per_second=200):
+        self.latency = latency_ms / 1000
+        self.tokens_per_second = tokens_per_second
+
+    def _respond(self, prompt, gen_kwargs):
+        # Prompts are "<instruction>: <text>"; the instruction never contains ": "
+        text = prompt.split(': ', 1)[1] if ': ' in prompt else prompt
+        words = _WORD_RE.findall(text)[:gen_kwargs.get("max_new_tokens", 128)]
+
+        stop_after = gen_kwargs.get("stop_at_sentence_end")
+        if stop_after:
+            for i in range(stop_after - 1, len(words)):
+                if words[i].endswith(('.', '!', '?')):
+                    words = words[:i + 1]
+                    break
+        return ' '.join(words)
+
+    def generate_batch(self, prompts, gen_kwargs, cancel_tokens=None, memory=None):
+        """
+        Return one deterministic output per prompt after the simulated delay.
+
+        The delay is cut short once every prompt's cancel token has fired,
+        like a real batch whose rows all hit a stopping criterion. ``memory``
+        receives the size the padded int64 id tensors would have.
+        """
+        outputs = [self._respond(prompt, gen_kwargs) for prompt in prompts]
+        longest = max((len(o.split()) for o in outputs), default=0)
+        if memory is not None:
+            longest_prompt = max((len(_WORD_RE.findall(p)) for p in prompts), default=0)
+            memory.add("input_ids", len(prompts) * longest_prompt * 8)
+            memory.add("output_ids", len(prompts) * longest * 8)
+        delay = self.latency + (longest / self.tokens_per_second if self.tokens_per_second > 0 else 0)
+        tokens = [t for t in cancel_tokens or () if t is not None]
+        end = time.monotonic() + delay
+        while delay > 0:
+            if tokens and len(tokens) == len(prompts) and all(t.cancelled for t in tokens):
+                break
+            time.sleep(min(delay, 0.01))
+            delay = end - time.monotonic()
+        return outputs
+
+
+def stub_backend_from_env():
+    """
+    Build the stub (tokenizer, model) pair configured from environment variables.
+
+    STUB_LATENCY_MS and STUB_TOKENS_PER_SECOND override the defaults.
+    """
+    model = StubModel(
+        latency_ms=float(os.getenv("STUB_LATENCY_MS", "50")),
+        tokens_per_second=float(os.getenv("STUB_TOKENS_PER_SECOND", "200")),
+    )
+    return StubTokenizer(), model
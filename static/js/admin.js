@@ -0,0 +1,658 @@
+// ── State ──
+let currentDocId = null;
+let reqPage = 1, docsPage = 1;
+
+// ── Tab Switching ──
+const tabTitles = {
+    overview: '📊 Overview',
+    requests: '📋 Simplification Requests',
+    review: '📝 Document Review',
+    glossary: '📚 Glossary Management',
+    users: '👥 User Management',
+    scheduler: '⚙️ Scheduler',
+    models: '🧠 Models',
+    profiles: '🔬 Request Profiles'
+};
+
+function switchTab(tab) {
+    document.querySelectorAll('.tab-pane').forEach(el => el.classList.remove('active'));
+    document.querySelectorAll('.nav-item').forEach(el => el.classList.remove('active'));
+    document.getElementById('tab-' + tab).classList.add('active');
+    document.getElementById('nav-' + tab).classList.add('active');
+    document.getElementById('topbar-title').textContent = tabTitles[tab] || tab;
+
+    if (tab === 'overview') loadStats();
+    if (tab === 'requests') loadRequests();
+    if (tab === 'review') loadDocs();
+    if (tab === 'glossary') loadGlossary();
+    if (tab === 'users') loadUsers();
+    if (tab === 'scheduler') loadScheduler();
+    if (tab === 'models') loadModels();
+    if (tab === 'profiles') loadProfiles();
+}
+
+// ── Overview ──
+async function loadStats() {
+    try {
+        const res = await fetch('/api/admin/stats');
+        const data = await res.json();
+        if (!data.success) return;
+        const s = data.stats;
+
+        document.getElementById('s-total').textContent = s.total_requests ?? 0;
+        document.getElementById('s-time').textContent = (s.avg_processing_time ?? 0) + 's';
+        document.getElementById('s-reduction').textContent = s.avg_grade_reduction ?? 0;
+        document.getElementById('s-docs').textContent = s.total_documents ?? 0;
+        document.getElementById('s-users').textContent = s.total_users ?? 0;
+
+        renderModeBreakdown(s.requests_by_mode || {}, s.total_requests || 1);
+        renderActivityChart(s.recent_activity || []);
+    } catch (e) { console.error('Stats error', e); }
+}
+
+function renderModeBreakdown(byMode, total) {
+    const container = document.getElementById('mode-breakdown');
+    container.innerHTML = '';
+    const modes = [
+        { key: 'basic', label: '📘 Basic', color: '#10b981' },
+        { key: 'intermediate', label: '📗 Intermediate', color: '#4f46e5' },
+        { key: 'advanced', label: '📕 Advanced', color: '#ef4444' }
+    ];
+    modes.forEach(m => {
+        const count = byMode[m.key] || 0;
+        const pct = total > 0 ? Math.round((count / total) * 100) : 0;
+        const row = document.createElement('div');
+        row.className = 'mode-row';
+        row.innerHTML = `
+            <span class="mode-label">${m.label}</span>
+            <div class="mode-bar-track">
+                <div class="mode-bar-fill" style="width:${pct}%; background:${m.color};"></div>
+            </div>
+            <span class="mode-count">${count}</span>
+        `;
+        container.appendChild(row);
+    });
+}
+
+function renderActivityChart(activity) {
+    const chart = document.getElementById('activity-chart');
+    const labels = document.getElementById('activity-labels');
+    chart.innerHTML = '';
+    labels.innerHTML = '';
+    if (!activity.length) {
+        chart.innerHTML = '<span class="loading-info" style="margin:auto;">No activity yet</span>';
+        return;
+    }
+    const maxCount = Math.max(...activity.map(d => d.count), 1);
+    activity.forEach(d => {
+        const pct = Math.max(4, (d.count / maxCount) * 100);
+        const wrap = document.createElement('div');
+        wrap.className = 'activity-bar-wrap';
+        wrap.title = `${d.date}: ${d.count} request(s), avg ${d.avg_time}s`;
+        wrap.innerHTML = `<div class="activity-bar" style="height:${pct}%;"></div>`;
+        chart.appendChild(wrap);
+
+        const lbl = document.createElement('span');
+        lbl.className = 'activity-label';
+        lbl.textContent = d.date.slice(5); // MM-DD
+        labels.appendChild(lbl);
+    });
+}
+
+// ── Requests ──
+async function loadRequests(page = 1) {
+    reqPage = page;
+    try {
+        const res = await fetch(`/api/admin/requests?page=${page}&per_page=15`);
+        const data = await res.json();
+        if (!data.success) return;
+        const { items, total } = data.logs;
+        const tbody = document.getElementById('requests-tbody');
+        if (!items.length) {
+            tbody.innerHTML = '<tr><td colspan="8" class="loading-info">No requests yet.</td></tr>';
+            return;
+        }
+        tbody.innerHTML = items.map(log => `
+            <tr>
+                <td>${log.created_at}</td>
+                <td>${escHtml(log.doc_title)}</td>
+                <td><span class="badge-mode badge-${log.mode}">${log.mode}</span></td>
+                <td>${log.level}</td>
+                <td>${log.original_grade}</td>
+                <td>${log.simplified_grade}</td>
+                <td>${log.grade_reduction > 0 ? '-' : ''}${log.grade_reduction}</td>
+                <td>${log.processing_time}</td>
+            </tr>
+        `).join('');
+        renderPagination('req-pagination', total, 15, page, loadRequests);
+    } catch (e) { console.error('Requests error', e); }
+}
+
+// ── Documents ──
+async function loadDocs(page = 1) {
+    docsPage = page;
+    try {
+        const res = await fetch(`/api/admin/documents?page=${page}&per_page=15`);
+        const data = await res.json();
+        if (!data.success) return;
+        const { items, total } = data.documents;
+        const tbody = document.getElementById('docs-tbody');
+        if (!items.length) {
+            tbody.innerHTML = '<tr><td colspan="5" class="loading-info">No documents yet.</td></tr>';
+            return;
+        }
+        tbody.innerHTML = items.map(doc => `
+            <tr class="docs-table-row" onclick="selectDoc('${doc._id}', ${JSON.stringify(escHtml(doc.title))}, ${JSON.stringify(escHtml(doc.content_preview))}, ${JSON.stringify(escHtml(doc.simplified_preview))})">
+                <td><strong>${escHtml(doc.title)}</strong></td>
+                <td>${doc.type}</td>
+                <td><span class="badge-mode badge-${doc.status}">${doc.status}</span></td>
+                <td>${new Date(doc.created_at).toLocaleDateString()}</td>
+                <td>${doc.admin_corrected ? '✅ Yes' : '—'}</td>
+            </tr>
+        `).join('');
+        renderPagination('docs-pagination', total, 15, page, loadDocs);
+    } catch (e) { console.error('Docs error', e); }
+}
+
+function selectDoc(docId, title, contentPreview, simplifiedPreview) {
+    currentDocId = docId;
+    // Highlight selected row
+    document.querySelectorAll('.docs-table-row').forEach(r => r.classList.remove('selected'));
+    event.currentTarget.classList.add('selected');
+
+    document.getElementById('correction-doc-title').textContent = title;
+    document.getElementById('review-original').value = contentPreview;
+    document.getElementById('review-simplified').value = simplifiedPreview || '';
+    document.getElementById('correction-panel').style.display = 'block';
+    document.getElementById('correction-msg').textContent = '';
+    document.getElementById('correction-panel').scrollIntoView({ behavior: 'smooth' });
+}
+
+async function saveCorrection() {
+    if (!currentDocId) return;
+    const corrected = document.getElementById('review-simplified').value.trim();
+    if (!corrected) { alert('Please enter corrected text.'); return; }
+    try {
+        const res = await fetch(`/api/admin/document/${currentDocId}/correct`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ corrected_text: corrected })
+        });
+        const data = await res.json();
+        const msgEl = document.getElementById('correction-msg');
+        msgEl.className = data.success ? 'alert-success' : 'alert-error';
+        msgEl.textContent = data.success ? '✅ Correction saved successfully!' : '❌ ' + data.message;
+    } catch (e) {
+        document.getElementById('correction-msg').textContent = '❌ Network error';
+    }
+}
+
+// ── Glossary ──
+async function loadGlossary() {
+    try {
+        const res = await fetch('/api/admin/glossary');
+        const data = await res.json();
+        const tbody = document.getElementById('glossary-tbody');
+        if (!data.success || !data.terms.length) {
+            tbody.innerHTML = '<tr><td colspan="4" class="loading-info">No custom terms yet. Add one above.</td></tr>';
+            return;
+        }
+        tbody.innerHTML = data.terms.map(t => `
+            <tr>
+                <td><strong>${escHtml(t.display_term || t.term)}</strong></td>
+                <td>${escHtml(t.definition)}</td>
+                <td>${t.created_at || '—'}</td>
+                <td>
+                    <button class="btn btn-danger" onclick="deleteTerm('${t._id}')">🗑 Delete</button>
+                </td>
+            </tr>
+        `).join('');
+    } catch (e) { console.error('Glossary error', e); }
+}
+
+async function addGlossaryTerm() {
+    const term = document.getElementById('new-term').value.trim();
+    const def = document.getElementById('new-def').value.trim();
+    const msgEl = document.getElementById('glossary-add-msg');
+    if (!term || !def) { msgEl.innerHTML = '<div class="alert-error">Both term and definition are required.</div>'; return; }
+
+    try {
+        const res = await fetch('/api/admin/glossary', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ term, definition: def })
+        });
+        const data = await res.json();
+        msgEl.innerHTML = data.success
+            ? '<div class="alert-success">✅ Term added successfully!</div>'
+            : `<div class="alert-error">❌ ${data.message}</div>`;
+        if (data.success) {
+            document.getElementById('new-term').value = '';
+            document.getElementById('new-def').value = '';
+            loadGlossary();
+        }
+    } catch (e) { msgEl.innerHTML = '<div class="alert-error">❌ Network error</div>'; }
+}
+
+async function deleteTerm(termId) {
+    if (!confirm('Delete this term from the custom glossary?')) return;
+    try {
+        const res = await fetch(`/api/admin/glossary/${termId}`, { method: 'DELETE' });
+        const data = await res.json();
+        if (data.success) loadGlossary();
+        else alert('Error: ' + data.message);
+    } catch (e) { alert('Network error'); }
+}
+// ── Users ──
+async function loadUsers() {
+
+    try {
+
+const res = await fetch('/api/admin/users');
+const data = await res.json();
+
+const tbody = document.getElementById('users-tbody');
+
+if (!data.success || !data.users.length) {
+
+    tbody.innerHTML =
+        '<tr><td colspan="6" class="loading-info">No users found.</td></tr>';
+
+    return;
+}
+
+tbody.innerHTML = data.users.map(u => `
+<tr>
+    <td>${escHtml(u.name)}</td>
+    <td>${escHtml(u.email)}</td>
+    <td>${u.created_at || '-'}</td>
+    <td>${u.requests || 0}</td>
+    <td>${u.documents || 0}</td>
+<td>
+
+<button class="btn btn-secondary"
+onclick="viewUserActivity('${u._id}','${u.name}')">
+👁 View
+</button>
+
+<button class="btn btn-danger"
+onclick="deleteUser('${u._id}')">
+🗑 Delete
+</button>
+
+</td>
+</tr>
+`).join('');
+
+    } catch (err) {
+
+console.error("Users load error", err);
+
+    }
+
+}
+async function deleteUser(userId) {
+
+    if (!confirm("Delete this user and all their activity?"))
+return;
+
+    try {
+
+const res = await fetch(`/api/admin/users/${userId}`, {
+    method: "DELETE"
+});
+
+const data = await res.json();
+
+if (data.success) {
+
+    alert("User deleted successfully");
+
+    loadUsers();
+
+} else {
+
+    alert("Error deleting user");
+
+}
+
+    } catch (err) {
+
+alert("Network error");
+
+    }
+
+}
+async function viewUserActivity(userId, name){
+
+document.getElementById("activity-user-title").innerText =
+"User Activity - " + name;
+
+const res = await fetch(`/api/admin/users/${userId}/activity`);
+const data = await res.json();
+
+const docsBody = document.getElementById("activity-docs");
+const reqBody = document.getElementById("activity-requests");
+
+docsBody.innerHTML="";
+reqBody.innerHTML="";
+
+if(data.documents){
+
+data.documents.forEach(d=>{
+docsBody.innerHTML+=`
+<tr>
+<td>${escHtml(d.title)}</td>
+<td>${d.type}</td>
+<td>${d.date}</td>
+</tr>
+`;
+});
+
+}
+
+if(data.requests){
+
+data.requests.forEach(r=>{
+reqBody.innerHTML+=`
+<tr>
+<td>${escHtml(r.document)}</td>
+<td>${r.mode}</td>
+<td>${r.level}</td>
+<td>${r.orig_grade}</td>
+<td>${r.simp_grade}</td>
+<td>${r.time}</td>
+</tr>
+`;
+});
+
+}
+
+document.getElementById("userActivityModal").style.display="flex";
+
+}
+
+function closeActivity(){
+
+document.getElementById("userActivityModal").style.display="none";
+
+}
+// ── Scheduler ──
+async function loadScheduler() {
+    try {
+        const res = await fetch('/api/admin/scheduler');
+        const data = await res.json();
+        if (!data.success) return;
+        const sch = data.scheduler, adm = data.admission, inf = data.inference;
+
+        document.getElementById('sch-running').textContent = adm.running;
+        document.getElementById('sch-running-sub').textContent = `of ${adm.max_concurrent} allowed`;
+        document.getElementById('sch-queue').textContent = adm.queue_depth;
+        document.getElementById('sch-queue-sub').textContent = `${adm.queued_tokens} / ${adm.max_queue_tokens} tokens · avg wait ${adm.avg_wait_seconds}s`;
+        document.getElementById('sch-rejected').textContent = adm.rejected + adm.timeouts;
+        document.getElementById('sch-rejected-sub').textContent = `${adm.rejected} over budget · ${adm.timeouts} timed out`;
+        document.getElementById('sch-slots').textContent = `${sch.busy}/${sch.slots}`;
+        document.getElementById('sch-slots-sub').textContent = `${sch.waiting_chunks} chunks waiting`;
+        document.getElementById('sch-batch').textContent = inf.avg_batch_size;
+        document.getElementById('sch-batch-sub').textContent = `${inf.batches} batches · ${inf.queued} queued`;
+
+        const jobs = document.getElementById('sch-jobs-tbody');
+        jobs.innerHTML = sch.jobs.length ? sch.jobs.map(j => `
+            <tr>
+                <td>#${j.job_id}</td>
+                <td>${escHtml(j.user_name || j.user_id)}</td>
+                <td>${escHtml(j.label)}</td>
+                <td>${j.priority === 'interactive' ? '⚡ interactive' : '📦 bulk'}</td>
+                <td>${j.estimated_tokens}</td>
+                <td>${j.chunks_done}</td>
+                <td>${j.chunks_waiting}</td>
+                <td>${j.wait_seconds}</td>
+                <td>${j.age_seconds}</td>
+            </tr>`).join('') : '<tr><td colspan="9" class="loading-info">No jobs running.</td></tr>';
+
+        document.getElementById('sch-users-tbody').innerHTML = sch.users.map(u => `
+            <tr>
+                <td>${escHtml(u.user_name || u.user_id)}</td>
+                <td>${u.tokens}</td>
+                <td>${u.chunks}</td>
+                <td>${u.avg_wait_ms}</td>
+            </tr>`).join('');
+
+        document.getElementById('sch-decisions-tbody').innerHTML = sch.recent_decisions.map(d => `
+            <tr>
+                <td>${d.time}</td>
+                <td>#${d.job_id}</td>
+                <td>${escHtml(d.user_name || d.user_id)}</td>
+                <td>${escHtml(d.label)}</td>
+                <td>${d.priority}</td>
+                <td>${d.cost}</td>
+                <td>${d.waited_ms}</td>
+            </tr>`).join('');
+    } catch (e) {
+        console.error('Scheduler load error', e);
+    }
+}
+
+// ── Models ──
+function formatRoutes(routes) {
+    return routes.map(r => `${r.task}:${r.mode}${r.max_input_tokens !== null ? ':' + r.max_input_tokens : ''}=${r.model}`).join(',');
+}
+
+async function loadModels() {
+    try {
+        const res = await fetch('/api/admin/models');
+        const data = await res.json();
+        if (!data.success) return;
+        const reg = data.registry;
+        const rows = [
+            ...reg.models.map(m => ({ ...m, state: m.name === reg.default ? '⭐ default' : '✅ active' })),
+            ...reg.draining.map(m => ({ ...m, state: '⏳ draining' })),
+            ...reg.loading.map(m => ({ ...m, loaded_at: '—', batches: '—', in_flight: '—', state: '⬆ loading' })),
+            ...Object.entries(reg.errors).map(([name, err]) => ({ name, source: err, loaded_at: '—', batches: '—', in_flight: '—', state: '❌ failed' }))
+        ];
+        document.getElementById('models-tbody').innerHTML = rows.length ? rows.map(m => `
+            <tr>
+                <td><strong>${escHtml(m.name)}</strong></td>
+                <td>${escHtml(m.source)}</td>
+                <td>${m.loaded_at}</td>
+                <td>${m.batches}</td>
+                <td>${m.in_flight}</td>
+                <td>${m.state}</td>
+                <td>${m.state === '✅ active' ? `<button class="btn btn-secondary" onclick="unloadModel('${escHtml(m.name)}')">Unload</button>` : ''}</td>
+            </tr>`).join('') : '<tr><td colspan="7" class="loading-info">No models loaded.</td></tr>';
+
+        document.getElementById('model-routes').value = formatRoutes(reg.routes);
+        document.getElementById('model-default').innerHTML = reg.models.map(m =>
+            `<option value="${escHtml(m.name)}" ${m.name === reg.default ? 'selected' : ''}>default: ${escHtml(m.name)}</option>`
+        ).join('');
+    } catch (e) {
+        console.error('Models load error', e);
+    }
+}
+
+async function loadModel() {
+    const name = document.getElementById('model-name').value.trim();
+    const source = document.getElementById('model-source').value.trim();
+    const msgEl = document.getElementById('model-load-msg');
+    if (!name || !source) { msgEl.innerHTML = '<div class="alert-error">Name and model are required.</div>'; return; }
+    try {
+        const res = await fetch('/api/admin/models', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ name, source })
+        });
+        const data = await res.json();
+        msgEl.innerHTML = data.success
+            ? `<div class="alert-success">⬆ ${escHtml(data.message)} — refresh to follow progress</div>`
+            : `<div class="alert-error">❌ ${escHtml(data.message)}</div>`;
+        loadModels();
+    } catch (e) { msgEl.innerHTML = '<div class="alert-error">❌ Network error</div>'; }
+}
+
+async function unloadModel(name) {
+    if (!confirm(`Unload model '${name}'? In-flight requests will finish first.`)) return;
+    try {
+        const res = await fetch(`/api/admin/models/${encodeURIComponent(name)}`, { method: 'DELETE' });
+        const data = await res.json();
+        if (!data.success) alert(data.message);
+        loadModels();
+    } catch (e) { console.error('Unload error', e); }
+}
+
+async function saveModelRoutes() {
+    const msgEl = document.getElementById('model-routes-msg');
+    try {
+        const res = await fetch('/api/admin/models/routes', {
+            method: 'PUT',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
+                routes: document.getElementById('model-routes').value,
+                default: document.getElementById('model-default').value
+            })
+        });
+        const data = await res.json();
+        msgEl.innerHTML = data.success
+            ? '<div class="alert-success">✅ Routing updated</div>'
+            : `<div class="alert-error">❌ ${escHtml(data.message)}</div>`;
+        if (data.success) loadModels();
+    } catch (e) { msgEl.innerHTML = '<div class="alert-error">❌ Network error</div>'; }
+}
+
+// ── Profiles ──
+let currentProfileId = null;
+let flameRoot = null;
+
+async function loadProfiles() {
+    try {
+        const res = await fetch('/api/admin/profiles');
+        const data = await res.json();
+        if (!data.success) return;
+        document.getElementById('profiles-tbody').innerHTML = data.profiles.length ? data.profiles.map(p => `
+            <tr>
+                <td>${p.id}</td>
+                <td>${p.time}</td>
+                <td>${escHtml(p.method)} ${escHtml(p.path)}</td>
+                <td>${p.status}</td>
+                <td>${p.duration}</td>
+                <td>${p.samples}</td>
+                <td><button class="btn btn-secondary" onclick="loadProfile(${p.id})">View</button></td>
+            </tr>`).join('') : '<tr><td colspan="7" class="loading-info">No profiles recorded yet.</td></tr>';
+    } catch (e) {
+        console.error('Profiles load error', e);
+    }
+}
+
+async function loadProfile(id) {
+    if (id === null) return;
+    currentProfileId = id;
+    const sort = document.getElementById('profile-sort').value;
+    try {
+        const res = await fetch(`/api/admin/profiles/${id}?sort=${sort}`);
+        const data = await res.json();
+        if (!data.success) return;
+        const p = data.profile;
+        document.getElementById('profile-detail').style.display = 'block';
+        document.getElementById('profile-title').textContent =
+            `#${p.id} ${p.method} ${p.path} — ${p.duration}s, ${p.samples} samples every ${p.interval_ms}ms`;
+        document.getElementById('profile-download').href = `/api/admin/profiles/${id}?format=collapsed`;
+
+        const totalSamples = Object.values(p.stacks).reduce((a, b) => a + b, 0) || 1;
+        const pct = n => (100 * n / totalSamples).toFixed(1);
+        document.getElementById('profile-top-tbody').innerHTML = data.top.map(r => `
+            <tr>
+                <td><code>${escHtml(r.function)}</code></td>
+                <td>${pct(r.self)}</td>
+                <td>${pct(r.total)}</td>
+                <td>${r.self}</td>
+                <td>${r.total}</td>
+            </tr>`).join('');
+
+        flameRoot = buildFlameTree(p.stacks);
+        renderFlame(flameRoot);
+    } catch (e) {
+        console.error('Profile load error', e);
+    }
+}
+
+function buildFlameTree(stacks) {
+    const root = { name: 'all', value: 0, children: {} };
+    for (const [stack, count] of Object.entries(stacks)) {
+        let node = root;
+        root.value += count;
+        for (const frame of stack.split(';')) {
+            node = node.children[frame] = node.children[frame] || { name: frame, value: 0, children: {} };
+            node.value += count;
+        }
+    }
+    return root;
+}
+
+function flameColor(name) {
+    let h = 0;
+    for (const c of name) h = (h * 31 + c.charCodeAt(0)) % 360;
+    return `hsl(${20 + h % 40}, 85%, ${60 + h % 20}%)`;
+}
+
+function renderFlame(focus) {
+    const container = document.getElementById('profile-flame');
+    const width = container.clientWidth || 800;
+    const rowHeight = 18;
+    const frames = [];
+    let depthMax = 0;
+
+    (function layout(node, x, depth) {
+        frames.push({ node, x, depth });
+        depthMax = Math.max(depthMax, depth);
+        let childX = x;
+        for (const child of Object.values(node.children).sort((a, b) => a.name.localeCompare(b.name))) {
+            layout(child, childX, depth + 1);
+            childX += child.value;
+        }
+    })(focus, 0, 0);
+
+    container.style.height = ((depthMax + 1) * rowHeight) + 'px';
+    container.innerHTML = '';
+    const scale = width / focus.value;
+    for (const { node, x, depth } of frames) {
+        const w = node.value * scale;
+        if (w < 2) continue;
+        const el = document.createElement('div');
+        el.className = 'flame-frame';
+        el.style.left = (x * scale) + 'px';
+        el.style.width = w + 'px';
+        el.style.top = (depth * rowHeight) + 'px';
+        el.style.background = depth === 0 ? '#e5e7eb' : flameColor(node.name);
+        el.textContent = node.name;
+        el.title = `${node.name}\n${node.value} samples (${(100 * node.value / flameRoot.value).toFixed(1)}%)`;
+        el.onclick = () => renderFlame(depth === 0 ? flameRoot : node);
+        container.appendChild(el);
+    }
+}
+
+// ── Pagination helper ──
+function renderPagination(containerId, total, perPage, currentPage, callback) {
+    const totalPages = Math.ceil(total / perPage);
+    const container = document.getElementById(containerId);
+    container.innerHTML = '';
+    if (totalPages <= 1) return;
+    for (let p = 1; p <= totalPages; p++) {
+        const btn = document.createElement('button');
+        btn.className = 'page-btn' + (p === currentPage ? ' active' : '');
+        btn.textContent = p;
+        btn.onclick = () => callback(p);
+        container.appendChild(btn);
+    }
+    const info = document.createElement('span');
+    info.className = 'page-info';
+    info.textContent = `${total} total`;
+    container.appendChild(info);
+}
+
+// ── HTML escape ──
+function escHtml(str) {
+    if (!str) return '';
+    return String(str).replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;').replace(/"/g, '&quot;');
+}
+
+// ── Init ──
+loadStats();
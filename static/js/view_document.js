@@ -0,0 +1,346 @@
+/* ── State ── */
+/* Rendered into <body data-doc-id> by the template */
+const DOC_ID = document.body.dataset.docId;
+let selectedMode = 'intermediate';
+let allTerms = [];
+let glossaryOpen = true;
+
+function selectedTier() {
+    return document.getElementById('fast-tier').checked ? 'fast' : 'quality';
+}
+
+/* ── Mode Cards ── */
+const modeCards = { basic: 'card-basic', intermediate: 'card-intermediate', advanced: 'card-advanced' };
+
+function selectMode(mode) {
+    selectedMode = mode;
+    Object.values(modeCards).forEach(id => document.getElementById(id).classList.remove('selected'));
+    document.getElementById(modeCards[mode]).classList.add('selected');
+}
+
+/* ── Slider live value ── */
+document.getElementById('simplify-level').addEventListener('input', function () {
+    document.getElementById('level-val').textContent = this.value;
+});
+
+/* ── Page load ── */
+document.addEventListener('DOMContentLoaded', () => {
+    loadDocumentBundle();
+});
+
+/* ── Every stored artifact in one request (ETag-revalidated, so repeat views get a 304) ── */
+async function loadDocumentBundle() {
+    const loadingMsg = document.getElementById('terms-loading-msg');
+
+    try {
+        const res = await fetch(`/api/document/${DOC_ID}/bundle`);
+        const data = await res.json();
+        loadingMsg.style.display = 'none';
+
+        if (data.success) {
+            updateGrade(data.readability, 'grade-original', 'bar-original-inner');
+            renderLegalTerms(data);
+            if (data.simplified) {
+                updateGrade(data.simplified.readability, 'grade-simplified', 'bar-simplified-inner');
+            }
+        }
+    } catch (err) {
+        loadingMsg.style.display = 'none';
+        console.warn('Analysis error:', err);
+    }
+}
+
+/* ── Legal Term Highlighting ── */
+function renderLegalTerms(data) {
+    const originalBox = document.getElementById('original-content');
+
+    if (data.term_occurrences) {
+        /* Offsets mode: build the term spans from the text already on the page */
+        if (!highlightOccurrences(originalBox, data.term_occurrences)) {
+            /* Offsets no longer line up (e.g. CRLF normalized by the browser) */
+            fetch(`/api/document/${DOC_ID}/analysis`)
+                .then(res => res.json())
+                .then(html => { if (html.success) originalBox.innerHTML = html.highlighted_html; })
+                .catch(err => console.warn('Highlight error:', err));
+        }
+    } else {
+        /* Replace original text with highlighted HTML */
+        originalBox.innerHTML = data.highlighted_html;
+    }
+
+    allTerms = data.terms || [];
+
+    if (allTerms.length > 0) {
+        document.getElementById('glossary-search-wrap').style.display = 'block';
+        document.getElementById('terms-count-badge').textContent = allTerms.length + ' found';
+        renderTermList(allTerms);
+    } else {
+        document.getElementById('glossary-list').innerHTML = '<div class="glossary-empty">No legal terms detected in this document.</div>';
+    }
+}
+
+function appendText(parent, text) {
+    const lines = text.split('\n');
+    lines.forEach((line, i) => {
+        if (i > 0) parent.appendChild(document.createElement('br'));
+        if (line) parent.appendChild(document.createTextNode(line));
+    });
+}
+
+function highlightOccurrences(box, highlight) {
+    const text = box.textContent;
+    const terms = highlight.terms || [];
+    const occurrences = highlight.occurrences || [];
+    const matches = ([s, e, id]) => text.slice(s, e).toLowerCase() === terms[id].term;
+    if (occurrences.length && !(matches(occurrences[0]) && matches(occurrences[occurrences.length - 1]))) {
+        return false;
+    }
+
+    const fragment = document.createDocumentFragment();
+    let last = 0;
+    for (const [start, end, id] of occurrences) {
+        appendText(fragment, text.slice(last, start));
+        const span = document.createElement('span');
+        span.className = 'legal-term';
+        span.tabIndex = 0;
+        span.dataset.definition = terms[id].definition;
+        span.textContent = text.slice(start, end);
+        fragment.appendChild(span);
+        last = end;
+    }
+    appendText(fragment, text.slice(last));
+    box.replaceChildren(fragment);
+    return true;
+}
+
+function renderTermList(terms) {
+    const list = document.getElementById('glossary-list');
+    if (!terms.length) {
+        list.innerHTML = '<div class="glossary-empty">No matches found.</div>';
+        return;
+    }
+    list.innerHTML = terms.map(t => `
+    <div class="glossary-term-item">
+        <div class="glossary-term-icon">${(t.display_term || t.term)[0].toUpperCase()}</div>
+        <div class="glossary-term-text">
+            <div class="gt-name">${escHtml(t.display_term || t.term)}</div>
+            <div class="gt-def">${escHtml(t.definition)}</div>
+        </div>
+    </div>
+`).join('');
+}
+
+function filterGlossary(query) {
+    const q = query.toLowerCase().trim();
+    const filtered = q ? allTerms.filter(t =>
+        t.term.includes(q) || t.definition.toLowerCase().includes(q)
+    ) : allTerms;
+    renderTermList(filtered);
+}
+
+function toggleGlossary() {
+    glossaryOpen = !glossaryOpen;
+    document.getElementById('glossary-body').style.display = glossaryOpen ? 'block' : 'none';
+    document.getElementById('glossary-chevron').style.transform = glossaryOpen ? '' : 'rotate(-90deg)';
+}
+
+function escHtml(s) {
+    return String(s || '').replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;').replace(/"/g, '&quot;');
+}
+
+/* ── Readability Chart ── */
+function fetchSimplifiedReadability() {
+    const simpText = document.getElementById('simplified-content').innerText;
+
+    if (!simpText.includes('Click "Simplify"') && simpText.trim().length > 10) {
+        analyzeAndUpdate(simpText, 'grade-simplified', 'bar-simplified-inner');
+    }
+}
+
+function updateGrade(readability, gradeId, barId) {
+    const grade = Math.max(0, Math.round(readability.flesch_kincaid_grade));
+    document.getElementById(gradeId).textContent = 'Grade ' + grade;
+    const pct = Math.min(100, (grade / 15) * 100);
+    document.getElementById(barId).style.height = pct + '%';
+}
+
+function analyzeAndUpdate(text, gradeId, barId) {
+    fetch('/api/analyze', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ text })
+    })
+        .then(r => r.json())
+        .then(data => {
+            if (data.success) updateGrade(data.readability, gradeId, barId);
+        })
+        .catch(() => { });
+}
+
+/* ── Cancel in-flight generation when the page goes away ── */
+/* The server cannot notice a closed tab, so tell it; shared work keeps running */
+let generationsInFlight = 0;
+window.addEventListener('pagehide', () => {
+    if (generationsInFlight > 0) navigator.sendBeacon(`/api/document/${DOC_ID}/cancel`);
+});
+
+function partialNote(data) {
+    if (!data.partial) return '';
+    const why = data.partial_reason === 'deadline' ? 'the time limit was reached' : 'it was cancelled';
+    const done = data.total_chunks ? ` (${data.completed_chunks} of ${data.total_chunks} sections)` : '';
+    return `\n\n⚠ Partial result: processing stopped because ${why}${done}.`;
+}
+
+/* ── Simplify + Summarize ── */
+async function processDocument(docId) {
+    const btn = document.getElementById('btn-simplify');
+    const btnText = document.getElementById('btn-text');
+    const simplBox = document.getElementById('simplified-content');
+    const summBox = document.getElementById('summary-content');
+    const level = document.getElementById('simplify-level').value;
+    const modeBadge = document.getElementById('mode-badge');
+    const metricsDiv = document.getElementById('metrics-display');
+
+    btn.disabled = true;
+    btnText.textContent = 'Processing…';
+    simplBox.innerHTML = '<span class="loading-text">✨ Simplifying with FLAN-T5 (' + selectedMode + ')…</span>';
+    summBox.innerHTML = '<span class="loading-text">📝 Generating summary…</span>';
+    metricsDiv.style.display = 'none';
+    modeBadge.style.display = 'none';
+
+    generationsInFlight++;
+    try {
+        const [simpRes, sumRes] = await Promise.all([
+            fetch(`/simplify/${docId}`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ level, simplification_mode: selectedMode, tier: selectedTier() })
+            }),
+            fetch(`/summarize/${docId}`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ tier: selectedTier() })
+            })
+        ]);
+
+        const simpData = await simpRes.json();
+        const sumData = await sumRes.json();
+
+        /* A newer request for this document replaced this one; it will fill the panes */
+        if (simpData.reason === 'superseded' || sumData.reason === 'superseded') return;
+
+        if (simpData.busy || sumData.busy) {
+            const wait = simpRes.headers.get('Retry-After') || sumRes.headers.get('Retry-After') || 'a few';
+            simplBox.innerHTML = `<span style="color:var(--amber);">Server is busy — please try again in ${escHtml(wait)} seconds.</span>`;
+            summBox.innerHTML = '';
+            return;
+        }
+
+        if (simpData.success) {
+            simplBox.innerText = simpData.simplified_content + partialNote(simpData);
+
+            const labels = { basic: '📘 Basic', intermediate: '📗 Intermediate', advanced: '📕 Advanced' };
+            modeBadge.textContent = labels[simpData.simplification_mode] || simpData.simplification_mode;
+            modeBadge.style.display = 'inline-block';
+
+            if (simpData.metrics) {
+                document.getElementById('metric-time').textContent = simpData.metrics.processing_time + 's';
+                document.getElementById('metric-reduction').textContent = (simpData.metrics.reduction > 0 ? '-' : '') + simpData.metrics.reduction + ' grades';
+                document.getElementById('metric-orig-words').textContent = simpData.metrics.original_words;
+                document.getElementById('metric-simp-words').textContent = simpData.metrics.simplified_words;
+                metricsDiv.style.display = 'grid';
+            }
+        } else {
+            simplBox.innerHTML = `<span style="color:var(--red);">Error: ${simpData.message}</span>`;
+        }
+
+        if (sumData.success) {
+            summBox.innerText = sumData.summary + partialNote(sumData);
+        } else {
+            summBox.innerHTML = `<span style="color:var(--red);">Error: ${sumData.message}</span>`;
+        }
+
+        fetchSimplifiedReadability();
+
+    } catch (err) {
+        simplBox.innerHTML = `<span style="color:var(--red);">Network error — check console.</span>`;
+        summBox.innerHTML = `<span style="color:var(--red);">Network error.</span>`;
+    } finally {
+        generationsInFlight--;
+        btn.disabled = false;
+        btnText.textContent = 'Simplify Again';
+    }
+}
+
+/* ── Compare all three levels ── */
+async function compareLevels(docId) {
+    const btn = document.getElementById('btn-compare');
+    const btnText = document.getElementById('compare-text');
+    const display = document.getElementById('compare-display');
+    const level = document.getElementById('simplify-level').value;
+    const modes = ['basic', 'intermediate', 'advanced'];
+
+    btn.disabled = true;
+    btnText.textContent = 'Comparing…';
+    display.style.display = 'grid';
+    modes.forEach(m => {
+        document.getElementById('compare-' + m).innerHTML = '<span class="loading-text">✨ Generating…</span>';
+        document.getElementById('grade-compare-' + m).textContent = 'Grade --';
+    });
+
+    try {
+        const res = await fetch(`/simplify_compare/${docId}`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ level, tier: selectedTier() })
+        });
+        const data = await res.json();
+
+        modes.forEach(m => {
+            const box = document.getElementById('compare-' + m);
+            if (data.success) {
+                const v = data.versions[m];
+                box.innerText = v.simplified_content;
+                document.getElementById('grade-compare-' + m).textContent =
+                    'Grade ' + Math.max(0, Math.round(v.simplified_grade));
+            } else {
+                box.innerHTML = `<span style="color:var(--red);">Error: ${escHtml(data.message)}</span>`;
+            }
+        });
+    } catch (err) {
+        modes.forEach(m => {
+            document.getElementById('compare-' + m).innerHTML = '<span style="color:var(--red);">Network error.</span>';
+        });
+    } finally {
+        btn.disabled = false;
+        btnText.textContent = 'Compare Levels';
+    }
+}
+
+/* ── Summarize only ── */
+async function summarizeOnly(docId) {
+    const sumBtn = document.getElementById('btn-summarize');
+    const sumText = document.getElementById('sum-text');
+    const summBox = document.getElementById('summary-content');
+
+    sumBtn.disabled = true;
+    sumText.textContent = 'Summarizing…';
+    summBox.innerHTML = '<span class="loading-text">📝 Generating summary…</span>';
+
+    generationsInFlight++;
+    try {
+        const res = await fetch(`/summarize/${docId}`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ tier: selectedTier() })
+        });
+        const data = await res.json();
+        summBox.innerText = data.success ? data.summary + partialNote(data) : 'Error: ' + data.message;
+    } catch (err) {
+        summBox.innerHTML = '<span style="color:var(--red);">Network error.</span>';
+    } finally {
+        generationsInFlight--;
+        sumBtn.disabled = false;
+        sumText.textContent = 'Summarize';
+    }
+}
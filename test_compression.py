@@ -0,0 +1,50 @@
+"""
+Test Compression Negotiation
+Responses and static bundles fall back to gzip when brotli is unavailable
+"""
+
+import gzip
+import os
+
+import nlp.compression
+from nlp.assets import AssetManifest
+from nlp.compression import available_encodings, negotiate
+
+
+class AcceptEncodings:
+    """Minimal stand-in for werkzeug's parsed Accept-Encoding header."""
+
+    def __init__(self, *encodings):
+        self.encodings = encodings
+
+    def quality(self, encoding):
+        return 1 if encoding in self.encodings else 0
+
+
+def test_brotli_preferred_when_available():
+    if nlp.compression.brotli is None:
+        return
+    assert negotiate(AcceptEncodings("gzip", "br")) == "br"
+
+
+def test_negotiation_falls_back_to_gzip_without_brotli(monkeypatch):
+    monkeypatch.setattr(nlp.compression, "brotli", None)
+    assert available_encodings() == ("gzip",)
+    assert negotiate(AcceptEncodings("br", "gzip")) == "gzip"
+    assert negotiate(AcceptEncodings("br")) is None
+
+
+def test_assets_served_as_gzip_without_brotli(monkeypatch, tmp_path):
+    monkeypatch.setattr(nlp.compression, "brotli", None)
+    os.makedirs(tmp_path / "js")
+    source = b"console.log('bundle');\n" * 100
+    (tmp_path / "js" / "app.js").write_bytes(source)
+
+    assets = AssetManifest(str(tmp_path), bundles=("js/app.js",))
+    name = assets.build()["js/app.js"]
+    path, mimetype, encoding = assets.resolve(name, AcceptEncodings("br", "gzip"))
+
+    assert encoding == "gzip" and path.endswith(".gz")
+    assert mimetype.startswith("text/javascript")
+    assert gzip.decompress(open(path, "rb").read()) == source
+    assert not os.path.exists(os.path.join(assets.dist_folder, name + ".br"))
@@ -0,0 +1,39 @@
+"""
+Test Extractive Summarizer
+TextRank selection must not return the same sentence twice
+"""
+
+from nlp.extractive import extractive_summary, salient_text, top_sentence_indices
+from nlp.sentence_segmenter import split_sentences
+
+CLAUSES = [
+    "The Employee acknowledges that they may have access to confidential information of the Employer.",
+    "The Employee agrees to maintain the confidentiality of such information after employment ends.",
+    "The Employer agrees to provide compensation in the form of salary and benefits.",
+    "Any disputes arising under this Agreement shall be resolved through binding arbitration.",
+    "This Agreement shall be governed by the laws of the jurisdiction in which the Employer operates.",
+]
+
+# The same clauses repeated, with line breaks in different places
+REPEATED = ' '.join(CLAUSES) + '\n' + '\n'.join(CLAUSES * 3).replace("confidential information", "confidential\ninformation")
+
+
+def normalized(sentences):
+    return [' '.join(s.split()) for s in sentences]
+
+
+def test_summary_has_no_repeated_sentences():
+    summary = normalized(split_sentences(extractive_summary(REPEATED, num_sentences=5)))
+    assert len(summary) == len(set(summary))
+    assert sorted(summary) == sorted(CLAUSES)
+
+
+def test_near_identical_sentences_are_suppressed():
+    sentences = CLAUSES + [CLAUSES[0].replace("to confidential", "to all of the confidential")]
+    selected = top_sentence_indices(sentences, 6)
+    assert not {0, 5} <= set(selected)
+
+
+def test_salient_text_drops_repeats():
+    kept = normalized(split_sentences(salient_text(REPEATED, 0.5)))
+    assert len(kept) == len(set(kept))
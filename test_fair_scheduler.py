@@ -0,0 +1,36 @@
+"""
+Test Fair Scheduler
+Idle users are forgotten once they could not be owed or owe anything
+"""
+
+from nlp.fair_scheduler import FairScheduler
+
+
+def serve(scheduler, user_id, cost):
+    with scheduler.job(user_id, "test", cost) as job:
+        with scheduler.turn(job, cost):
+            pass
+
+
+def test_idle_users_are_evicted():
+    scheduler = FairScheduler(slots=2)
+    for i in range(20):
+        serve(scheduler, f"user-{i}", 10)
+    assert scheduler.stats()["users"] == []
+
+
+def test_users_ahead_of_the_floor_are_kept():
+    scheduler = FairScheduler(slots=2)
+    with scheduler.job("bulk", "test", 1000) as job:
+        with scheduler.turn(job, 100):
+            pass
+        # Served past the active user's virtual time, so not forgotten yet
+        serve(scheduler, "ahead", 10)
+        assert {u["user_id"] for u in scheduler.stats()["users"]} == {"bulk", "ahead"}
+
+        # Once the active floor passes it, the next finished job evicts it
+        with scheduler.turn(job, 100):
+            pass
+        serve(scheduler, "other", 10)
+        assert {u["user_id"] for u in scheduler.stats()["users"]} == {"bulk", "other"}
+    assert scheduler.stats()["users"] == []
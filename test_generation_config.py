@@ -0,0 +1,97 @@
+"""
+Test Generation Policy
+Output budgets and early stopping must never cut a full-length chunk short
+"""
+
+import pytest
+
+from nlp.cancellation import CancelToken
+from nlp.generation import (
+    SENTENCE_END_WINDOW, TIERS, build_cancellation_criteria, build_stopping_criteria, simplify_generation_config,
+    summary_generation_config, summary_keep_ratio
+)
+from nlp.stub_backend import StubModel, StubTokenizer
+
+# 182 words in 8 sentences, the size of a typical simplification chunk
+CHUNK = (
+    "The Employee agrees to maintain the confidentiality of all proprietary information belonging to the Employer. "
+    "This obligation applies both during the term of employment and for a period of two years after it ends. "
+    "The Employee shall not disclose such information to any third party without the prior written consent of the Employer. "
+    "Upon termination, the Employee shall return all documents, records and materials containing confidential information. "
+    "The Employer may seek injunctive relief in the event of any actual or threatened breach of these obligations. "
+    "Nothing in this section shall prevent the Employee from complying with a lawful order of a court or government agency, "
+    "provided that the Employee gives the Employer prompt notice of the order. "
+    "The parties acknowledge that the restrictions in this section are reasonable and necessary to protect the legitimate "
+    "business interests of the Employer, including its trade secrets, customer relationships and goodwill. "
+    "If any provision of this section is held to be unenforceable, it shall be modified to the minimum extent necessary "
+    "to make it enforceable, and the remaining provisions shall continue in full force and effect."
+)
+
+
+def simplify(text, tier):
+    config = simplify_generation_config(len(StubTokenizer().encode(text)), 70, "intermediate", tier)
+    return StubModel(latency_ms=0, tokens_per_second=0).generate_batch([f"Simplify this text: {text}"], config)[0]
+
+
+def test_full_length_chunk_is_not_truncated():
+    assert simplify(CHUNK, "quality") == ' '.join(CHUNK.split())
+
+
+def test_sentence_end_stopping_only_near_the_cap():
+    for tier in TIERS:
+        for tokens in (40, 173, 400, 1000):
+            for config in (simplify_generation_config(tokens, tier=tier), summary_generation_config(tokens, tier=tier)):
+                assert config["stop_at_sentence_end"] >= 0.85 * config["max_new_tokens"]
+
+
+def test_long_documents_are_prefiltered_in_every_tier():
+    for tier, policy in TIERS.items():
+        budget = policy["summary_input_budget"]
+        assert summary_keep_ratio(budget, tier) == policy["summary_keep_ratio"]
+        assert summary_keep_ratio(4 * budget, tier) * 4 * budget <= budget
+
+
+class VocabTokenizer:
+    """Just enough of a HuggingFace tokenizer for the stopping criteria."""
+
+    def get_vocab(self):
+        return {"<pad>": 0, "the": 1, "rent": 2, "due.": 3, "now?": 4}
+
+
+def token_ids(*rows):
+    torch = pytest.importorskip("torch")
+    return torch.tensor(rows, dtype=torch.long)
+
+
+def generated(length, last):
+    return [1] * (length - 1) + [last]
+
+
+def test_sentence_end_stops_only_within_the_window():
+    pytest.importorskip("transformers")
+    config = simplify_generation_config(len(StubTokenizer().encode(CHUNK)), 70, "intermediate", "quality")
+    budget, floor = config["max_new_tokens"], config["stop_at_sentence_end"]
+    (criteria,) = build_stopping_criteria(VocabTokenizer(), floor)
+
+    # A sentence end before the window opens keeps generating
+    before = criteria(token_ids(generated(floor - 1, 3)), None)
+    assert before.tolist() == [False]
+    # Inside the window a sentence end stops, anything else does not
+    inside = criteria(token_ids(generated(floor, 3), generated(floor, 4), generated(floor, 2)), None)
+    assert inside.tolist() == [True, True, False]
+    assert budget - floor <= max(1, int(budget * SENTENCE_END_WINDOW))
+
+
+def test_cancelled_token_stops_its_rows():
+    pytest.importorskip("transformers")
+    cancelled, running = CancelToken(), CancelToken()
+    (criteria,) = build_cancellation_criteria([cancelled, running, None])
+    ids = token_ids(*[generated(5, 2)] * 3)
+
+    assert criteria(ids, None).tolist() == [False, False, False]
+    cancelled.cancel()
+    assert criteria(ids, None).tolist() == [True, False, False]
+
+    # With beam search each prompt spans consecutive rows
+    beams = token_ids(*[generated(5, 2)] * 6)
+    assert criteria(beams, None).tolist() == [True, True, False, False, False, False]
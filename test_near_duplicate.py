@@ -0,0 +1,68 @@
+"""
+Test Near-duplicate Chunk Reuse
+Entity patching and the reuse rules of the MinHash/LSH chunk index
+"""
+
+from nlp.near_duplicate import NearDuplicateIndex, patch_entities
+
+CLAUSE = (
+    "The Renter agrees to maintain the premises in good condition and must pay $5,000 "
+    "in 5 days after Acme Holdings sends written notice of any damage."
+)
+
+
+class MemoryStore:
+    """In-memory stand-in for models.ChunkIndex."""
+
+    def __init__(self):
+        self.entries = {}
+
+    def upsert(self, key, owner, text, bands, doc_id=None, variant=None, output=None):
+        entry = self.entries.setdefault(key, {"owner": str(owner), "text": text, "bands": bands, "outputs": {}})
+        if variant is not None:
+            entry["outputs"][variant] = output
+
+    def candidates(self, owner, bands, variant, limit=20):
+        return [
+            {"text": e["text"], "output": e["outputs"][variant]}
+            for e in self.entries.values()
+            if e["owner"] == str(owner) and variant in e["outputs"] and set(bands) & set(e["bands"])
+        ][:limit]
+
+
+def test_patch_replaces_whole_entities_only():
+    # "5" is a substring of "$5,000"; only the day count may change
+    old_output = "The renter must pay $5,000 in 5 days after Acme Holdings gives notice."
+    new_source = CLAUSE.replace("in 5 days", "in 7 days")
+    patched = patch_entities(CLAUSE, new_source, old_output)
+    assert patched == "The renter must pay $5,000 in 7 days after Acme Holdings gives notice."
+
+
+def test_patch_gives_up_when_entity_missing_from_output():
+    old_output = "The renter must pay the amount within a few days."
+    new_source = CLAUSE.replace("$5,000", "$6,000")
+    assert patch_entities(CLAUSE, new_source, old_output) is None
+
+
+def test_reuse_when_only_entities_differ():
+    index = NearDuplicateIndex(MemoryStore())
+    index.record("alice", CLAUSE, "basic-70-quality", "Pay $5,000 in 5 days to Acme Holdings.")
+    new_source = CLAUSE.replace("$5,000", "$8,250").replace("Acme Holdings", "Globex Partners")
+    output, _ = index.lookup("alice", new_source, "basic-70-quality")
+    assert output == "Pay $8,250 in 5 days to Globex Partners."
+
+
+def test_no_reuse_when_wording_differs():
+    index = NearDuplicateIndex(MemoryStore())
+    index.record("alice", CLAUSE, "basic-70-quality", "Keep the place in good shape.")
+    negated = CLAUSE.replace("agrees to maintain", "agrees not to maintain")
+    output, similarity = index.lookup("alice", negated, "basic-70-quality")
+    assert output is None
+    assert similarity > 0.5
+
+
+def test_no_reuse_across_owners():
+    index = NearDuplicateIndex(MemoryStore())
+    index.record("alice", CLAUSE, "basic-70-quality", "Keep the place in good shape.")
+    output, _ = index.lookup("bob", CLAUSE, "basic-70-quality")
+    assert output is None
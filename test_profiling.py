@@ -0,0 +1,40 @@
+"""
+Test Request Profiling
+A profile samples its request's own threads, never other busy threads
+"""
+
+import threading
+import time
+
+from nlp.chunking import map_chunks
+from nlp.profiling import SamplingProfiler
+
+
+def busy(seconds):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        sum(range(1000))
+
+
+def test_only_the_request_and_its_workers_are_sampled():
+    done = threading.Event()
+
+    def other_request():
+        while not done.is_set():
+            busy(0.01)
+
+    other = threading.Thread(target=other_request, name="other-request")
+    other.start()
+    try:
+        profiler = SamplingProfiler(interval=0.002)
+        profiler.start()
+        map_chunks(["a", "b"], lambda chunk: busy(0.2), max_workers=2)
+        stacks = profiler.stop()
+    finally:
+        done.set()
+        other.join()
+
+    threads = {stack.split(';')[0] for stack in stacks}
+    assert threading.current_thread().name in threads
+    assert any(name.startswith("ThreadPoolExecutor") for name in threads)
+    assert "other-request" not in threads
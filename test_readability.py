@@ -0,0 +1,47 @@
+"""
+Test Readability Scoring
+Additive statistics must score exactly like textstat, chunked or not
+"""
+
+import textstat
+
+from nlp.chunking import chunk_text
+from nlp.readability import ReadabilityAccumulator, calculate_readability, merge_statistics, text_statistics
+
+SAMPLES = [
+    "This is a simple employment agreement. The employee agrees to work for the company. "
+    "The company agrees to pay the employee a salary.",
+    """
+The Party of the First Part, hereinafter referred to as the "Employer," and the Party of
+the Second Part, hereinafter referred to as the "Employee," hereby enter into this
+Employment Agreement pursuant to the terms and conditions set forth herein. The Employee
+acknowledges that during the course of employment, they may have access to confidential and
+proprietary information belonging to the Employer. Any disputes arising under this Agreement
+shall be resolved through binding arbitration in accordance with the rules of the American
+Arbitration Association.
+""",
+    "2. Compensation. The Company shall pay the Employee $85,000.50 per year, subject to withholding "
+    "under 26 U.S.C. 3402 and applicable state law. (a) Salary shall be paid bi-weekly. "
+    "(b) Bonuses are discretionary; see Art. IV for details. Claims may arise under Sec. 5 of "
+    "42 U.S.C. 1983. The Employee's obligations don't end on termination!",
+    "Short. Very short. Is this text readable? Yes, it certainly is readable enough.",
+]
+
+
+def test_scores_match_textstat():
+    for text in SAMPLES:
+        scores = calculate_readability(text)
+        assert scores["flesch_kincaid_grade"] == textstat.flesch_kincaid_grade(text), text
+        assert scores["gunning_fog"] == textstat.gunning_fog(text), text
+
+
+def test_chunk_statistics_merge_to_the_whole():
+    text = ' '.join(' '.join(sample.split()) for sample in SAMPLES) * 5
+    chunks = chunk_text(text, max_tokens=60)
+    assert len(chunks) > 1
+    assert merge_statistics(*(text_statistics(c) for c in chunks)) == text_statistics(' '.join(chunks))
+
+    accumulator = ReadabilityAccumulator()
+    for chunk in chunks:
+        accumulator.add(chunk)
+    assert accumulator.readability() == calculate_readability(' '.join(chunks))
@@ -0,0 +1,56 @@
+"""
+Test Sentence Segmentation
+Boundaries around abbreviations, citations and numbered clauses
+"""
+
+from nlp.sentence_segmenter import split_sentences
+
+
+def test_number_after_abbreviation_ends_sentence():
+    assert split_sentences("See Sec. 5 of 42 U.S.C. 1983. Done.") == [
+        "See Sec. 5 of 42 U.S.C. 1983.",
+        "Done.",
+    ]
+
+
+def test_reference_number_is_not_a_boundary():
+    assert split_sentences("Bonuses are set under Sec. 5 of the Handbook. See Art. IV for details.") == [
+        "Bonuses are set under Sec. 5 of the Handbook.",
+        "See Art. IV for details.",
+    ]
+
+
+def test_clause_numbers_after_sentence_end():
+    text = "The parties agree as follows. 1. Duties. The Employee shall work. 2. Pay. The Company pays."
+    assert split_sentences(text) == [
+        "The parties agree as follows.",
+        "1. Duties.",
+        "The Employee shall work.",
+        "2. Pay.",
+        "The Company pays.",
+    ]
+
+
+def test_clause_numbers_at_line_start():
+    text = "1. Duties. The Employee works.\n(a) Salary is paid monthly.\n(b) Bonuses are discretionary."
+    assert split_sentences(text) == [
+        "1. Duties.",
+        "The Employee works.",
+        "(a) Salary is paid monthly.",
+        "(b) Bonuses are discretionary.",
+    ]
+
+
+def test_lettered_exhibit_ends_sentence():
+    assert split_sentences("See Exhibit A. The parties agree.") == [
+        "See Exhibit A.",
+        "The parties agree.",
+    ]
+    assert split_sentences("Fees are as set out in Schedule B. Payment is due in 30 days.") == [
+        "Fees are as set out in Schedule B.",
+        "Payment is due in 30 days.",
+    ]
+
+
+def test_initials_do_not_end_sentence():
+    assert split_sentences("Signed by J. Smith for the Company.") == ["Signed by J. Smith for the Company."]